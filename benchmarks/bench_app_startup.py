@@ -0,0 +1,66 @@
+import ast
+import os
+import subprocess
+import sys
+import time
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+app_path = os.path.join(base_dir, "src", "app.py")
+
+""" Hlídání startu aplikace přes `python -X importtime` – importy hlavního vlákna nesmí obsahovat těžké
+    knihovny a musí se vejít do rozpočtu. Pro srovnání se měří i původní importy a načtení modelu na pozadí. """
+
+# Knihovny, které se smí importovat jen ve vlákně načítání
+HEAVY_MODULES = ("pandas", "numpy", "sklearn", "joblib", "scipy")
+BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "250"))
+LEGACY_IMPORTS = "import pandas, numpy, joblib, pickle, sklearn.ensemble"
+
+""" Importy na nejvyšší úrovni app.py – přesně ty, které proběhnou před zobrazením okna """
+def main_thread_imports() -> str:
+    tree = ast.parse(open(app_path, encoding="utf-8").read())
+    imports = [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    paths = [os.path.join(base_dir, "scripts"), os.path.join(base_dir, "src")]
+    return f"import sys; sys.path[:0] = {paths!r}\n" + "\n".join(imports)
+
+""" Spustí kód v čistém interpretu s -X importtime – vrací celkový čas importů (ms) a seznam modulů """
+def import_profile(code: str) -> tuple[float, list[str]]:
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, check=True)
+    total_us = 0
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.append(name.strip())
+        # Moduly bez odsazení jsou importy nejvyšší úrovně, jejich kumulativní čas zahrnuje i závislosti
+        if not name[1:].startswith(" "):
+            total_us += int(cumulative)
+    return total_us / 1000, modules
+
+def background_load_time() -> float | None:
+    if not os.path.exists(os.path.join(os.getenv("MODEL_DIR", os.path.join(base_dir, "models")), "gb_model.pkl")):
+        return None
+    code = (f"import sys; sys.path[:0] = {[os.path.join(base_dir, 'scripts'), os.path.join(base_dir, 'src')]!r}\n"
+            "from catalog_index import load_catalog, catalog_path\nfrom predictor import Predictor\n"
+            "load_catalog(catalog_path); Predictor()")
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True)
+    return time.perf_counter() - start
+
+if __name__ == "__main__":
+    app_ms, modules = import_profile(main_thread_imports())
+    legacy_ms, _ = import_profile(LEGACY_IMPORTS)
+    heavy = sorted({name.split(".")[0] for name in modules} & set(HEAVY_MODULES))
+
+    print(f"Importy hlavního vlákna app.py: {app_ms:8.1f} ms (rozpočet {BUDGET_MS:.0f} ms)")
+    print(f"Původní importy před oknem:     {legacy_ms:8.1f} ms")
+    load_time = background_load_time()
+    if load_time is not None:
+        print(f"Katalog + model na pozadí:      {load_time * 1000:8.1f} ms (včetně startu interpretu)")
+
+    if heavy:
+        print(f"CHYBA: hlavní vlákno importuje těžké knihovny: {', '.join(heavy)}")
+    if app_ms > BUDGET_MS:
+        print("CHYBA: importy hlavního vlákna překročily rozpočet")
+    sys.exit(1 if heavy or app_ms > BUDGET_MS else 0)
@@ -0,0 +1,81 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(base_dir, "data_collection"))
+os.environ.setdefault("SCRAPE_QUIET", "1")
+
+import scrape_runtime
+from autoesa_scraper import AutoesaAdapter
+from scrape_runtime import HEADERS, ScrapeRuntime, SourceRun, load_config
+from stub_server import StubServer, is_partial_card
+
+""" Přenesené bajty a požadavky na uložený inzerát – celý běh SourceRun.scrape proti stub serveru, čísla z ScrapeMetrics """
+
+LATENCY = float(os.getenv("STUB_LATENCY", "0.02"))
+PAGES = int(os.getenv("STUB_PAGES", "5"))
+PER_PAGE = int(os.getenv("STUB_PER_PAGE", "20"))
+
+""" Jeden běh zdroje nad stub serverem – vrací (snapshot metrik, server s počty požadavků) """
+def run(accept_encoding: str, card_fast_path: bool, **stub_options) -> tuple[dict, StubServer]:
+    with tempfile.TemporaryDirectory() as tmp, StubServer(latency=LATENCY, pages=PAGES, per_page=PER_PAGE,
+                                                          **stub_options) as server:
+        # CSV, index a metriky běhu jdou do dočasné složky, ne do raw_data
+        scrape_runtime.RAW_DATA_DIR = tmp
+
+        class StubAdapter(AutoesaAdapter):
+            name = "bench"
+            site_url = server.base_url
+
+        # Prázdný index a nedosažitelný limit známých inzerátů – projdou se vždy všechny stránky
+        config = {
+            **load_config(), "brand": None, "min_price": None, "max_price": None, "num_listings": 10 ** 6,
+            "max_pages": PAGES, "incremental_mode": "conditional", "known_streak_limit": 10 ** 6,
+            "snapshot_mode": "off", "card_fast_path": card_fast_path
+        }
+        runtime = ScrapeRuntime(requests_per_second=0)
+        runtime.session.headers["Accept-Encoding"] = accept_encoding
+        source = SourceRun(StubAdapter, runtime, config)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                source.scrape()
+        finally:
+            source.close()
+            runtime.close()
+        return source.metrics.snapshot(), server
+
+def report(name: str, snap: dict, server: StubServer, elapsed: float) -> None:
+    print(f"{name:<28} {snap['requests']:>4} požadavků ({server.detail_count:>3} detailů), {snap['bytes'] / 1e3:7.1f} kB "
+          f"=> přeneseno {snap['wire_bytes'] / 1e3:7.1f} kB, {snap['wire_bytes_per_record'] / 1e3:5.2f} kB a "
+          f"{snap['requests_per_record']:.2f} požadavků na uložený inzerát, chyb {snap['counters'].get('errors', 0)} "
+          f"({elapsed:.2f} s)")
+
+if __name__ == "__main__":
+    encoding = HEADERS["Accept-Encoding"]
+    print(f"Stub server: {PAGES} stránek po {PER_PAGE} inzerátech, Accept-Encoding scraperu: {encoding}")
+    for name, args in [
+        ("bez komprese, detaily", ("identity", False)),
+        ("vyjednaná komprese, detaily", (encoding, False)),
+    ]:
+        start = time.perf_counter()
+        snap, server = run(*args)
+        report(name, snap, server, time.perf_counter() - start)
+
+    # Úplné karty – záznamy vzniknou jen z výpisu, žádný detail se nestáhne
+    start = time.perf_counter()
+    snap, server = run(encoding, True)
+    report("úplné karty", snap, server, time.perf_counter() - start)
+    assert server.listing_count == PAGES and server.detail_count == 0, server.detail_count
+    assert snap["counters"]["card_records"] == snap["counters"]["records"]
+
+    # Každá 4. karta jen s rokem a cenou – detail se stáhne jen pro ni, ostatní karty stačí
+    start = time.perf_counter()
+    snap, server = run(encoding, True, partial_every=4)
+    report("každá 4. karta neúplná", snap, server, time.perf_counter() - start)
+    partial = PAGES * sum(is_partial_card(i, 4) for i in range(PER_PAGE))
+    assert server.detail_count == partial, (server.detail_count, partial)
+    print(f"Detaily staženy jen pro {partial} neúplných karet z {PAGES * PER_PAGE}.")
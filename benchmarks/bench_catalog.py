@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+import tracemalloc
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(base_dir, "scripts"))
+
+from catalog_index import catalog_path, load_catalog
+from dataset_io import read_dataset, resolve_input
+
+""" Start aplikace a aktualizace rozbalovacích seznamů – původní načítání celého datasetu vs. předpočítaný katalog """
+
+dataset_path = resolve_input(os.path.join(base_dir, "datasets"), "final_dataset")
+
+def legacy_start():
+    df = read_dataset(dataset_path)
+    brands = sorted(df["Značka"].dropna().unique().tolist())
+    brand_models = {brand: sorted(df[df["Značka"] == brand]["Model"].dropna().unique().tolist()) for brand in brands}
+    sorted(df["Palivo"].dropna().unique().tolist())
+    sorted(df["Převodovka"].dropna().unique().tolist())
+    return df, brand_models
+
+def legacy_volumes(df, brand, model):
+    subset = df[(df["Značka"] == brand) & (df["Model"] == model)]
+    return sorted(subset["Objem (l)"].dropna().unique().tolist())
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+if __name__ == "__main__":
+    (df, legacy_models), legacy_time, legacy_peak = measure(legacy_start)
+    catalog, catalog_time, catalog_peak = measure(lambda: load_catalog(catalog_path))
+    pairs = [(brand, model) for brand, models in legacy_models.items() for model in models]
+
+    start = time.perf_counter()
+    legacy_lookup = [legacy_volumes(df, brand, model) for brand, model in pairs]
+    legacy_update = (time.perf_counter() - start) / len(pairs)
+    start = time.perf_counter()
+    catalog_lookup = [catalog["brands"][brand][model] for brand, model in pairs]
+    catalog_update = (time.perf_counter() - start) / len(pairs)
+
+    assert legacy_lookup == catalog_lookup and list(legacy_models) == list(catalog["brands"])
+    print(f"Dataset: {len(df)} řádků, {len(pairs)} dvojic značka/model")
+    print(f"{'varianta':<10} {'start ms':>10} {'špička MB':>10} {'výběr modelu µs':>16}")
+    print(f"{'dataset':<10} {legacy_time * 1000:>10.2f} {legacy_peak / 1e6:>10.2f} {legacy_update * 1e6:>16.1f}")
+    print(f"{'katalog':<10} {catalog_time * 1000:>10.2f} {catalog_peak / 1e6:>10.2f} {catalog_update * 1e6:>16.1f}")
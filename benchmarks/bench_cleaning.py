@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(base_dir, "scripts"))
+
+from dataset_cleaning import check_palivo, clean_frame, unify_brand, unify_text, unify_transmission
+from dataset_io import read_dataset
+
+""" Propustnost čištění (řádky/s) na synteticky zvětšeném merged datasetu – původní apply vs. vyhledávací tabulky """
+
+ROWS = int(os.getenv("BENCH_ROWS", "1000000"))
+
+""" Původní řádková implementace clean_dataset (bez čtení a zápisu souboru) """
+def legacy_clean_frame(df: pd.DataFrame) -> pd.DataFrame:
+    df.drop_duplicates(inplace=True)
+    df.dropna(how="all", inplace=True)
+    for col in ["Rok", "Najeté km", "Cena", "Výkon (kW)", "Objem (l)"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    df = df[df["Cena"].between(30000, 2500000)]
+    df = df[df["Rok"].between(1970, 2025)]
+    df = df[df["Najeté km"] <= 600000]
+    df = df[df["Objem (l)"].between(0.5, 8.0)]
+    df = df[df["Výkon (kW)"].between(20, 800)]
+    df["Značka"] = df["Značka"].apply(unify_brand)
+    df["Model"] = df["Model"].apply(unify_text)
+    df["Převodovka"] = df["Převodovka"].apply(unify_transmission)
+    df["Palivo"] = df["Palivo"].apply(check_palivo)
+    df.dropna(subset=["Značka", "Model", "Rok", "Cena", "Palivo", "Převodovka", "Výkon (kW)", "Objem (l)"], inplace=True)
+    df = df[~((df["Značka"] == "BMW") & (df["Model"].str.lower() == "rada"))]
+    df.drop(columns=["Zdroj"], inplace=True)
+    df["Stari"] = datetime.now().year - df["Rok"]
+    df.drop(columns=["Rok"], inplace=True)
+    text_columns = ["Značka", "Model", "Palivo", "Převodovka"]
+    for col in text_columns:
+        df[col] = df[col].apply(lambda x: unify_text(x) if isinstance(x, str) else x)
+    for col in text_columns:
+        df = df[~df[col].str.lower().isin({"ostatni", "nezjisteno"})]
+    return df
+
+""" Náhodný výběr z merged datasetu s rozkmitaným nájezdem, aby řádky nezmizely v drop_duplicates """
+def synthetic_merged(rows: int) -> pd.DataFrame:
+    merged = read_dataset(os.path.join(base_dir, "datasets", "merged_dataset.csv"))
+    rng = np.random.default_rng(42)
+    df = merged.sample(n=rows, replace=True, random_state=42).reset_index(drop=True)
+    df["Najeté km"] = pd.to_numeric(df["Najeté km"], errors="coerce") + rng.integers(0, 5000, size=rows)
+    return df
+
+def measure(fn, df: pd.DataFrame) -> tuple[pd.DataFrame, float]:
+    start = time.perf_counter()
+    result = fn(df.copy())
+    return result, time.perf_counter() - start
+
+if __name__ == "__main__":
+    df = synthetic_merged(ROWS)
+    print(f"Syntetický merged dataset: {len(df):,} řádků")
+    legacy, legacy_s = measure(legacy_clean_frame, df)
+    fast, fast_s = measure(clean_frame, df)
+    pd.testing.assert_frame_equal(legacy, fast)
+    print(f"{'původní (apply po řádcích)':<34} {legacy_s:7.2f} s  {len(df) / legacy_s:>12,.0f} řádků/s")
+    print(f"{'vyhledávací tabulky':<34} {fast_s:7.2f} s  {len(df) / fast_s:>12,.0f} řádků/s")
+    print(f"Zrychlení: {legacy_s / fast_s:.1f}×, výstup shodný ({len(fast):,} řádků)")
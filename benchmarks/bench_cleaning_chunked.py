@@ -0,0 +1,44 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from bench_cleaning import synthetic_merged
+
+""" Špička paměti a doba čištění – celý dataset najednou vs. po blocích """
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROWS = int(os.getenv("BENCH_ROWS", "1000000"))
+CHUNK_SIZES = [int(x) for x in os.getenv("BENCH_CHUNK_SIZES", "50000,200000").split(",")]
+
+CHILD = """
+import json, resource, sys, time
+sys.path.insert(0, sys.argv[1])
+from dataset_cleaning import clean_dataset, clean_dataset_chunked
+start = time.perf_counter()
+chunk_size = int(sys.argv[4])
+if chunk_size:
+    clean_dataset_chunked(sys.argv[2], sys.argv[3], chunk_size)
+else:
+    clean_dataset(sys.argv[2], sys.argv[3])
+print(json.dumps({"seconds": time.perf_counter() - start,
+                  "peak_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+"""
+
+def run(input_path: str, output_path: str, chunk_size: int) -> dict:
+    out = subprocess.run([sys.executable, "-c", CHILD, os.path.join(base_dir, "scripts"), input_path, output_path, str(chunk_size)],
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, "merged_dataset.csv")
+        synthetic_merged(ROWS).to_csv(input_path, index=False, encoding="utf-8-sig")
+        print(f"Syntetický merged dataset: {ROWS:,} řádků, {os.path.getsize(input_path) / 2**20:.0f} MB CSV")
+        for chunk_size in [0] + CHUNK_SIZES:
+            r = run(input_path, os.path.join(tmp, f"final_{chunk_size}.csv"), chunk_size)
+            name = "celý dataset" if not chunk_size else f"bloky po {chunk_size:,}"
+            print(f"{name:<22} {r['seconds']:7.2f} s   špička RSS {r['peak_mb']:7.0f} MB")
+        outputs = [open(os.path.join(tmp, f"final_{c}.csv"), "rb").read() for c in [0] + CHUNK_SIZES]
+        print("Výstupy shodné:", all(o == outputs[0] for o in outputs))
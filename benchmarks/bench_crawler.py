@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+
+import requests
+from bs4 import BeautifulSoup
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(base_dir, "data_collection"))
+
+from crawler import Crawler
+from fetch_engine import FetchEngine
+from stub_server import StubServer
+
+""" Porovnání stránkování po stránkách (výpis → všechny detaily → další výpis) s crawlerem producent/konzument """
+
+LATENCY = float(os.getenv("STUB_LATENCY", "0.1"))
+PAGES = int(os.getenv("STUB_PAGES", "8"))
+PER_PAGE = int(os.getenv("STUB_PER_PAGE", "20"))
+WORKERS = int(os.getenv("CONCURRENCY", "8"))
+
+def make_fetcher() -> FetchEngine:
+    return FetchEngine(requests.Session(), max_workers=WORKERS, per_host=WORKERS, requests_per_second=0)
+
+def page_urls(server: StubServer):
+    for page in range(1, PAGES + 1):
+        yield f"{server.base_url}/vsechna-auta?stranka={page}"
+
+def run(mode: str) -> tuple[int, float]:
+    with StubServer(latency=LATENCY, pages=PAGES, per_page=PER_PAGE) as server:
+        fetcher = make_fetcher()
+
+        def get_links(url):
+            soup = BeautifulSoup(fetcher.get(url).text, "html.parser")
+            return [server.base_url + a["href"] for a in soup.find_all("a", class_="car_item")]
+
+        def parse(url):
+            soup = BeautifulSoup(fetcher.get(url).text, "html.parser")
+            return soup.find("div", class_="car_detail2__h1").get_text(strip=True)
+
+        count = 0
+        start = time.perf_counter()
+        if mode == "pages":
+            for url in page_urls(server):
+                for link, data, error in fetcher.map(parse, get_links(url)):
+                    count += error is None
+        else:
+            for page, link, data, error in Crawler(fetcher, get_links, parse).run(page_urls(server)):
+                count += link is not None and error is None
+        elapsed = time.perf_counter() - start
+        fetcher.close()
+    return count, elapsed
+
+if __name__ == "__main__":
+    print(f"Stub server: latence {LATENCY * 1000:.0f} ms, {PAGES} stránek po {PER_PAGE} inzerátech, {WORKERS} vláken")
+    for name, mode in [("po stránkách", "pages"), ("producent/konzument", "crawler")]:
+        count, elapsed = run(mode)
+        print(f"{name:<22} {count:>4} detailů za {elapsed:6.2f} s => {count / elapsed * 60:8.0f} inzerátů/min")
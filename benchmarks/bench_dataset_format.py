@@ -0,0 +1,53 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(base_dir, "scripts"))
+
+from dataset_io import dataset_path, read_dataset, write_dataset
+
+""" Porovnání doby načtení a paměti datasetů v CSV vs. Parquet/Feather """
+
+DATASETS = [("raw_data", "auta_sauto"), ("datasets", "merged_dataset"), ("datasets", "final_dataset")]
+ROUNDS = int(os.getenv("BENCH_ROUNDS", "5"))
+
+# Měření běží v samostatném procesu – špička RSS zahrnuje interpreter, pandas i čtecí knihovnu
+CHILD = """
+import json, resource, sys, time
+sys.path.insert(0, sys.argv[2])
+from dataset_io import read_dataset
+times = []
+for _ in range(int(sys.argv[3])):
+    start = time.perf_counter()
+    df = read_dataset(sys.argv[1])
+    times.append(time.perf_counter() - start)
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"load_ms": min(times) * 1000, "rss_mb": peak / 1024,
+                  "frame_mb": df.memory_usage(deep=True).sum() / 2**20}))
+"""
+
+def measure(path: str) -> dict:
+    out = subprocess.run([sys.executable, "-c", CHILD, path, os.path.join(base_dir, "scripts"), str(ROUNDS)],
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'dataset':<18} {'formát':<8} {'velikost MB':>11} {'načtení ms':>11} {'špička RSS MB':>14} {'DataFrame MB':>13}")
+        for folder, stem in DATASETS:
+            csv_path = dataset_path(os.path.join(base_dir, folder), stem, "csv")
+            df = read_dataset(csv_path)
+            for fmt in ["csv", "parquet", "feather"]:
+                path = csv_path if fmt == "csv" else dataset_path(tmp, stem, fmt)
+                if fmt != "csv":
+                    try:
+                        write_dataset(df, path)
+                    except ImportError as e:
+                        print(f"{stem:<18} {fmt:<8} nelze zapsat: {e}")
+                        continue
+                r = measure(path)
+                size_mb = os.path.getsize(path) / 2**20
+                print(f"{stem:<18} {fmt:<8} {size_mb:>11.2f} {r['load_ms']:>11.1f} {r['rss_mb']:>14.1f} {r['frame_mb']:>13.2f}")
@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(base_dir, "scripts"))
+sys.path.insert(0, os.path.join(base_dir, "src"))
+
+from dataset_io import read_dataset, resolve_input
+from feature_transform import CATEGORICAL_COLUMNS, NUMERIC_COLUMNS
+from predictor import Predictor
+
+""" Předzpracování vstupu – původní LabelEncodery + scaler na výřezu sloupců vs. sloučený FeatureTransform """
+
+def legacy_encode_row(encoders, scaler, record: dict) -> np.ndarray:
+    codes = [encoders[col].transform([record[col]])[0] for col in CATEGORICAL_COLUMNS]
+    features = np.array([codes + [float(record[col]) for col in NUMERIC_COLUMNS]], dtype=float)
+    features[:, [4, 5, 6, 7]] = scaler.transform(features[:, [4, 5, 6, 7]])
+    return features
+
+def legacy_encode_frame(encoders, scaler, df: pd.DataFrame) -> np.ndarray:
+    features = np.column_stack([encoders[col].transform(df[col]) for col in CATEGORICAL_COLUMNS]
+                               + [df[NUMERIC_COLUMNS].to_numpy(dtype=float)])
+    features[:, [4, 5, 6, 7]] = scaler.transform(features[:, [4, 5, 6, 7]])
+    return features
+
+def per_call(func, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats
+
+if __name__ == "__main__":
+    predictor = Predictor()
+    encoders, scaler, transform = predictor.encoders, predictor.scaler, predictor.transform
+    df = read_dataset(resolve_input(os.path.join(base_dir, "datasets"), "final_dataset"))
+    df = df[np.logical_and.reduce([df[col].isin(encoders[col].classes_) for col in CATEGORICAL_COLUMNS])]
+    df = df[CATEGORICAL_COLUMNS + NUMERIC_COLUMNS].astype({col: str for col in CATEGORICAL_COLUMNS})
+    record = df.iloc[0].to_dict()
+    big = df.sample(100000, replace=True, random_state=0).reset_index(drop=True)
+
+    legacy = legacy_encode_frame(encoders, scaler, big)
+    fused, errors = transform.transform_frame(big)
+    valid = errors == 0
+    assert np.array_equal(legacy[valid], fused[valid])
+    assert np.array_equal(legacy_encode_row(encoders, scaler, record), transform.transform_records([record])[0])
+
+    row_legacy = per_call(lambda: legacy_encode_row(encoders, scaler, record), 2000)
+    row_fused = per_call(lambda: transform.transform_records([record]), 2000)
+    frame_legacy = per_call(lambda: legacy_encode_frame(encoders, scaler, big), 5)
+    frame_fused = per_call(lambda: transform.transform_frame(big), 5)
+    print(f"{'vstup':<14} {'původní':>12} {'sloučený':>12} {'zrychlení':>10}")
+    print(f"{'1 řádek':<14} {row_legacy * 1e6:>9.1f} µs {row_fused * 1e6:>9.1f} µs {row_legacy / row_fused:>9.1f}x")
+    print(f"{'100k řádků':<14} {frame_legacy * 1000:>9.1f} ms {frame_fused * 1000:>9.1f} ms {frame_legacy / frame_fused:>9.1f}x")
@@ -0,0 +1,51 @@
+import os
+import sys
+import time
+
+import requests
+from bs4 import BeautifulSoup
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(base_dir, "data_collection"))
+
+from fetch_engine import FetchEngine
+from stub_server import StubServer
+
+""" Měření propustnosti (inzeráty/min) FetchEngine proti lokálnímu stub serveru """
+
+LATENCY = float(os.getenv("STUB_LATENCY", "0.1"))
+PAGES = int(os.getenv("STUB_PAGES", "3"))
+PER_PAGE = int(os.getenv("STUB_PER_PAGE", "20"))
+
+def run(max_workers: int, per_host: int, requests_per_second: float) -> tuple[int, float]:
+    with StubServer(latency=LATENCY, pages=PAGES, per_page=PER_PAGE) as server:
+        fetcher = FetchEngine(requests.Session(), max_workers=max_workers, per_host=per_host,
+                              requests_per_second=requests_per_second)
+
+        def parse(url):
+            soup = BeautifulSoup(fetcher.get(url).text, "html.parser")
+            return soup.find("div", class_="car_detail2__h1").get_text(strip=True)
+
+        seen_set = set()
+        start = time.perf_counter()
+        for page in range(1, PAGES + 1):
+            soup = BeautifulSoup(fetcher.get(f"{server.base_url}/vsechna-auta?stranka={page}").text, "html.parser")
+            links = [server.base_url + a["href"] for a in soup.find_all("a", class_="car_item")]
+            for link, data, error in fetcher.map(parse, links):
+                if error is None and link not in seen_set:
+                    seen_set.add(link)
+        elapsed = time.perf_counter() - start
+        fetcher.close()
+    return len(seen_set), elapsed
+
+if __name__ == "__main__":
+    print(f"Stub server: latence {LATENCY * 1000:.0f} ms, {PAGES} stránek po {PER_PAGE} inzerátech")
+    configs = [
+        ("sekvenčně (1 vlákno)", 1, 1, 0),
+        ("souběžně 8 vláken / 4 na host", 8, 4, 0),
+        ("souběžně 8 vláken / 8 na host", 8, 8, 0),
+        ("souběžně 8 vláken / 8 na host, 20 req/s", 8, 8, 20),
+    ]
+    for name, workers, per_host, rps in configs:
+        count, elapsed = run(workers, per_host, rps)
+        print(f"{name:<42} {count:>4} inzerátů za {elapsed:6.2f} s => {count / elapsed * 60:8.0f} inzerátů/min")
@@ -0,0 +1,74 @@
+import glob
+import os
+import re
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(base_dir, "data_collection"))
+import autoesa_scraper
+
+""" Měření rychlosti parsování detailu autoesa (stránky/s) nad uloženými HTML fixtures """
+
+FIXTURES = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "autoesa_detail_*.html")))
+ROUNDS = int(os.getenv("BENCH_ROUNDS", "200"))
+
+""" Původní implementace – každý parametr znovu prochází všechny li """
+def legacy_parse_esa_html(html: str, url: str) -> dict | None:
+    soup = BeautifulSoup(html, "html.parser")
+    h1_div = soup.find("div", class_="car_detail2__h1")
+    title_text = h1_div.find("h1").get_text(strip=True)
+    brand, model = autoesa_scraper.parse_brand_model(title_text)
+
+    def find_span(label, popover=True):
+        items = soup.find_all("li", attrs={"data-toggle": "popover"}) if popover else soup.find_all("li")
+        for li in items:
+            strong = li.find("strong")
+            if strong and strong.get_text(strip=True).lower() == label:
+                span = li.find("span")
+                return span.get_text(strip=True) if span else None
+        return None
+
+    year_val = find_span("rok")
+    mileage_digits = re.sub(r"[^\d]", "", find_span("stav tachometru"))
+    price_text = soup.find("div", class_="show-more-price-right-right").find("strong").get_text(strip=True)
+    price_val = re.sub(r"[^\d]", "", price_text)
+    fuel_val = find_span("palivo")
+    transmission_main = find_span("převodovka").split("/")[0].strip()
+    power_val = re.search(r"(\d+)\s*kW", find_span("výkon", popover=False)).group(1)
+    engine_val = "Nezjištěno"
+    motor_text = find_span("motor")
+    if motor_text:
+        match_motor = re.search(r'(\d+(?:[.,]\d+)?)', motor_text)
+        if match_motor:
+            engine_val = float(match_motor.group(1).replace(',', '.'))
+    return {
+        "URL": url, "Značka": brand, "Model": model, "Objem (l)": engine_val, "Rok": year_val,
+        "Najeté km": mileage_digits, "Cena": price_val, "Palivo": fuel_val,
+        "Převodovka": transmission_main, "Výkon (kW)": power_val
+    }
+
+def measure(parse_fn, pages: list[str]) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for html in pages:
+            parse_fn(html, "fixture")
+    return ROUNDS * len(pages) / (time.perf_counter() - start)
+
+if __name__ == "__main__":
+    pages = [open(path, encoding="utf-8").read() for path in FIXTURES]
+    adapter = autoesa_scraper.AutoesaAdapter(html_parser="html.parser")
+    for html in pages:
+        assert legacy_parse_esa_html(html, "fixture") == adapter.parse_detail(html, "fixture")
+    print(f"{len(pages)} fixtures × {ROUNDS} kol")
+    print(f"{'původní (html.parser)':<32} {measure(legacy_parse_esa_html, pages):8.1f} stránek/s")
+    for parser in ["html.parser", "lxml", "html5lib"]:
+        try:
+            BeautifulSoup("<p></p>", parser)
+        except Exception:
+            print(f"{'jednoprůchodový (' + parser + ')':<32} parser není nainstalován")
+            continue
+        adapter.html_parser = parser
+        print(f"{'jednoprůchodový (' + parser + ')':<32} {measure(adapter.parse_detail, pages):8.1f} stránek/s")
@@ -0,0 +1,51 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(base_dir, "scripts"))
+sys.path.insert(0, os.path.join(base_dir, "src"))
+
+from dataset_io import read_dataset, resolve_input
+from feature_transform import CATEGORICAL_COLUMNS
+from prediction_cache import CachedPredictor
+from predictor import Predictor
+
+""" Paměť výsledků při opakujících se dotazech – čas na dotaz a úspěšnost bez/s košem najetých km a stáří """
+
+REQUESTS = int(os.getenv("BENCH_REQUESTS", "5000"))
+REPEATS = int(os.getenv("BENCH_REPEATS", "3"))
+
+""" Dotazy jako od uživatelů: oblíbené konfigurace (Zipf) s náhodně zadaným nájezdem a stářím """
+def workload(df, n: int) -> list[dict]:
+    rng = np.random.default_rng(0)
+    configs = df.drop_duplicates(CATEGORICAL_COLUMNS + ["Objem (l)", "Výkon (kW)"]).to_dict("records")
+    picks = np.minimum(rng.zipf(1.3, n) - 1, len(configs) - 1)
+    mileage = rng.choice(np.arange(0, 300001, 500), n)
+    age = rng.integers(0, 20, n)
+    return [{**configs[i], "Najeté km": int(km), "Stari": int(a)} for i, km, a in zip(picks, mileage, age)]
+
+def run(predict_one, records) -> float:
+    start = time.perf_counter()
+    for record in records:
+        predict_one(record)
+    return (time.perf_counter() - start) / len(records)
+
+if __name__ == "__main__":
+    predictor = Predictor()
+    df = read_dataset(resolve_input(os.path.join(base_dir, "datasets"), "final_dataset"))
+    records = workload(df, REQUESTS)
+    # Zahřátí modelu, pak nejlepší z REPEATS běhů – každý běh s prázdnou pamětí
+    run(predictor.predict_one, records[:200])
+
+    print(f"{'varianta':<28} {'µs/dotaz':>9} {'úspěšnost':>10}  (backend {predictor.backend})")
+    print(f"{'bez paměti':<28} {min(run(predictor.predict_one, records) for _ in range(REPEATS)) * 1e6:>9.1f} {'-':>10}")
+    for label, mileage_bucket, age_bucket in [("LRU, přesný klíč", 0, 0), ("LRU, koš 10 000 km", 10000, 0),
+                                              ("LRU, koš 10 000 km a 2 roky", 10000, 2)]:
+        times = []
+        for _ in range(REPEATS):
+            cached = CachedPredictor(predictor, maxsize=10000, mileage_bucket=mileage_bucket, age_bucket=age_bucket)
+            times.append(run(cached.predict_one, records))
+        print(f"{label:<28} {min(times) * 1e6:>9.1f} {cached.cache_stats()['cache_hit_rate']:>10.1%}")
@@ -0,0 +1,41 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(base_dir, "scripts"))
+sys.path.insert(0, os.path.join(base_dir, "src"))
+
+from dataset_io import read_dataset, resolve_input
+from predictor import Predictor
+
+""" Latence bodového odhadu vs. bodového odhadu s intervalem (kvantilové modely) pro jednotlivé backendy """
+
+BATCH_SIZES = [int(s) for s in os.getenv("BENCH_SIZES", "1,100,100000").split(",")]
+
+def median_time(func, X, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(X)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+if __name__ == "__main__":
+    predictors = {backend: Predictor(backend=backend) for backend in ("sklearn", "flat", "auto")}
+    if not predictors["sklearn"].has_interval:
+        sys.exit("Artefakty neobsahují quantile_models.pkl – natrénujte model s QUANTILES (scripts/train_model.py).")
+    df = read_dataset(resolve_input(os.path.join(base_dir, "datasets"), "final_dataset"))
+    features, errors = predictors["sklearn"].encode(df)
+    features = features[errors == 0]
+
+    sklearn_model = predictors["sklearn"].gb_model
+    print(f"{'dávka':>8} {'jen bod sklearn':>16} " + " ".join(f"{'s intervalem ' + b:>22}" for b in predictors) + "  (ms)")
+    for size in BATCH_SIZES:
+        X = np.resize(features, (size, features.shape[1]))
+        repeats = 200 if size <= 100 else 3
+        point = median_time(sklearn_model.predict, X, repeats)
+        with_interval = [median_time(p.model_predict, X, repeats) for p in predictors.values()]
+        print(f"{size:>8} {point * 1000:>16.3f} " + " ".join(f"{t * 1000:>22.3f}" for t in with_interval))
@@ -0,0 +1,57 @@
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(base_dir, "src"))
+
+from prediction_service import ServiceClient, create_server
+from predictor import CATEGORICAL_COLUMNS, Predictor
+
+""" Latence služby predikce při souběžných klientech (jeden záznam na požadavek) – p50/p99 a velikost dávek """
+
+CLIENTS = [int(c) for c in os.getenv("BENCH_CLIENTS", "1,8,32").split(",")]
+REQUESTS_PER_CLIENT = int(os.getenv("BENCH_REQUESTS", "200"))
+
+def sample_records(predictor: Predictor, n: int) -> list[dict]:
+    rng = np.random.default_rng(0)
+    records = []
+    for _ in range(n):
+        record = {col: str(rng.choice(predictor.encoders[col].classes_)) for col in CATEGORICAL_COLUMNS}
+        record.update({"Objem (l)": 1.6, "Najeté km": float(rng.integers(0, 300000)),
+                       "Výkon (kW)": float(rng.integers(50, 200)), "Stari": float(rng.integers(0, 20))})
+        records.append(record)
+    return records
+
+def run(predictor: Predictor, clients: int) -> tuple[dict, float]:
+    server = create_server(predictor, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = ServiceClient(f"http://127.0.0.1:{server.server_address[1]}")
+    records = sample_records(predictor, REQUESTS_PER_CLIENT)
+
+    def worker():
+        for record in records:
+            client.predict_one(record)
+
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    metrics = client.metrics()
+    server.shutdown()
+    server.server_close()
+    return metrics, elapsed
+
+if __name__ == "__main__":
+    predictor = Predictor()
+    print(f"{'klienti':>8} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'prům. dávka':>12}")
+    for clients in CLIENTS:
+        metrics, elapsed = run(predictor, clients)
+        print(f"{clients:>8} {metrics['requests'] / elapsed:>8.0f} {metrics['p50_ms']:>8.2f} "
+              f"{metrics['p99_ms']:>8.2f} {metrics['avg_batch_size']:>12.2f}")
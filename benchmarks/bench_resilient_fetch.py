@@ -0,0 +1,84 @@
+import os
+import sys
+import time
+
+import requests
+from bs4 import BeautifulSoup
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(base_dir, "data_collection"))
+
+from crawler import Crawler
+from fetch_engine import FetchEngine, RetryPolicy
+from stub_server import StubServer
+
+""" Propustnost a ztracené inzeráty při výpadcích – stub server vkládá 503, 429 s Retry-After, pomalé odpovědi a zavřená spojení """
+
+LATENCY = float(os.getenv("STUB_LATENCY", "0.05"))
+PAGES = int(os.getenv("STUB_PAGES", "6"))
+PER_PAGE = int(os.getenv("STUB_PER_PAGE", "20"))
+WORKERS = int(os.getenv("CONCURRENCY", "8"))
+FAULTS = {"error": 0.1, "throttle": 0.05, "slow": 0.05, "drop": 0.05}
+
+def crawl(server: StubServer, engine: FetchEngine) -> tuple[int, int, float]:
+    def get_links(url):
+        soup = BeautifulSoup(engine.get(url).text, "html.parser")
+        return [server.base_url + a["href"] for a in soup.find_all("a", class_="car_item")]
+
+    def parse(url):
+        soup = BeautifulSoup(engine.get(url).text, "html.parser")
+        return soup.find("div", class_="car_detail2__h1").get_text(strip=True)
+
+    pages = (f"{server.base_url}/vsechna-auta?stranka={page}" for page in range(1, PAGES + 1))
+    ok = lost = 0
+    start = time.perf_counter()
+    for page, link, data, error in Crawler(engine, get_links, parse).run(pages):
+        if link is not None:
+            ok += error is None
+            lost += error is not None
+        if engine.out_of_budget():
+            break
+    return ok, lost, time.perf_counter() - start
+
+def engine(**kwargs) -> FetchEngine:
+    return FetchEngine(requests.Session(), max_workers=WORKERS, per_host=WORKERS, requests_per_second=0, **kwargs)
+
+def report(name: str, ok: int, lost: int, elapsed: float, server: StubServer) -> None:
+    print(f"{name:<34} {ok:>4} detailů, {lost:>3} ztraceno, {server.request_count:>4} požadavků za {elapsed:6.2f} s "
+          f"=> {ok / elapsed * 60:6.0f} inzerátů/min")
+
+if __name__ == "__main__":
+    print(f"Stub server: latence {LATENCY * 1000:.0f} ms, {PAGES} stránek po {PER_PAGE} inzerátech, {WORKERS} vláken, "
+          f"výpadky {FAULTS}")
+    scenarios = [
+        ("bez výpadků", {}, dict(timeout=10)),
+        ("výpadky, bez opakování", FAULTS, dict(timeout=10)),
+        ("výpadky, opakování + timeout 1 s", FAULTS,
+         dict(timeout=(1, 1), retry=RetryPolicy(retries=4, backoff=0.2, max_backoff=2), breaker_threshold=8)),
+    ]
+    for name, faults, kwargs in scenarios:
+        with StubServer(latency=LATENCY, pages=PAGES, per_page=PER_PAGE, faults=faults) as server:
+            fetcher = engine(**kwargs)
+            report(name, *crawl(server, fetcher), server)
+            fetcher.close()
+
+    # Nedostupný host – bez jističe se každý detail opakuje až do vyčerpání pokusů, s jističem se skončí rychle
+    for name, threshold in [("host dole, bez jističe", 0), ("host dole, jistič po 5 selháních", 5)]:
+        with StubServer(latency=LATENCY, pages=PAGES, per_page=PER_PAGE) as server:
+            fetcher = engine(timeout=(1, 1), retry=RetryPolicy(retries=3, backoff=0.1, max_backoff=1),
+                             breaker_threshold=threshold, breaker_cooldown=30)
+            # První stránka výpisu projde, pak host spadne
+            fetcher.get(f"{server.base_url}/vsechna-auta?stranka=1")
+            server.down = True
+            start = time.perf_counter()
+            results = list(fetcher.map(fetcher.get, [server.base_url + f"/auto/1-{i}" for i in range(PER_PAGE)]))
+            elapsed = time.perf_counter() - start
+            lost = sum(error is not None for _, _, error in results)
+            report(name, len(results) - lost, lost, elapsed, server)
+            fetcher.close()
+
+    # Časový rozpočet – pomalý host, běh se ukončí po vypršení rozpočtu místo čekání na všechny stránky
+    with StubServer(latency=0.5, pages=PAGES, per_page=PER_PAGE) as server:
+        fetcher = engine(timeout=10, time_budget=2.0)
+        report("pomalý host, rozpočet 2 s", *crawl(server, fetcher), server)
+        fetcher.close()
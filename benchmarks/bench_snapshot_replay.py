@@ -0,0 +1,45 @@
+import glob
+import os
+import sys
+import tempfile
+import time
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(base_dir, "data_collection"))
+from autoesa_scraper import AutoesaAdapter
+from snapshot_store import REPLAY_WORKERS, SnapshotStore, replay
+
+""" Měření archivu odpovědí – velikost po kompresi, rychlost ukládání a offline replay (1 proces vs. více) """
+
+FIXTURES = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "autoesa_detail_*.html")))
+PAGES = int(os.getenv("BENCH_PAGES", "3000"))
+
+if __name__ == "__main__":
+    templates = [open(path, encoding="utf-8").read() for path in FIXTURES]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SnapshotStore(os.path.join(tmp, "snapshots"))
+        raw_bytes = 0
+        start = time.perf_counter()
+        for i in range(PAGES):
+            # Každá stránka má jiný obsah, jinak by se v archivu adresovaném obsahem uložila jen jednou
+            body = (templates[i % len(templates)] + f"<!-- {i} -->").encode("utf-8")
+            raw_bytes += len(body)
+            store.put(f"https://www.autoesa.cz/auto/{i}", body, "utf-8")
+        put_elapsed = time.perf_counter() - start
+        stored_bytes = sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, names in os.walk(os.path.join(tmp, "snapshots", "objects")) for name in names
+        )
+        print(f"Archiv: {PAGES} stránek, {raw_bytes / 1e6:.1f} MB => {stored_bytes / 1e6:.1f} MB "
+              f"({raw_bytes / stored_bytes:.1f}×), ukládání {PAGES / put_elapsed:.0f} stránek/s")
+
+        results = {}
+        for workers in sorted({1, REPLAY_WORKERS}):
+            start = time.perf_counter()
+            records = replay(store, AutoesaAdapter, workers=workers)
+            elapsed = time.perf_counter() - start
+            results[workers] = records
+            print(f"replay {workers:>2} procesů ({AutoesaAdapter().html_parser}): {len(records)} záznamů za "
+                  f"{elapsed:6.2f} s => {len(records) / elapsed:8.0f} stránek/s")
+        assert all(r == results[1] for r in results.values())
+        store.close()
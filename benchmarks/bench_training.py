@@ -0,0 +1,32 @@
+import os
+import sys
+
+import numpy as np
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(base_dir, "scripts"))
+
+from dataset_io import read_dataset, resolve_input
+from train_model import train
+
+""" Čas tréninku (wall-clock) v závislosti na velikosti datasetu – gb vs. hist a počet vláken """
+
+SIZES = [int(s) for s in os.getenv("BENCH_SIZES", "5000,15000,60000,240000").split(",")]
+THREADS = sorted({1, os.cpu_count()})
+
+""" Dataset požadované velikosti – výběr s opakováním ze skutečného final_dataset
+    (duplicitní řádky se dostanou i do testovací části, MAPE zde slouží jen pro orientaci) """
+def resample(df, rows: int):
+    idx = np.random.default_rng(0).integers(0, len(df), rows)
+    return df.iloc[idx].reset_index(drop=True)
+
+if __name__ == "__main__":
+    df = read_dataset(resolve_input(os.path.join(base_dir, "datasets"), "final_dataset"))
+    print(f"{'řádků':>8} {'model':>6} {'vláken':>7} {'fit s':>8} {'řádků/s':>10} {'MAPE %':>8}")
+    for rows in SIZES:
+        sample = resample(df, rows)
+        for model_type in ("gb", "hist"):
+            for threads in THREADS if model_type == "hist" else [1]:
+                *_, stats = train(sample, model_type=model_type, threads=threads, quantiles=[])
+                print(f"{rows:>8} {model_type:>6} {threads:>7} {stats['fit_seconds']:>8.2f} "
+                      f"{stats['train_rows'] / stats['fit_seconds']:>10,.0f} {stats['test']['mape']:>8.1f}")
@@ -0,0 +1,43 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(base_dir, "scripts"))
+sys.path.insert(0, os.path.join(base_dir, "src"))
+
+from dataset_io import read_dataset, resolve_input
+from predictor import Predictor
+from tree_inference import FlatEnsemble
+
+""" Latence gb_model.predict (sklearn) vs. zploštělé inference pro dávky 1, 100 a 100 000 řádků """
+
+BATCH_SIZES = [int(s) for s in os.getenv("BENCH_SIZES", "1,100,100000").split(",")]
+
+def median_time(func, X, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(X)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+if __name__ == "__main__":
+    predictor = Predictor()
+    flat = FlatEnsemble.from_sklearn(predictor.gb_model)
+    df = read_dataset(resolve_input(os.path.join(base_dir, "datasets"), "final_dataset"))
+    features, errors = predictor.encode(df)
+    features = features[errors == 0]
+
+    print(f"Model {type(predictor.gb_model).__name__}, verze {predictor.version}, {len(flat.roots)} stromů, "
+          f"hloubka {flat.depth}")
+    print(f"{'dávka':>8} {'sklearn ms':>11} {'flat ms':>9} {'zrychlení':>10} {'max. rozdíl':>12}")
+    for size in BATCH_SIZES:
+        X = np.resize(features, (size, features.shape[1]))
+        repeats = 200 if size <= 100 else 3
+        sk_time = median_time(predictor.gb_model.predict, X, repeats)
+        flat_time = median_time(flat.predict, X, repeats)
+        diff = np.abs(predictor.gb_model.predict(X) - flat.predict(X)).max()
+        print(f"{size:>8} {sk_time * 1000:>11.3f} {flat_time * 1000:>9.3f} {sk_time / flat_time:>9.1f}x {diff:>12.2e}")
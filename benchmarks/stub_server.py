@@ -0,0 +1,207 @@
+import gzip
+import hashlib
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+""" Lokální stub server napodobující autoesa.cz pro měření propustnosti scraperů, volitelně se vkládanými výpadky """
+
+BRANDS = ["Škoda Octavia", "Škoda Fabia", "Volkswagen Golf", "Ford Focus", "Hyundai i30"]
+FUELS = ["nafta", "benzín"]
+TRANSMISSIONS = ["manual / 6 st.", "automat / 7 st."]
+
+""" Parametry, které ukazuje karta inzerátu ve výpisu (výchozí = všechny) """
+CARD_PARAMS = ("Rok", "Stav tachometru", "Palivo", "Převodovka", "Motor", "Výkon", "Cena")
+
+""" Deterministické údaje inzerátu podle jeho id – stejné na kartě i v detailu """
+def listing_fields(listing_id: str) -> tuple[str, dict]:
+    n = sum(ord(c) for c in listing_id)
+    power = 70 + n % 90
+    params = {
+        "Rok": str(2005 + n % 18),
+        "Stav tachometru": f"{20000 + (n * 7919) % 300000:,} km".replace(",", " "),
+        "Palivo": FUELS[n % 2],
+        "Převodovka": TRANSMISSIONS[n % 2],
+        "Motor": "1,6 TDI",
+        "Výkon": f"{power} kW ({int(power * 1.36)} k)",
+        "Cena": f"{80000 + (n * 104729) % 700000:,} Kč".replace(",", " ")
+    }
+    return BRANDS[n % len(BRANDS)], params
+
+def is_partial_card(index: int, partial_every: int) -> bool:
+    return bool(partial_every) and index % partial_every == 0
+
+""" HTML stránky s výpisem inzerátů – karty nesou titulek a zvolené parametry """
+def listing_html(page: int, per_page: int, card_params: tuple = CARD_PARAMS, partial_params: tuple = (),
+                 partial_every: int = 0) -> str:
+    cards = []
+    for i in range(per_page):
+        title, params = listing_fields(f"{page}-{i}")
+        # Každá partial_every-tá karta ukazuje jen partial_params (0 = všechny karty stejné)
+        labels = partial_params if is_partial_card(i, partial_every) else card_params
+        items = "".join(f"<li><strong>{label}</strong><span>{params[label]}</span></li>" for label in labels)
+        cards.append(
+            f'<a class="car_item" href="/auto/{page}-{i}"><div class="car_item__title">{title} 1.6 TDI Style</div>'
+            f'<ul>{items}</ul></a>'
+        )
+    return "<html><body><div class=\"cars\">" + "\n".join(cards) + "</div></body></html>"
+
+""" HTML detailu inzerátu ve struktuře autoesa.cz """
+def detail_html(listing_id: str) -> str:
+    title, params = listing_fields(listing_id)
+    popover = "\n".join(
+        f'<li data-toggle="popover"><strong>{label}</strong><span>{params[label]}</span></li>'
+        for label in ("Rok", "Stav tachometru", "Palivo", "Převodovka", "Motor")
+    )
+    return f"""<html><head><title>{title}</title></head><body>
+<div class="car_detail2__h1"><h1>{title} 1.6 TDI Style</h1></div>
+<ul class="car_detail2__params">
+{popover}
+<li><strong>Výkon</strong><span>{params["Výkon"]}</span></li>
+</ul>
+<div class="show-more-price-right-right"><strong>{params["Cena"]}</strong></div>
+</body></html>"""
+
+""" Druhy vkládaných výpadků – error (503), throttle (429 s Retry-After), slow (dlouhá odpověď), drop (zavřené spojení) """
+FAULTS = ("error", "throttle", "slow", "drop")
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.request_count += 1
+            fault = server.pick_fault()
+            if fault:
+                server.fault_counts[fault] = server.fault_counts.get(fault, 0) + 1
+        if server.latency:
+            time.sleep(server.latency)
+        if fault == "drop":
+            # Spojení se zavře bez odpovědi – klient dostane ConnectionError
+            self.close_connection = True
+            return
+        if fault in ("error", "throttle"):
+            self.send_response(503 if fault == "error" else 429)
+            if fault == "throttle":
+                self.send_header("Retry-After", str(server.retry_after))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if fault == "slow":
+            time.sleep(server.slow_latency)
+        parts = urlsplit(self.path)
+        if parts.path.startswith("/auto/"):
+            with server.lock:
+                server.detail_count += 1
+            body = detail_html(parts.path.rsplit("/", 1)[1])
+        else:
+            page = int(parse_qs(parts.query).get("stranka", ["1"])[0])
+            with server.lock:
+                server.listing_count += 1
+            body = (listing_html(page, server.per_page, server.card_params, server.partial_params, server.partial_every)
+                    if page <= server.pages else "<html></html>")
+        data = body.encode("utf-8")
+        etag = '"' + hashlib.sha1(data).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", etag)
+        if server.compress and "gzip" in self.headers.get("Accept-Encoding", ""):
+            data = gzip.compress(data, compresslevel=6)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+class FaultyHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    """ Náhodný výpadek podle zadaných pravděpodobností (volá se pod zámkem, generátor je deterministický) """
+    def pick_fault(self) -> str | None:
+        if self.down:
+            return "error"
+        roll = self.rng.random()
+        for fault in FAULTS:
+            roll -= self.faults.get(fault, 0.0)
+            if roll < 0:
+                return fault
+        return None
+
+    # Klient po timeoutu zavře spojení dřív, než pomalá odpověď dorazí – to není chyba serveru
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+""" Spuštění serveru ve vlákně na náhodném portu – použití jako context manager """
+class StubServer:
+    def __init__(self, latency: float = 0.1, pages: int = 5, per_page: int = 20, faults: dict | None = None,
+                 slow_latency: float = 2.0, retry_after: int = 1, seed: int = 0, compress: bool = True,
+                 card_params: tuple = CARD_PARAMS, partial_params: tuple = ("Rok", "Cena"), partial_every: int = 0):
+        self.httpd = FaultyHTTPServer(("127.0.0.1", 0), StubHandler)
+        self.httpd.latency = latency
+        self.httpd.pages = pages
+        self.httpd.per_page = per_page
+        self.httpd.card_params = card_params
+        self.httpd.partial_params = partial_params
+        self.httpd.partial_every = partial_every
+        # Odpověď se komprimuje gzipem, pokud o to klient požádá v Accept-Encoding
+        self.httpd.compress = compress
+        # Pravděpodobnost jednotlivých výpadků, např. {"error": 0.1, "drop": 0.05}
+        self.httpd.faults = faults or {}
+        self.httpd.slow_latency = slow_latency
+        self.httpd.retry_after = retry_after
+        self.httpd.rng = random.Random(seed)
+        # down=True simuluje úplně nedostupný host (každý požadavek 503)
+        self.httpd.down = False
+        self.httpd.fault_counts = {}
+        self.httpd.lock = threading.Lock()
+        self.httpd.request_count = 0
+        self.httpd.listing_count = 0
+        self.httpd.detail_count = 0
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def request_count(self) -> int:
+        return self.httpd.request_count
+
+    @property
+    def listing_count(self) -> int:
+        return self.httpd.listing_count
+
+    @property
+    def detail_count(self) -> int:
+        return self.httpd.detail_count
+
+    @property
+    def fault_counts(self) -> dict:
+        return dict(self.httpd.fault_counts)
+
+    @property
+    def down(self) -> bool:
+        return self.httpd.down
+
+    @down.setter
+    def down(self, value: bool) -> None:
+        self.httpd.down = value
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -1,81 +1,10 @@
-import os
-import requests
-from bs4 import BeautifulSoup
-import time
-import pandas as pd
 import re
 from urllib.parse import urlencode
-from dotenv import load_dotenv
 
-""" Nastavení možností pro pandas """
-pd.set_option('display.max_colwidth', None)
+from bs4 import BeautifulSoup, SoupStrainer
 
-""" Načtení konfigurace z .env souboru """
-load_dotenv()
-
-""" Konfigurační proměnné s výchozími hodnotami """
-BRAND = os.getenv("BRAND")  # Například "skoda", "audi", "bmw" atd.
-NUM_LISTINGS = int(os.getenv("NUM_LISTINGS", "50"))
-MAX_PAGES = int(os.getenv("MAX_PAGES", "5"))
-MIN_PRICE = os.getenv("MIN_PRICE")
-MAX_PRICE = os.getenv("MAX_PRICE")
-MIN_PRICE = int(MIN_PRICE) if MIN_PRICE is not None else None
-MAX_PRICE = int(MAX_PRICE) if MAX_PRICE is not None else None
-
-""" Funkce pro validaci konfiguračních hodnot """
-def validate_config(num_listings, max_pages, min_price, max_price):
-    errors = []
-    if min_price is not None and min_price < 0:
-        errors.append("MIN_PRICE nesmí být záporná.")
-    if num_listings <= 0:
-        errors.append("NUM_LISTINGS musí být kladné číslo.")
-    if max_pages <= 0:
-        errors.append("MAX_PAGES musí být kladné číslo.")
-    if min_price is not None and max_price is not None and min_price >= max_price:
-        errors.append("MIN_PRICE musí být menší než MAX_PRICE.")
-    if errors:
-        raise ValueError(" ".join(errors))
-
-try:
-    validate_config(NUM_LISTINGS, MAX_PAGES, MIN_PRICE, MAX_PRICE)
-except ValueError as ve:
-    print(f"Konfigurační chyba: {ve}")
-    exit(1)
-
-""" Sestavení query stringu podle cenového rozsahu """
-params = {}
-if MIN_PRICE is not None:
-    params["cena_od"] = MIN_PRICE
-if MAX_PRICE is not None:
-    params["cena_do"] = MAX_PRICE
-query_string = urlencode(params)
-
-""" Funkce pro ověření URL – vrátí ověřenou URL nebo základní URL bez parametrů """
-def get_validated_url(base: str, brand: str, query: str) -> str:
-    test_url = f"{base}/{brand}?{query}"
-    try:
-        response = requests.get(test_url, timeout=10)
-        response.raise_for_status()
-        return test_url
-    except Exception as e:
-        print(f"Chyba při ověřování URL pro značku '{brand}': {e}")
-        return f"{base}/{brand}"
-
-""" Sestavení základní URL – pokud je značka zadána, ověříme URL, jinak použijeme stránku se všemi auty """
-if BRAND:
-    base_url = get_validated_url("https://www.autoesa.cz", BRAND, query_string)
-else:
-    base_url = f"https://www.autoesa.cz/vsechna-auta?{query_string}"
-
-""" Vytvoření session s požadovanými hlavičkami """
-session = requests.Session()
-session.headers.update({
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-    "Accept-Language": "cs-CZ,cs;q=0.9,en-US;q=0.8,en;q=0.7",
-    "Accept-Encoding": "gzip, deflate, br",
-    "Connection": "keep-alive"
-})
+from scrape_runtime import main
+from source_adapter import SourceAdapter, register_source
 
 """ Funkce pro parsování značky a modelu z titulku """
 def parse_brand_model(title: str) -> tuple[str, str]:
@@ -84,284 +13,191 @@ def parse_brand_model(title: str) -> tuple[str, str]:
         return (title, "Nezjištěno")
     return (tokens[0], tokens[1])
 
-""" Funkce pro získání odkazů na inzeráty ze stránky """
-def get_listing_links(page_url: str) -> list[str]:
-    try:
-        resp = session.get(page_url, timeout=10)
-        resp.raise_for_status()
-    except Exception as e:
-        print(f"Chyba při načítání listingu {page_url}: {e}")
-        return []
-    soup = BeautifulSoup(resp.text, "html.parser")
-    links = set()
-    for a_tag in soup.find_all("a", class_="car_item"):
-        href = a_tag.get("href")
-        if href:
-            full_url = href if href.startswith("http") else "https://www.autoesa.cz" + href
-            links.add(full_url)
-    return list(links)
-
-""" Funkce pro parsování detailu inzerátu """
-def parse_esa_detail(url: str) -> dict | None:
-    try:
-        r = session.get(url, timeout=10)
-        r.raise_for_status()
-    except Exception as e:
-        print(f"Chyba při načítání detailu {url}: {e}")
-        return None
-    soup = BeautifulSoup(r.text, "html.parser")
-
-    # Parsování značky a modelu
-    h1_div = soup.find("div", class_="car_detail2__h1")
-    if not h1_div:
-        print(f"Nelze najít element pro značku/model na {url}")
-        return None
-    h1_tag = h1_div.find("h1")
-    if not h1_tag:
-        print(f"Nelze najít <h1> uvnitř car_detail2__h1 na {url}")
-        return None
-    title_text = h1_tag.get_text(strip=True)
-    brand, model = parse_brand_model(title_text)
+""" Detail se staví jen z li a div – hlavička, galerie a skripty se do stromu nedostanou """
+DETAIL_PARSE_ONLY = SoupStrainer(["li", "div"])
 
-    # Parsování roku
-    li_year = None
-    for li in soup.find_all("li", attrs={"data-toggle": "popover"}):
-        strong = li.find("strong")
-        if strong and strong.get_text(strip=True).lower() == "rok":
-            li_year = li
-            break
-    if not li_year:
-        print(f"Nelze najít li s 'Rok' na {url}")
-        return None
-    span_year = li_year.find("span")
-    if not span_year:
-        print(f"Nelze najít span s 'Rok' na {url}")
-        return None
-    year_val = span_year.get_text(strip=True)
-
-    # Parsování najetých km
-    li_mileage = None
-    for li in soup.find_all("li", attrs={"data-toggle": "popover"}):
-        strong = li.find("strong")
-        if strong and strong.get_text(strip=True).lower() == "stav tachometru":
-            li_mileage = li
-            break
-    if not li_mileage:
-        print(f"Nelze najít li se 'Stav tachometru' na {url}")
-        return None
-    span_mileage = li_mileage.find("span")
-    if not span_mileage:
-        print(f"Nelze najít span pro tachometr na {url}")
-        return None
-    mileage_text = span_mileage.get_text(strip=True)
-    mileage_digits = re.sub(r"[^\d]", "", mileage_text)
-
-    # Parsování ceny
-    price_div = soup.find("div", class_="show-more-price-right-right")
-    if not price_div:
-        print(f"Nelze najít div pro cenu na {url}")
-        return None
-    strong_price = price_div.find("strong")
-    if not strong_price:
-        print(f"Nelze najít strong pro cenu na {url}")
-        return None
-    price_text = strong_price.get_text(strip=True)
-    price_digits = re.sub(r"[^\d]", "", price_text)
-    price_val = price_digits
-
-    # Parsování paliva
-    li_fuel = None
-    for li in soup.find_all("li", attrs={"data-toggle": "popover"}):
-        strong = li.find("strong")
-        if strong and strong.get_text(strip=True).lower() == "palivo":
-            li_fuel = li
-            break
-    if not li_fuel:
-        print(f"Nelze najít li s 'Palivo' na {url}")
-        return None
-    span_fuel = li_fuel.find("span")
-    if not span_fuel:
-        print(f"Nelze najít span s 'Palivo' na {url}")
-        return None
-    fuel_val = span_fuel.get_text(strip=True)
-
-    # Parsování převodovky
-    li_trans = None
-    for li in soup.find_all("li", attrs={"data-toggle": "popover"}):
-        strong = li.find("strong")
-        if strong and strong.get_text(strip=True).lower() == "převodovka":
-            li_trans = li
-            break
-    if not li_trans:
-        print(f"Nelze najít li s 'Převodovka' na {url}")
-        return None
-    span_trans = li_trans.find("span")
-    if not span_trans:
-        print(f"Nelze najít span s 'Převodovka' na {url}")
-        return None
-    transmission_text = span_trans.get_text(strip=True)
-    transmission_main = transmission_text.split("/")[0].strip()
-
-    # Parsování výkonu (kW)
-    li_power = None
+""" Jednoprůchodová extrakce parametrů – název parametru (malými písmeny) → text ze <span> """
+def extract_params(soup: BeautifulSoup) -> tuple[dict, dict]:
+    # Parametry z li[data-toggle=popover] a ze všech li (Výkon se hledá mezi všemi li)
+    popover_params = {}
+    all_params = {}
     for li in soup.find_all("li"):
         strong = li.find("strong")
-        if strong and strong.get_text(strip=True).lower() == "výkon":
-            li_power = li
-            break
-    if not li_power:
-        print(f"Nelze najít li s 'Výkon' na {url}")
-        return None
-    span_power = li_power.find("span")
-    if not span_power:
-        print(f"Nelze najít span s 'Výkon' na {url}")
-        return None
-    power_text = span_power.get_text(strip=True)
-    match_power = re.search(r"(\d+)\s*kW", power_text)
-    if not match_power:
-        print(f"Nelze extrahovat výkon na {url}")
-        return None
-    power_val = match_power.group(1)
-
-    # Extrakce motoru (Objem)
-    engine_val = "Nezjištěno"
-    li_motor = None
-    for li in soup.find_all("li", attrs={"data-toggle": "popover"}):
-        strong = li.find("strong")
-        if strong and strong.get_text(strip=True).lower() == "motor":
-            li_motor = li
-            break
-    if li_motor:
-        span_motor = li_motor.find("span")
-        if span_motor:
-            motor_text = span_motor.get_text(strip=True)
+        if not strong:
+            continue
+        label = strong.get_text(strip=True).lower()
+        span = li.find("span")
+        value = span.get_text(strip=True) if span else None
+        all_params.setdefault(label, value)
+        if li.get("data-toggle") == "popover":
+            popover_params.setdefault(label, value)
+    return popover_params, all_params
+
+""" Adaptér pro autoesa.cz """
+@register_source
+class AutoesaAdapter(SourceAdapter):
+    name = "autoesa"
+    site_url = "https://www.autoesa.cz"
+    raw_columns = ["Značka", "Model", "Objem (l)", "Rok", "Najeté km", "Cena", "Palivo", "Převodovka", "Výkon (kW)"]
+    page_param = "stranka"
+
+    """ URL výpisu – pokud je značka zadána, ověříme URL, jinak použijeme stránku se všemi auty """
+    def listing_url(self, fetcher, config: dict) -> str:
+        # Sestavení query stringu podle cenového rozsahu
+        params = {}
+        if config["min_price"] is not None:
+            params["cena_od"] = config["min_price"]
+        if config["max_price"] is not None:
+            params["cena_do"] = config["max_price"]
+        query_string = urlencode(params)
+        brand = config["brand"]
+        if brand:
+            return self.validated_url(
+                fetcher, f"{self.site_url}/{brand}?{query_string}", f"{self.site_url}/{brand}", brand
+            )
+        return f"{self.site_url}/vsechna-auta?{query_string}"
+
+    """ Odkazy na inzeráty ze stránky výpisu """
+    def listing_links(self, html: str) -> list[str]:
+        return [url for url, _ in self.listing_cards(html)]
+
+    """ Karty inzerátů ze stránky výpisu – odkaz a parametry, které karta ukazuje """
+    def listing_cards(self, html: str) -> list[tuple[str, dict]]:
+        soup = BeautifulSoup(html, self.html_parser)
+        return [
+            (self.absolute_url(a["href"]), self.card_fields(a))
+            for a in soup.find_all("a", class_="car_item") if a.get("href")
+        ]
+
+    """ Pole z karty ve výpisu ve stejném tvaru jako z detailu – co karta neukazuje, chybí """
+    def card_fields(self, card) -> dict:
+        fields = {}
+        title = card.find(class_="car_item__title")
+        if title:
+            title_text = title.get_text(strip=True)
+            fields["Značka"], fields["Model"] = parse_brand_model(title_text)
+        params = extract_params(card)[1]
+        if params.get("motor"):
+            match_motor = re.search(r'(\d+(?:[.,]\d+)?)', params["motor"])
+            if match_motor:
+                fields["Objem (l)"] = float(match_motor.group(1).replace(',', '.'))
+        if params.get("rok"):
+            fields["Rok"] = params["rok"]
+        if params.get("stav tachometru"):
+            fields["Najeté km"] = re.sub(r"[^\d]", "", params["stav tachometru"])
+        if params.get("cena"):
+            fields["Cena"] = re.sub(r"[^\d]", "", params["cena"])
+        if params.get("palivo"):
+            fields["Palivo"] = params["palivo"]
+        if params.get("převodovka"):
+            fields["Převodovka"] = params["převodovka"].split("/")[0].strip()
+        match_power = re.search(r"(\d+)\s*kW", params.get("výkon") or "")
+        if match_power:
+            fields["Výkon (kW)"] = match_power.group(1)
+        # Prázdné hodnoty se nepočítají – pole se pak doplní z detailu
+        return {column: value for column, value in fields.items() if value not in ("", None, "Nezjištěno")}
+
+    """ Načtení povinného parametru s výpisem důvodu, proč chybí """
+    def require_param(self, params: dict, label: str, url: str) -> str | None:
+        if label not in params:
+            self.parse_failure(label, f"Nelze najít li s '{label}' na {url}")
+            return None
+        if params[label] is None:
+            self.parse_failure(label, f"Nelze najít span s '{label}' na {url}")
+        return params[label]
+
+    """ Parsování HTML detailu inzerátu (bez síťového požadavku) """
+    def parse_detail(self, html: str, url: str) -> dict | None:
+        soup = BeautifulSoup(html, self.html_parser, parse_only=DETAIL_PARSE_ONLY)
+
+        # Parsování značky a modelu
+        h1_div = soup.find("div", class_="car_detail2__h1")
+        if not h1_div:
+            self.parse_failure("značka", f"Nelze najít element pro značku/model na {url}")
+            return None
+        h1_tag = h1_div.find("h1")
+        if not h1_tag:
+            self.parse_failure("značka", f"Nelze najít <h1> uvnitř car_detail2__h1 na {url}")
+            return None
+        title_text = h1_tag.get_text(strip=True)
+        brand, model = parse_brand_model(title_text)
+
+        # Seznam parametrů se prochází jen jednou, všechna pole čtou z hotových slovníků
+        params, all_params = extract_params(soup)
+
+        # Parsování roku
+        year_val = self.require_param(params, "rok", url)
+        if year_val is None:
+            return None
+
+        # Parsování najetých km
+        mileage_text = self.require_param(params, "stav tachometru", url)
+        if mileage_text is None:
+            return None
+        mileage_digits = re.sub(r"[^\d]", "", mileage_text)
+
+        # Parsování ceny
+        price_div = soup.find("div", class_="show-more-price-right-right")
+        if not price_div:
+            self.parse_failure("cena", f"Nelze najít div pro cenu na {url}")
+            return None
+        strong_price = price_div.find("strong")
+        if not strong_price:
+            self.parse_failure("cena", f"Nelze najít strong pro cenu na {url}")
+            return None
+        price_text = strong_price.get_text(strip=True)
+        price_digits = re.sub(r"[^\d]", "", price_text)
+        price_val = price_digits
+
+        # Parsování paliva
+        fuel_val = self.require_param(params, "palivo", url)
+        if fuel_val is None:
+            return None
+
+        # Parsování převodovky
+        transmission_text = self.require_param(params, "převodovka", url)
+        if transmission_text is None:
+            return None
+        transmission_main = transmission_text.split("/")[0].strip()
+
+        # Parsování výkonu (kW)
+        power_text = self.require_param(all_params, "výkon", url)
+        if power_text is None:
+            return None
+        match_power = re.search(r"(\d+)\s*kW", power_text)
+        if not match_power:
+            self.parse_failure("výkon", f"Nelze extrahovat výkon na {url}")
+            return None
+        power_val = match_power.group(1)
+
+        # Extrakce motoru (Objem)
+        engine_val = "Nezjištěno"
+        motor_text = params.get("motor")
+        if motor_text:
             match_motor = re.search(r'(\d+(?:[.,]\d+)?)', motor_text)
             if match_motor:
                 engine_val = float(match_motor.group(1).replace(',', '.'))
-            else:
-                engine_val = "Nezjištěno"
-        else:
-            engine_val = "Nezjištěno"
-    else:
-        engine_val = "Nezjištěno"
-
-    # Kontrola, zda jsou všechny povinné hodnoty platné
-    mandatory = [brand, model, year_val, mileage_digits, price_val, fuel_val, transmission_main, power_val, engine_val]
-    if any(x == "Nezjištěno" for x in mandatory):
-        return None
-
-    return {
-        "URL": url,
-        "Značka": brand,
-        "Model": model,
-        "Objem (l)": engine_val,
-        "Rok": year_val,
-        "Najeté km": mileage_digits,
-        "Cena": price_val,
-        "Palivo": fuel_val,
-        "Převodovka": transmission_main,
-        "Výkon (kW)": power_val
-    }
-
-""" Funkce pro scrapování jedné stránky inzerátů """
-def scrape_esa_one_page(page_url: str, seen_set=None):
-    if seen_set is None:
-        seen_set = set()
-    links = get_listing_links(page_url)
-    print(f"Na stránce '{page_url}' nalezeno {len(links)} inzerátů.")
-    results = []
-    for link in links:
-        try:
-            data = parse_esa_detail(link)
-            if not data:
-                continue
-            dedup_key = (
-                data["Značka"],
-                data["Model"],
-                data["Rok"],
-                data["Najeté km"],
-                data["Cena"],
-                data["Palivo"],
-                data["Převodovka"],
-                data["Výkon (kW)"],
-                data["Objem (l)"]
-            )
-            if dedup_key in seen_set:
-                continue
-            seen_set.add(dedup_key)
-            results.append(data)
-            print("-" * 60)
-            print(f"URL:          {data['URL']}")
-            print(f"Značka:       {data['Značka']}")
-            print(f"Model:        {data['Model']}")
-            print(f"Objem (l):    {data['Objem (l)']}")
-            print(f"Rok:          {data['Rok']}")
-            print(f"Najeté km:    {data['Najeté km']}")
-            print(f"Cena:         {data['Cena']}")
-            print(f"Palivo:       {data['Palivo']}")
-            print(f"Převodovka:   {data['Převodovka']}")
-            print(f"Výkon (kW):   {data['Výkon (kW)']}")
-        except Exception as e:
-            print(f"Chyba při zpracování detailu {link}: {e}")
-    return results, seen_set
-
-""" Funkce pro scrapování minimálního počtu inzerátů ze zadaného počtu stránek """
-def scrape_esa_min_inzeraty(base_url: str, min_inzeraty: int = 50, max_pages: int = 5):
-    all_data = []
-    seen_set = set()
-    page = 1
-    while page <= max_pages:
-        # Pokud base_url obsahuje "?", použijeme "&stranka=", jinak "?"
-        if page == 1:
-            page_url = base_url
-        else:
-            sep = "&" if "?" in base_url else "?"
-            page_url = f"{base_url}{sep}stranka={page}"
-        print(f"\nSCRAPUJI STRÁNKU č.{page}: {page_url}")
-        page_results, seen_set = scrape_esa_one_page(page_url, seen_set=seen_set)
-        if not page_results:
-            print("Žádné inzeráty => končím.")
-            break
-        all_data.extend(page_results)
-        print(f"Aktuálně nasbíráno {len(all_data)} záznamů (po deduplikaci).\n")
-        if len(all_data) >= min_inzeraty:
-            print(f"Dosaženo {min_inzeraty} záznamů => končím.")
-            break
-        page += 1
-        time.sleep(2)
-
-    df = pd.DataFrame(all_data)
-    if "URL" in df.columns:
-        df.drop(columns=["URL"], inplace=True)
-
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    base_dir = os.path.dirname(script_dir)
-    raw_data_dir = os.path.join(base_dir, "raw_data")
-    os.makedirs(raw_data_dir, exist_ok=True)
-    output_path = os.path.join(raw_data_dir, "auta_autoesa.csv")
-
-    if os.path.exists(output_path):
-        try:
-            existing_df = pd.read_csv(output_path)
-            combined_df = pd.concat([existing_df, df]).drop_duplicates().reset_index(drop=True)
-            combined_df.to_csv(output_path, index=False, encoding="utf-8-sig")
-            print(
-                f"Hotovo! Přidáno {len(combined_df) - len(existing_df)} nových záznamů. "
-                f"Celkem {len(combined_df)} záznamů uložených do {output_path}."
-            )
-        except Exception as e:
-            print(f"Chyba při načítání nebo ukládání existujícího souboru: {e}")
-    else:
-        df.to_csv(output_path, index=False, encoding="utf-8-sig")
-        print(f"Hotovo! Uloženo {len(df)} záznamů do {output_path}.")
 
-    return df
+        # Kontrola, zda jsou všechny povinné hodnoty platné – pole s "Nezjištěno" se započtou do metrik
+        mandatory = {
+            "značka": brand, "model": model, "rok": year_val, "stav tachometru": mileage_digits, "cena": price_val,
+            "palivo": fuel_val, "převodovka": transmission_main, "výkon": power_val, "motor": engine_val
+        }
+        if not self.check_mandatory(mandatory, url):
+            return None
+
+        return {
+            "URL": url,
+            "Značka": brand,
+            "Model": model,
+            "Objem (l)": engine_val,
+            "Rok": year_val,
+            "Najeté km": mileage_digits,
+            "Cena": price_val,
+            "Palivo": fuel_val,
+            "Převodovka": transmission_main,
+            "Výkon (kW)": power_val
+        }
 
 if __name__ == "__main__":
-    df = scrape_esa_min_inzeraty(
-        base_url=base_url,
-        min_inzeraty=NUM_LISTINGS,
-        max_pages=MAX_PAGES
-    )
-    print("\nNáhled do CSV (prvních 5 řádků):")
-    print(df.head())
+    main([AutoesaAdapter])
@@ -0,0 +1,90 @@
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import wait
+
+""" Velikost fronty odkazů mezi hledáním na stránkách výpisu a stahováním detailů """
+CRAWL_QUEUE_SIZE = int(os.getenv("CRAWL_QUEUE_SIZE", "100"))
+
+""" Producent/konzument – výpis se prochází napřed a plní omezenou frontu, detaily z ní berou workery FetchEngine """
+class Crawler:
+    def __init__(self, fetcher, get_links, parse_detail, queue_size: int = CRAWL_QUEUE_SIZE):
+        self.fetcher = fetcher
+        self.get_links = get_links
+        self.parse_detail = parse_detail
+        # Rozpracovaných detailů je víc než workerů, aby měl každý uvolněný worker hned další práci
+        self.max_in_flight = 2 * fetcher.max_workers
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._done = object()
+
+    """ Vložení do fronty – při zastavení crawleru se čekání na volné místo přeruší """
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    """ Producent – odkazy každé stránky následované značkou konce stránky (page, None) """
+    def _produce(self, page_urls) -> None:
+        try:
+            for page, page_url in enumerate(page_urls, 1):
+                if self._stop.is_set():
+                    return
+                links = self.get_links(page_url)
+                if not links:
+                    return
+                for link in links:
+                    if not self._put((page, link)):
+                        return
+                if not self._put((page, None)):
+                    return
+        except Exception as e:
+            print(f"Chyba při procházení stránek výpisu: {e}")
+        finally:
+            self._put(self._done)
+
+    """ Výsledky (stránka, odkaz, data, výjimka) v pořadí odkazů, odkaz None značí dokončenou stránku """
+    def run(self, page_urls):
+        producer = threading.Thread(target=self._produce, args=(page_urls,), name="crawl-listing", daemon=True)
+        producer.start()
+        in_flight = deque()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(in_flight) < self.max_in_flight:
+                    try:
+                        # Když se nic nestahuje, čeká se na producenta; jinak se jen dobere, co už ve frontě je
+                        item = self._queue.get(block=not in_flight)
+                    except queue.Empty:
+                        break
+                    if item is self._done:
+                        exhausted = True
+                        break
+                    page, link = item
+                    future = self.fetcher.submit(self.parse_detail, link) if link is not None else None
+                    in_flight.append((page, link, future))
+                if not in_flight:
+                    return
+                page, link, future = in_flight.popleft()
+                if future is None:
+                    yield page, None, None, None
+                    continue
+                try:
+                    data, error = future.result(), None
+                except Exception as e:
+                    data, error = None, e
+                yield page, link, data, error
+        finally:
+            # Ukončení smyčky u volajícího (break) zruší nezačaté detaily, počká na rozběhnuté a na vlákno producenta –
+            # po návratu už žádný worker nesahá na index ani archiv, které volající hned zavírá
+            self._stop.set()
+            futures = [future for _, _, future in in_flight if future is not None]
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            producer.join()
@@ -0,0 +1,282 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+""" Stavové kódy, u kterých má smysl požadavek zopakovat (přetížení nebo dočasný výpadek serveru) """
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+""" Host má otevřený jistič – požadavek se vůbec neodeslal """
+class CircuitOpenError(requests.ConnectionError):
+    pass
+
+""" Vyčerpaný časový rozpočet běhu – další požadavky se už neodesílají """
+class BudgetExceededError(requests.RequestException):
+    pass
+
+""" Přenesené (komprimované) bajty těla odpovědi – urllib3 počítá bajty přečtené ze socketu ještě před dekompresí """
+def wire_bytes(resp: requests.Response) -> int:
+    tell = getattr(resp.raw, "tell", None)
+    return tell() if tell is not None else len(resp.content)
+
+""" Omezovač rychlosti – drží minimální rozestup mezi požadavky na stejný host """
+class RateLimiter:
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, host: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            if self.interval:
+                self._next_slot[host] = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+    """ Pozdržení všech dalších požadavků na host (např. podle Retry-After) """
+    def pause(self, host: str, seconds: float) -> None:
+        with self._lock:
+            until = time.monotonic() + seconds
+            self._next_slot[host] = max(self._next_slot.get(host, until), until)
+
+""" Opakování s exponenciálně rostoucím čekáním a náhodným rozptylem, Retry-After má přednost """
+class RetryPolicy:
+    def __init__(self, retries: int = 3, backoff: float = 0.5, max_backoff: float = 30.0,
+                 statuses: tuple = RETRY_STATUSES):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = statuses
+
+    """ Čekání před dalším pokusem – náhodně 50–100 % z backoff·2^pokus, aby se vlákna nerozjela naráz """
+    def delay(self, attempt: int, retry_after: str | None = None) -> float:
+        computed = min(self.max_backoff, self.backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+        server = parse_retry_after(retry_after)
+        if server is None:
+            return computed
+        return min(self.max_backoff, max(server, computed))
+
+""" Hlavička Retry-After v sekundách nebo jako HTTP datum → počet sekund (None, pokud chybí nebo je neplatná) """
+def parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+""" Jistič pro jeden host – po sérii selhání přestane na host posílat požadavky, po pauze pustí jeden zkušební """
+class CircuitBreaker:
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    """ Smí požadavek projít? Po uplynutí pauzy propustí právě jeden zkušební (half-open) """
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if not self._probing and time.monotonic() - self.opened_at >= self.cooldown:
+                self._probing = True
+                return True
+            return False
+
+    def success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    """ Započtení selhání – vrací True, pokud se jistič právě otevřel """
+    def failure(self) -> bool:
+        with self._lock:
+            self.failures += 1
+            if self._probing or (self.threshold and self.opened_at is None and self.failures >= self.threshold):
+                self.opened_at = time.monotonic()
+                self._probing = False
+                return True
+            return False
+
+    """ Zkušební požadavek se nakonec neodeslal – po pauze smí projít další """
+    def release(self) -> None:
+        with self._lock:
+            self._probing = False
+
+""" Sdílený engine pro souběžné stahování stránek s limitem na host, omezením rychlosti a odolností vůči výpadkům """
+class FetchEngine:
+    def __init__(self, session: requests.Session, max_workers: int = 8, per_host: int = 4,
+                 requests_per_second: float = 4.0, timeout: float | tuple = 10, metrics=None,
+                 retry: RetryPolicy | None = None, breaker_threshold: int = 0, breaker_cooldown: float = 30.0,
+                 time_budget: float = 0):
+        self.session = session
+        self.metrics = metrics
+        self.max_workers = max_workers
+        self.per_host = per_host
+        # Jedna hodnota, nebo (connect, read) – pomalé navázání spojení se tak pozná dřív než pomalá odpověď
+        self.timeout = timeout
+        self.retry = retry if retry is not None else RetryPolicy(retries=0)
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        # Časový rozpočet celého běhu v sekundách (0 = bez omezení)
+        self.deadline = time.monotonic() + time_budget if time_budget > 0 else None
+        self.rate_limiter = RateLimiter(requests_per_second)
+        self._host_lock = threading.Lock()
+        self._host_slots = {}
+        self._breakers = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+        # Pool spojení musí pojmout všechna vlákna, jinak urllib3 zahazuje keep-alive spojení
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+    def _host_semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._host_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_slots[host]
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._host_lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.breaker_threshold, self.breaker_cooldown)
+            return self._breakers[host]
+
+    """ Zbývající čas rozpočtu v sekundách (None = bez omezení) """
+    def remaining(self) -> float | None:
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def out_of_budget(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    """ Timeout požadavku zkrácený na zbývající rozpočet (vždy kladný, requests záporný timeout odmítne) """
+    def _timeout(self):
+        remaining = self.remaining()
+        if remaining is None:
+            return self.timeout
+        remaining = max(remaining, 0.001)
+        if isinstance(self.timeout, tuple):
+            return tuple(min(t, remaining) for t in self.timeout)
+        return min(self.timeout, remaining)
+
+    """ Stažení jedné URL – limity na host, opakování přechodných chyb, jistič a časový rozpočet """
+    def get(self, url: str, headers: dict | None = None, metrics=None) -> requests.Response:
+        metrics = metrics if metrics is not None else self.metrics
+        host = urlsplit(url).netloc
+        breaker = self.breaker(host)
+        attempt = 0
+        while True:
+            if self.out_of_budget():
+                self._count(metrics, "budget_exceeded")
+                raise BudgetExceededError(f"Vyčerpán časový rozpočet běhu, {url} se nestahuje")
+            if not breaker.allow():
+                self._count(metrics, "circuit_rejected")
+                raise CircuitOpenError(f"Jistič pro {host} je otevřený, {url} se nestahuje")
+            resp, error = None, None
+            with self._host_semaphore(host):
+                self.rate_limiter.wait(host)
+                # Rozpočet mohl vypršet během čekání na slot hostu nebo na limit rychlosti
+                if self.out_of_budget():
+                    breaker.release()
+                    self._count(metrics, "budget_exceeded")
+                    raise BudgetExceededError(f"Vyčerpán časový rozpočet běhu, {url} se nestahuje")
+                try:
+                    resp = self._send(url, headers, metrics)
+                except requests.RequestException as e:
+                    error = e
+                except BaseException:
+                    # Neočekávaná chyba se jističi počítá jako selhání, jinak by zkušební požadavek host zablokoval
+                    breaker.failure()
+                    raise
+            if resp is not None and resp.status_code not in self.retry.statuses:
+                # I 404 znamená, že host odpovídá – jistič se zavře
+                breaker.success()
+                resp.raise_for_status()
+                return resp
+            if breaker.failure():
+                self._count(metrics, "circuit_opened")
+                print(f"Jistič pro {host} otevřen po {breaker.failures} selháních, pauza {breaker.cooldown:g} s.")
+            retry_after = resp.headers.get("Retry-After") if resp is not None else None
+            delay = self.retry.delay(attempt, retry_after)
+            remaining = self.remaining()
+            if attempt >= self.retry.retries or (remaining is not None and delay >= remaining):
+                if resp is not None:
+                    resp.raise_for_status()
+                raise error
+            if retry_after is not None:
+                # 429/503 s Retry-After zpomalí všechna vlákna na tentýž host, ne jen to, které ji dostalo
+                self.rate_limiter.pause(host, delay)
+            self._count(metrics, "retries")
+            time.sleep(delay)
+            attempt += 1
+
+    def _count(self, metrics, name: str) -> None:
+        if metrics is not None:
+            metrics.incr(name)
+
+    """ Jeden pokus – s metrikami měří dobu sítě (bez čekání na limit rychlosti), status a bajty před i po dekompresi """
+    def _send(self, url: str, headers: dict | None, metrics) -> requests.Response:
+        if metrics is None:
+            return self.session.get(url, headers=headers, timeout=self._timeout())
+        start = time.perf_counter()
+        try:
+            resp = self.session.get(url, headers=headers, timeout=self._timeout())
+        except requests.RequestException:
+            metrics.observe("network", time.perf_counter() - start)
+            metrics.response("error")
+            raise
+        metrics.observe("network", time.perf_counter() - start)
+        metrics.response(resp.status_code, len(resp.content), wire_bytes(resp))
+        return resp
+
+    """ Souběžné zpracování položek – vrací (položka, výsledek, výjimka) v původním pořadí """
+    def map(self, fn, items):
+        def call(item):
+            try:
+                return item, fn(item), None
+            except Exception as e:
+                return item, None, e
+        return self._executor.map(call, items)
+
+    """ Zařazení jedné položky do poolu – vrací Future """
+    def submit(self, fn, item):
+        return self._executor.submit(fn, item)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+""" Pohled na sdílený engine pro jeden zdroj – stejný pool a limity, ale vlastní metriky """
+class SourceFetcher:
+    def __init__(self, engine: FetchEngine, metrics=None):
+        self.engine = engine
+        self.metrics = metrics
+        self.max_workers = engine.max_workers
+
+    def get(self, url: str, headers: dict | None = None) -> requests.Response:
+        return self.engine.get(url, headers=headers, metrics=self.metrics)
+
+    def out_of_budget(self) -> bool:
+        return self.engine.out_of_budget()
+
+    def submit(self, fn, item):
+        return self.engine.submit(fn, item)
+
+    def map(self, fn, items):
+        return self.engine.map(fn, items)
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+import requests
+
+""" Inzerát, který se od posledního běhu nezměnil – nese naposledy uložený záznam """
+class Unchanged:
+    __slots__ = ("record",)
+
+    def __init__(self, record: dict | None):
+        self.record = record
+
+""" Režimy inkrementálního scrapování """
+INCREMENTAL_MODES = ("conditional", "skip", "off")
+
+""" Perzistentní index inzerátů (SQLite) – URL → ETag, Last-Modified, hash obsahu a poslední záznam """
+class ListingIndex:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        # Index sdílí všechna vlákna FetchEngine, přístup hlídá zámek
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS listings (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                record TEXT,
+                first_seen REAL,
+                last_seen REAL
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, url: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, content_hash, record FROM listings WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "etag": row[0],
+            "last_modified": row[1],
+            "content_hash": row[2],
+            "record": json.loads(row[3]) if row[3] else None
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+
+    """ Označení inzerátu jako znovu viděného bez změny obsahu """
+    def touch(self, url: str) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE listings SET last_seen = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+    """ Uložení odpovědi a naparsovaného záznamu – vrací Unchanged, pokud je záznam stejný jako minule """
+    # Záznam z karty ve výpisu se ukládá bez odpovědi (resp=None) – ETag ani hash detailu pak neexistují
+    def store(self, url: str, resp: requests.Response | None, record: dict | None, previous: dict | None = None):
+        now = time.time()
+        record_json = json.dumps(record, ensure_ascii=False, sort_keys=True) if record else None
+        with self._lock:
+            self._conn.execute("""
+                INSERT INTO listings (url, etag, last_modified, content_hash, record, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    content_hash = excluded.content_hash,
+                    record = excluded.record,
+                    last_seen = excluded.last_seen
+            """, (url, resp.headers.get("ETag") if resp is not None else None,
+                  resp.headers.get("Last-Modified") if resp is not None else None,
+                  content_hash(resp.content) if resp is not None else None, record_json, now, now))
+            self._conn.commit()
+        if record and previous and previous["record"] == json.loads(record_json):
+            return Unchanged(record)
+        return record
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+def content_hash(body: bytes) -> str:
+    return hashlib.sha1(body).hexdigest()
+
+""" Hlavičky pro podmíněný GET podle naposledy uložené odpovědi """
+def conditional_headers(entry: dict | None) -> dict:
+    headers = {}
+    if entry and entry["etag"]:
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry["last_modified"]:
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+""" Stažení detailu s ohledem na index – vrací (odpověď, předchozí záznam), odpověď je None u nezměněného inzerátu """
+def fetch_changed(fetcher, index: ListingIndex, url: str, mode: str = "conditional"):
+    entry = index.get(url) if mode != "off" else None
+    if entry and mode == "skip":
+        index.touch(url)
+        return None, entry
+    resp = fetcher.get(url, headers=conditional_headers(entry))
+    if entry and (resp.status_code == 304 or entry["content_hash"] == content_hash(resp.content)):
+        index.touch(url)
+        return None, entry
+    return resp, entry
@@ -0,0 +1,100 @@
+import csv
+import hashlib
+import os
+
+""" Průběžný zápis záznamů do CSV – připisuje na konec souboru, deduplikuje přes kompaktní index klíčů """
+class CsvSink:
+    def __init__(self, path: str, columns: list[str], batch_size: int = 10):
+        self.path = path
+        self.keys_path = path + ".keys"
+        self.batch_size = batch_size
+        self.added = 0
+        self._buffer = []
+        self._pending_keys = []
+        row_count = self._repair_tail() if os.path.exists(path) else None
+        if row_count is not None:
+            with open(path, encoding="utf-8-sig", newline="") as f:
+                self.columns = next(csv.reader(f))
+            self._keys = self._load_keys(row_count)
+            self._file = open(path, "a", encoding="utf-8", newline="")
+        else:
+            self.columns = list(columns)
+            self._keys = set()
+            self._file = open(path, "w", encoding="utf-8-sig", newline="")
+            csv.writer(self._file).writerow(self.columns)
+            self._file.flush()
+            open(self.keys_path, "w").close()
+        self._writer = csv.DictWriter(self._file, fieldnames=self.columns, extrasaction="ignore")
+        self._keys_file = open(self.keys_path, "a", encoding="ascii")
+
+    """ Klíč záznamu – 64bitový hash hodnot všech ukládaných sloupců """
+    def record_key(self, record: dict) -> str:
+        raw = "\x1f".join(str(record.get(col, "")) for col in self.columns)
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=8).hexdigest()
+
+    """ Oříznutí neúplného posledního řádku po přerušeném běhu – vrací počet datových řádků,
+        None pro prázdný soubor nebo soubor bez celé hlavičky (založí se znovu) """
+    def _repair_tail(self) -> int | None:
+        with open(self.path, "rb+") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(size - 65536, 0))
+            tail = f.read()
+            if size <= 65536 and b"\n" not in tail:
+                # Oříznutím by zmizela i hlavička – bez konce řádku nejsou v souboru žádné záznamy
+                if size:
+                    print(f"Soubor {self.path} obsahuje jen neúplnou hlavičku (přerušený běh), zakládám ho znovu.")
+                return None
+            if not tail.endswith(b"\n"):
+                f.truncate(size - len(tail) + tail.rfind(b"\n") + 1)
+                print(f"Odstraněn neúplný poslední řádek v {self.path} (přerušený běh).")
+            f.seek(0)
+            # Počítají se jen konce řádků po blocích, CSV se neparsuje
+            lines = sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 20), b""))
+        return max(lines - 1, 0)
+
+    """ Načtení indexu klíčů; pokud neodpovídá CSV (pád mezi zápisy), přestaví se jedním průchodem CSV """
+    def _load_keys(self, row_count: int) -> set:
+        if os.path.exists(self.keys_path):
+            with open(self.keys_path, encoding="ascii") as f:
+                keys = f.read().split()
+            if len(keys) == row_count:
+                return set(keys)
+        print(f"Index klíčů pro {self.path} chybí nebo nesedí, přestavuji ho z CSV.")
+        with open(self.path, encoding="utf-8-sig", newline="") as f:
+            keys = [self.record_key(row) for row in csv.DictReader(f)]
+        with open(self.keys_path, "w", encoding="ascii") as f:
+            f.writelines(key + "\n" for key in keys)
+        return set(keys)
+
+    """ Přidání záznamu – vrací True, pokud byl nový a zapsal se """
+    def add(self, record: dict) -> bool:
+        key = self.record_key(record)
+        if key in self._keys:
+            return False
+        self._keys.add(key)
+        self._buffer.append(record)
+        self._pending_keys.append(key)
+        self.added += 1
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+        return True
+
+    """ Zápis bufferu na disk – nejdřív řádky CSV, potom jejich klíče """
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        self._writer.writerows(self._buffer)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._keys_file.writelines(key + "\n" for key in self._pending_keys)
+        self._keys_file.flush()
+        self._buffer.clear()
+        self._pending_keys.clear()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+        self._keys_file.close()
@@ -0,0 +1,22 @@
+import importlib
+import os
+import sys
+
+from scrape_runtime import main
+from source_adapter import SOURCES
+
+""" Spuštění více zdrojů najednou v jednom procesu – python data_collection/run_scrapers.py [autoesa sauto ...] """
+# Zdroj <název> je modul <název>_scraper.py, který svůj adaptér zaregistruje přes @register_source
+SCRAPE_SOURCES = os.getenv("SCRAPE_SOURCES", "autoesa,sauto")
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or [name.strip() for name in SCRAPE_SOURCES.split(",") if name.strip()]
+    for name in names:
+        try:
+            importlib.import_module(f"{name}_scraper")
+        except ModuleNotFoundError as e:
+            if e.name != f"{name}_scraper":
+                raise
+            print(f"Neznámý zdroj '{name}' – chybí data_collection/{name}_scraper.py")
+            exit(1)
+    main([SOURCES[name] for name in names])
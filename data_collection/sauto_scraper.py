@@ -1,92 +1,9 @@
-import os
-import requests
-from bs4 import BeautifulSoup
-import time
-import pandas as pd
 import re
-from dotenv import load_dotenv
-
-pd.set_option('display.max_colwidth', None)
-
-# Načtení konfigurace z .env souboru
-load_dotenv()
-
-# Načtení konfiguračních proměnných z .env
-BRAND = os.getenv("BRAND")
-NUM_LISTINGS = int(os.getenv("NUM_LISTINGS"))
-MAX_PAGES = int(os.getenv("MAX_PAGES"))
-OUTPUT_DIR = os.getenv("OUTPUT_DIR")
-MIN_PRICE = os.getenv("MIN_PRICE")
-MAX_PRICE = os.getenv("MAX_PRICE")
-
-MIN_PRICE = int(MIN_PRICE) if MIN_PRICE is not None else None
-MAX_PRICE = int(MAX_PRICE) if MAX_PRICE is not None else None
-
-def validate_config(BRAND, NUM_LISTINGS, MAX_PAGES, MIN_PRICE, MAX_PRICE):
-    errors = []
-    if MIN_PRICE is not None and MIN_PRICE < 0:
-        errors.append("MIN_PRICE nesmí být záporná.")
-    if NUM_LISTINGS <= 0:
-        errors.append("NUM_LISTINGS musí být kladné číslo.")
-    if MAX_PAGES <= 0:
-        errors.append("MAX_PAGES musí být kladné číslo.")
-    if MIN_PRICE is not None and MAX_PRICE is not None and MIN_PRICE >= MAX_PRICE:
-        errors.append("MIN_PRICE musí být menší než MAX_PRICE.")
-    if errors:
-        raise ValueError(" ".join(errors))
-
-
-try:
-    validate_config(BRAND, NUM_LISTINGS, MAX_PAGES, MIN_PRICE, MAX_PRICE)
-except ValueError as ve:
-    print("Konfigurační chyba:", ve)
-    exit(1)
-
-# Sestavení základní URL
-base_url = "https://www.sauto.cz/inzerce/osobni"
-if BRAND:
-    base_url += f"/{BRAND.lower()}"
-base_url += "?stav=nove%2Cojete"
-if MIN_PRICE is not None:
-    base_url += f"&cena-od={MIN_PRICE}"
-if MAX_PRICE is not None:
-    base_url += f"&cena-do={MAX_PRICE}"
 
-# Opravený fallback mechanismus – zachová URL s parametry
-def get_validated_url(url_to_test: str, brand: str):
-    try:
-        response = requests.get(url_to_test, timeout=10)
-        response.raise_for_status()
-        if "inzerát" not in response.text.lower():
-            print(f"Zadaná značka '{brand}' nevrací očekávaný obsah, používá se fallback URL bez značky.")
-            return url_to_test.replace(f"/{brand.lower()}", "")
-        return url_to_test
-    except Exception as e:
-        print(f"Chyba při ověřování URL pro značku '{brand}': {e}")
-        return url_to_test.replace(f"/{brand.lower()}", "")
-
-base_url = get_validated_url(base_url, BRAND)
-
-# Globální session pro Sauto
-session = requests.Session()
-session.headers.update({"User-Agent": "Mozilla/5.0"})
+from bs4 import BeautifulSoup
 
-def get_listing_links(page_url: str) -> list:
-    try:
-        resp = session.get(page_url, timeout=10)
-        resp.raise_for_status()
-    except Exception as e:
-        print(f"Chyba při načítání listingu {page_url}: {e}")
-        return []
-    soup = BeautifulSoup(resp.text, "html.parser")
-    links = set()
-    items = soup.find_all("a", class_="sds-surface sds-surface--clickable sds-surface--00 c-item__link")
-    for a in items:
-        href = a.get("href")
-        if href:
-            full_url = href if href.startswith("http") else "https://www.sauto.cz" + href
-            links.add(full_url)
-    return list(links)
+from scrape_runtime import main
+from source_adapter import SourceAdapter, register_source
 
 def fallback_brand_model(url: str) -> tuple:
     try:
@@ -102,201 +19,152 @@ def fallback_brand_model(url: str) -> tuple:
     except:
         return ("Nezjištěno", "Nezjištěno")
 
-def parse_sauto_detail(url: str) -> dict or None:
-    fb_brand, fb_model = fallback_brand_model(url)
-    try:
-        r = session.get(url, timeout=10)
-        r.raise_for_status()
-    except Exception as e:
-        print(f"Chyba při načítání detailu {url}: {e}")
-        return None
-    soup = BeautifulSoup(r.text, "html.parser")
-    brand = fb_brand
-    model = fb_model
+# Rok a najeté km z textu typu "Ojeté, 5/2018, 120 000 km" (podtitulek detailu i karta ve výpisu)
+def parse_basic_info(txt: str) -> tuple:
     year_val = "Nezjištěno"
     mileage_val = "Nezjištěno"
-    price_val = "Nezjištěno"
-    fuel_val = "Nezjištěno"
-    gearbox_val = "Nezjištěno"
-    power_kw = "Nezjištěno"
-    engine_volume = "Nezjištěno"
-
-    subinfo = soup.find("span", class_="c-a-basic-info__subtitle-info")
-    if subinfo:
-        txt = subinfo.get_text(" ", strip=True)
-        txt = txt.replace("Ojeté", "").replace("Nové", "").strip()
-        parts = txt.split(",")
-        for part in parts:
-            p_clean = part.strip()
-            if "/" in p_clean and year_val == "Nezjištěno":
-                splitted = p_clean.split("/")
-                if len(splitted) == 2:
-                    try:
-                        rok = int(splitted[1])
-                        if 1900 < rok < 2025:
-                            year_val = str(rok)
-                    except:
-                        pass
-            elif p_clean.isdigit() and year_val == "Nezjištěno":
-                val = int(p_clean)
-                if 1900 < val < 2100:
-                    year_val = str(val)
-            elif "km" in p_clean.lower() and mileage_val == "Nezjištěno":
-                digits = re.sub(r"[^\d]", "", p_clean)
-                if digits:
-                    mileage_val = digits
-    c_div = soup.find("div", class_="c-a-basic-info__price")
-    if c_div:
-        pr_txt = c_div.get_text(strip=True)
-        pr_txt = pr_txt.replace("Kč", "").replace("\xa0", "").replace(" ", "").strip()
-        if pr_txt:
-            price_val = pr_txt
-    else:
-        c_span = soup.find("span", class_="c-basic-info__price")
-        if c_span:
-            pr_txt2 = c_span.get_text(strip=True)
-            pr_txt2 = pr_txt2.replace("Kč", "").replace("\xa0", "").replace(" ", "").strip()
-            if pr_txt2:
-                price_val = pr_txt2
-    li_elems = soup.find_all("li", class_=re.compile("c-car-properties__tile|c-car-otherProperties__tile"))
-    for li in li_elems:
-        lbl_div = li.find("div", class_=re.compile("tile-label"))
-        val_div = li.find("div", class_=re.compile("tile-value"))
-        if not lbl_div or not val_div:
-            continue
-        lbl = lbl_div.get_text(strip=True)
-        val = val_div.get_text(strip=True)
-        if lbl == "Palivo":
-            fuel_val = val
-        elif lbl == "Převodovka":
-            gearbox_val = val
-        elif lbl == "Výkon":
-            digits = re.sub(r"[^\d]", "", val)
-            if digits:
-                power_kw = digits
-        elif lbl == "Objem":
-            match = re.search(r'(\d[\d\s]*)(?=\s*ccm)', val.replace('\xa0', ' '))
-            if match:
-                digits = re.sub(r'\s+', '', match.group(1))
+    txt = txt.replace("Ojeté", "").replace("Nové", "").strip()
+    parts = txt.split(",")
+    for part in parts:
+        p_clean = part.strip()
+        if "/" in p_clean and year_val == "Nezjištěno":
+            splitted = p_clean.split("/")
+            if len(splitted) == 2:
                 try:
-                    volume_cm3 = int(digits)
-                    engine_volume = volume_cm3
+                    rok = int(splitted[1])
+                    if 1900 < rok < 2025:
+                        year_val = str(rok)
                 except:
-                    engine_volume = "Nezjištěno"
-            else:
-                engine_volume = "Nezjištěno"
-    mandatory = [brand, model, year_val, mileage_val, price_val, fuel_val, gearbox_val, power_kw, engine_volume]
-    if any(x == "Nezjištěno" for x in mandatory):
-        return None
-    return {
-        "URL": url,
-        "Značka": brand,
-        "Model": model,
-        "Objem (cm³)": engine_volume,
-        "Rok": year_val,
-        "Najeté km": mileage_val,
-        "Cena": price_val,
-        "Palivo": fuel_val,
-        "Převodovka": gearbox_val,
-        "Výkon (kW)": power_kw
-    }
-
-def scrape_sauto_one_page(page_url: str, seen_set=None):
-    if seen_set is None:
-        seen_set = set()
-    links = get_listing_links(page_url)
-    print(f"Na stránce '{page_url}' nalezeno {len(links)} inzerátů.")
-    results = []
-    for link in links:
-        try:
-            data = parse_sauto_detail(link)
-            if not data:
-                continue
-            dedup_key = (
-                data["Značka"],
-                data["Model"],
-                data["Objem (cm³)"],
-                data["Rok"],
-                data["Najeté km"],
-                data["Cena"],
-                data["Palivo"],
-                data["Převodovka"],
-                data["Výkon (kW)"]
-            )
-            if dedup_key in seen_set:
-                continue
-            seen_set.add(dedup_key)
-            results.append(data)
-            print("-" * 60)
-            print(f"URL:        {data['URL']}")
-            print(f"Značka:     {data['Značka']}")
-            print(f"Model:      {data['Model']}")
-            print(f"Objem (cm³):  {data['Objem (cm³)']}")
-            print(f"Rok:        {data['Rok']}")
-            print(f"Najeté km:  {data['Najeté km']}")
-            print(f"Cena:       {data['Cena']}")
-            print(f"Palivo:     {data['Palivo']}")
-            print(f"Převodovka: {data['Převodovka']}")
-            print(f"Výkon (kW): {data['Výkon (kW)']}")
-        except Exception as e:
-            print(f"Chyba při zpracování detailu {link}: {e}")
-    return results, seen_set
-
-def scrape_sauto_min_inzeraty(base_url: str, min_inzeraty: int = 50, max_pages: int = 5):
-    all_data = []
-    seen_set = set()
-    page = 1
-    while page <= max_pages:
-        if page == 1:
-            page_url = base_url
+                    pass
+        elif p_clean.isdigit() and year_val == "Nezjištěno":
+            val = int(p_clean)
+            if 1900 < val < 2100:
+                year_val = str(val)
+        elif "km" in p_clean.lower() and mileage_val == "Nezjištěno":
+            digits = re.sub(r"[^\d]", "", p_clean)
+            if digits:
+                mileage_val = digits
+    return year_val, mileage_val
+
+# Cena bez měny a mezer, "Nezjištěno" pro prázdný text
+def parse_price(txt: str) -> str:
+    pr_txt = txt.replace("Kč", "").replace("\xa0", "").replace(" ", "").strip()
+    return pr_txt if pr_txt else "Nezjištěno"
+
+# Adaptér pro sauto.cz
+@register_source
+class SautoAdapter(SourceAdapter):
+    name = "sauto"
+    site_url = "https://www.sauto.cz"
+    raw_columns = ["Značka", "Model", "Objem (cm³)", "Rok", "Najeté km", "Cena", "Palivo", "Převodovka", "Výkon (kW)"]
+    page_param = "strana"
+
+    # Sestavení základní URL – značka se ověří, při chybě se použije fallback URL bez značky
+    def listing_url(self, fetcher, config: dict) -> str:
+        brand = config["brand"]
+        url = f"{self.site_url}/inzerce/osobni"
+        if brand:
+            url += f"/{brand.lower()}"
+        url += "?stav=nove%2Cojete"
+        if config["min_price"] is not None:
+            url += f"&cena-od={config['min_price']}"
+        if config["max_price"] is not None:
+            url += f"&cena-do={config['max_price']}"
+        if not brand:
+            return url
+        return self.validated_url(fetcher, url, url.replace(f"/{brand.lower()}", ""), brand, expected_text="inzerát")
+
+    def listing_links(self, html: str) -> list[str]:
+        return [url for url, _ in self.listing_cards(html)]
+
+    # Karty ve výpisu – značka a model z URL (stejně jako u detailu), rok, km a cena z textu karty
+    def listing_cards(self, html: str) -> list[tuple[str, dict]]:
+        soup = BeautifulSoup(html, self.html_parser)
+        items = soup.find_all("a", class_="sds-surface sds-surface--clickable sds-surface--00 c-item__link")
+        return [(self.absolute_url(a["href"]), self.card_fields(a)) for a in items if a.get("href")]
+
+    def card_fields(self, link) -> dict:
+        url = self.absolute_url(link["href"])
+        card = link.find_parent(class_="c-item") or link
+        fields = {}
+        fields["Značka"], fields["Model"] = fallback_brand_model(url)
+        info = card.find(class_="c-item__info")
+        if info:
+            fields["Rok"], fields["Najeté km"] = parse_basic_info(info.get_text(" ", strip=True))
+        price = card.find(class_="c-item__price")
+        if price:
+            fields["Cena"] = parse_price(price.get_text(strip=True))
+        return {column: value for column, value in fields.items() if value != "Nezjištěno"}
+
+    def parse_detail(self, html: str, url: str) -> dict | None:
+        fb_brand, fb_model = fallback_brand_model(url)
+        soup = BeautifulSoup(html, self.html_parser)
+        brand = fb_brand
+        model = fb_model
+        year_val = "Nezjištěno"
+        mileage_val = "Nezjištěno"
+        price_val = "Nezjištěno"
+        fuel_val = "Nezjištěno"
+        gearbox_val = "Nezjištěno"
+        power_kw = "Nezjištěno"
+        engine_volume = "Nezjištěno"
+
+        subinfo = soup.find("span", class_="c-a-basic-info__subtitle-info")
+        if subinfo:
+            year_val, mileage_val = parse_basic_info(subinfo.get_text(" ", strip=True))
+        c_div = soup.find("div", class_="c-a-basic-info__price")
+        if c_div:
+            price_val = parse_price(c_div.get_text(strip=True))
         else:
-            sep = "&" if "?" in base_url else "?"
-            page_url = f"{base_url}{sep}strana={page}"
-        print(f"\nSCRAPUJI STRÁNKU č.{page}: {page_url}")
-        page_results, seen_set = scrape_sauto_one_page(page_url, seen_set=seen_set)
-        if not page_results:
-            print("Žádné inzeráty splňující podmínky => končím.")
-            break
-        all_data.extend(page_results)
-        print(f"Aktuálně nasbíráno {len(all_data)} záznamů (po deduplikaci).\n")
-        if len(all_data) >= min_inzeraty:
-            print(f"Dosaženo {min_inzeraty} záznamů => končím.")
-            break
-        page += 1
-        time.sleep(2)
-
-    df = pd.DataFrame(all_data)
-    if "URL" in df.columns:
-        df.drop(columns=["URL"], inplace=True)
-
-    # NOVÝ BLOK:
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    base_dir = os.path.dirname(script_dir)
-    raw_data_dir = os.path.join(base_dir, "raw_data")
-    os.makedirs(raw_data_dir, exist_ok=True)
-    output_path = os.path.join(raw_data_dir, "auta_sauto.csv")
-
-    if os.path.exists(output_path):
-        try:
-            existing_df = pd.read_csv(output_path)
-            combined_df = pd.concat([existing_df, df]).drop_duplicates().reset_index(drop=True)
-            combined_df.to_csv(output_path, index=False, encoding="utf-8-sig")
-            print(
-                f"Hotovo! Přidáno {len(combined_df) - len(existing_df)} nových záznamů. Celkem {len(combined_df)} záznamů uložených do {output_path}."
-            )
-        except Exception as e:
-            print(f"Chyba při načítání nebo ukládání existujícího souboru: {e}")
-    else:
-        df.to_csv(output_path, index=False, encoding="utf-8-sig")
-        print(f"Hotovo! Uloženo {len(df)} záznamů do {output_path}.")
-
-    return df
+            c_span = soup.find("span", class_="c-basic-info__price")
+            if c_span:
+                price_val = parse_price(c_span.get_text(strip=True))
+        li_elems = soup.find_all("li", class_=re.compile("c-car-properties__tile|c-car-otherProperties__tile"))
+        for li in li_elems:
+            lbl_div = li.find("div", class_=re.compile("tile-label"))
+            val_div = li.find("div", class_=re.compile("tile-value"))
+            if not lbl_div or not val_div:
+                continue
+            lbl = lbl_div.get_text(strip=True)
+            val = val_div.get_text(strip=True)
+            if lbl == "Palivo":
+                fuel_val = val
+            elif lbl == "Převodovka":
+                gearbox_val = val
+            elif lbl == "Výkon":
+                digits = re.sub(r"[^\d]", "", val)
+                if digits:
+                    power_kw = digits
+            elif lbl == "Objem":
+                match = re.search(r'(\d[\d\s]*)(?=\s*ccm)', val.replace('\xa0', ' '))
+                if match:
+                    digits = re.sub(r'\s+', '', match.group(1))
+                    try:
+                        volume_cm3 = int(digits)
+                        engine_volume = volume_cm3
+                    except:
+                        engine_volume = "Nezjištěno"
+                else:
+                    engine_volume = "Nezjištěno"
+        # Pole, která zůstala na "Nezjištěno", se započtou do metrik
+        mandatory = {
+            "značka": brand, "model": model, "rok": year_val, "najeté km": mileage_val, "cena": price_val,
+            "palivo": fuel_val, "převodovka": gearbox_val, "výkon": power_kw, "objem": engine_volume
+        }
+        if not self.check_mandatory(mandatory, url):
+            return None
+        return {
+            "URL": url,
+            "Značka": brand,
+            "Model": model,
+            "Objem (cm³)": engine_volume,
+            "Rok": year_val,
+            "Najeté km": mileage_val,
+            "Cena": price_val,
+            "Palivo": fuel_val,
+            "Převodovka": gearbox_val,
+            "Výkon (kW)": power_kw
+        }
 
 if __name__ == "__main__":
-    df = scrape_sauto_min_inzeraty(
-        base_url=base_url,
-        min_inzeraty=NUM_LISTINGS,
-        max_pages=MAX_PAGES
-    )
-    print("\nNáhled do CSV (prvních 5 řádků):")
-    print(df.head())
+    main([SautoAdapter])
@@ -0,0 +1,210 @@
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+""" Výstup metrik: jsonl (řádek za každou stránku + souhrn), prom (textový soubor pro Prometheus) nebo off """
+METRICS_FORMATS = ("jsonl", "prom", "off")
+METRICS_FORMAT = os.getenv("SCRAPE_METRICS", "jsonl")
+METRICS_FILE = os.getenv("SCRAPE_METRICS_FILE")  # výchozí raw_data/metrics_<zdroj>.jsonl / .prom
+""" Tichý režim – scraper nevypisuje jednotlivé záznamy ani chybějící pole, jen je počítá """
+QUIET = os.getenv("SCRAPE_QUIET", "0").lower() in ("1", "true", "yes")
+
+""" Hranice bucketů histogramu v sekundách (kumulativně jako v Prometheu, poslední je +Inf) """
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+""" Histogram doby trvání jedné fáze – počty v bucketech, součet a maximum """
+class Histogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    """ Odhad kvantilu z bucketů – horní hranice bucketu, do kterého kvantil padne """
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS, self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "mean": round(self.total / self.count, 6) if self.count else 0.0,
+            "p50": round(self.quantile(0.5), 6),
+            "p99": round(self.quantile(0.99), 6),
+            "max": round(self.max, 6),
+            "buckets": dict(zip([str(b) for b in BUCKETS] + ["+Inf"], self.counts))
+        }
+
+""" Metriky jednoho běhu scraperu – sdílí je všechna vlákna FetchEngine, přístup hlídá zámek """
+class ScrapeMetrics:
+    def __init__(self, source: str, fmt: str = METRICS_FORMAT, path: str | None = METRICS_FILE,
+                 output_dir: str | None = None):
+        if fmt not in METRICS_FORMATS:
+            raise ValueError(f"SCRAPE_METRICS musí být jedna z hodnot {', '.join(METRICS_FORMATS)}.")
+        self.source = source
+        self.format = fmt
+        if path is None and output_dir is not None and fmt != "off":
+            path = os.path.join(output_dir, f"metrics_{source}.{fmt}")
+        self.path = path
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stages = {}
+        self.statuses = {}
+        self.parse_failures = {}
+        self.counters = {}
+        self.requests = 0
+        # bytes = velikost po dekompresi, wire_bytes = skutečně přenesené (komprimované) bajty
+        self.bytes = 0
+        self.wire_bytes = 0
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            hist = self.stages.get(stage)
+            if hist is None:
+                hist = self.stages[stage] = Histogram()
+            hist.observe(seconds)
+
+    """ Měření doby trvání fáze (network, listing, parse, dedup, write) """
+    @contextmanager
+    def timer(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    """ Započtení odpovědi – status "error" značí požadavek, který skončil bez odpovědi """
+    def response(self, status, nbytes: int = 0, wire_bytes: int | None = None) -> None:
+        key = str(status)
+        with self._lock:
+            self.requests += 1
+            self.bytes += nbytes
+            self.wire_bytes += nbytes if wire_bytes is None else wire_bytes
+            self.statuses[key] = self.statuses.get(key, 0) + 1
+
+    """ Pole, které se z detailu nepodařilo vyčíst """
+    def parse_failure(self, field: str, n: int = 1) -> None:
+        with self._lock:
+            self.parse_failures[field] = self.parse_failures.get(field, 0) + n
+
+    """ Obecný čítač (uložené záznamy, duplicity, nezměněné inzeráty...) """
+    def incr(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            elapsed = time.perf_counter() - self._start
+            # Síťová cena jednoho uloženého inzerátu – kolik požadavků a přenesených bajtů stál
+            records = self.counters.get("records", 0)
+            return {
+                "source": self.source,
+                "time": time.time(),
+                "elapsed_s": round(elapsed, 3),
+                "requests": self.requests,
+                "requests_per_s": round(self.requests / elapsed, 3) if elapsed > 0 else 0.0,
+                "bytes": self.bytes,
+                "wire_bytes": self.wire_bytes,
+                "wire_bytes_per_record": round(self.wire_bytes / records, 1) if records else None,
+                "requests_per_record": round(self.requests / records, 3) if records else None,
+                "status": dict(self.statuses),
+                "counters": dict(self.counters),
+                "parse_failures": dict(self.parse_failures),
+                "stages": {name: hist.to_dict() for name, hist in self.stages.items()}
+            }
+
+    """ Text ve formátu Prometheus exposition (pro textfile collector node_exporteru) """
+    def to_prometheus(self) -> str:
+        snap = self.snapshot()
+        label = f'source="{self.source}"'
+        lines = [
+            "# TYPE scrape_requests_total counter",
+            f"scrape_requests_total{{{label}}} {snap['requests']}",
+            "# TYPE scrape_bytes_total counter",
+            f"scrape_bytes_total{{{label}}} {snap['bytes']}",
+            "# TYPE scrape_wire_bytes_total counter",
+            f"scrape_wire_bytes_total{{{label}}} {snap['wire_bytes']}",
+            "# TYPE scrape_requests_per_second gauge",
+            f"scrape_requests_per_second{{{label}}} {snap['requests_per_s']}",
+            "# TYPE scrape_elapsed_seconds gauge",
+            f"scrape_elapsed_seconds{{{label}}} {snap['elapsed_s']}"
+        ]
+        if snap["wire_bytes_per_record"] is not None:
+            lines += [
+                "# TYPE scrape_wire_bytes_per_record gauge",
+                f"scrape_wire_bytes_per_record{{{label}}} {snap['wire_bytes_per_record']}",
+                "# TYPE scrape_requests_per_record gauge",
+                f"scrape_requests_per_record{{{label}}} {snap['requests_per_record']}"
+            ]
+        lines.append("# TYPE scrape_http_responses_total counter")
+        lines += [f'scrape_http_responses_total{{{label},status="{s}"}} {n}' for s, n in sorted(snap["status"].items())]
+        lines.append("# TYPE scrape_events_total counter")
+        lines += [f'scrape_events_total{{{label},event="{e}"}} {n}' for e, n in sorted(snap["counters"].items())]
+        lines.append("# TYPE scrape_parse_failures_total counter")
+        lines += [f'scrape_parse_failures_total{{{label},field="{f}"}} {n}'
+                  for f, n in sorted(snap["parse_failures"].items())]
+        lines.append("# TYPE scrape_stage_seconds histogram")
+        with self._lock:
+            stages = [(name, list(h.counts), h.total, h.count) for name, h in sorted(self.stages.items())]
+        for name, counts, total, count in stages:
+            cumulative = 0
+            for bound, n in zip([str(b) for b in BUCKETS] + ["+Inf"], counts):
+                cumulative += n
+                lines.append(f'scrape_stage_seconds_bucket{{{label},stage="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'scrape_stage_seconds_sum{{{label},stage="{name}"}} {total:.6f}')
+            lines.append(f'scrape_stage_seconds_count{{{label},stage="{name}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    """ Zápis metrik – jsonl připojí řádek s událostí, prom atomicky přepíše textový soubor """
+    def emit(self, event: str) -> None:
+        if self.format == "off" or not self.path:
+            return
+        if self.format == "jsonl":
+            line = json.dumps({"event": event, **self.snapshot()}, ensure_ascii=False)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        else:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp_path, self.path)
+
+    """ Krátký souhrn běhu pro konzoli """
+    def summary(self) -> str:
+        snap = self.snapshot()
+        parts = [
+            f"{snap['requests']} požadavků za {snap['elapsed_s']:.1f} s ({snap['requests_per_s']:.1f} req/s)",
+            f"{snap['bytes'] / 1e6:.2f} MB (přeneseno {snap['wire_bytes'] / 1e6:.2f} MB)"
+        ]
+        if snap["wire_bytes_per_record"] is not None:
+            parts.append(f"{snap['wire_bytes_per_record'] / 1e3:.1f} kB a {snap['requests_per_record']:.2f} požadavků "
+                         f"na uložený inzerát")
+        if snap["status"]:
+            parts.append("status " + ", ".join(f"{s}×{n}" for s, n in sorted(snap["status"].items())))
+        for name, stage in snap["stages"].items():
+            parts.append(f"{name} {stage['sum']:.2f} s (p50 {stage['p50'] * 1000:.0f} ms)")
+        if snap["counters"]:
+            parts.append(", ".join(f"{c} {n}" for c, n in sorted(snap["counters"].items())))
+        if snap["parse_failures"]:
+            parts.append("chybějící pole " + ", ".join(f"{f}×{n}" for f, n in sorted(snap["parse_failures"].items())))
+        return "Metriky: " + "; ".join(parts)
@@ -0,0 +1,352 @@
+import os
+import threading
+
+import pandas as pd
+import requests
+from dotenv import load_dotenv
+from urllib3.util.request import ACCEPT_ENCODING
+
+""" Načtení konfigurace z .env souboru – dřív, než ji moduly níže přečtou """
+load_dotenv()
+
+from crawler import Crawler
+from fetch_engine import FetchEngine, RetryPolicy, SourceFetcher
+from listing_index import INCREMENTAL_MODES, ListingIndex, Unchanged, fetch_changed
+from raw_sink import CsvSink
+from scrape_metrics import QUIET, ScrapeMetrics
+from snapshot_store import SNAPSHOT_MODE, SNAPSHOT_MODES, SnapshotStore, replay
+
+""" Nastavení možností pro pandas """
+pd.set_option('display.max_colwidth', None)
+
+""" Sdílený běh pro všechny zdroje – souběžnost, limity na host, opakování s čekáním, jistič a časový rozpočet """
+CONCURRENCY = int(os.getenv("CONCURRENCY", "8"))
+PER_HOST_LIMIT = int(os.getenv("PER_HOST_LIMIT", "4"))
+REQUESTS_PER_SECOND = float(os.getenv("REQUESTS_PER_SECOND", "4"))
+FETCH_RETRIES = int(os.getenv("FETCH_RETRIES", "3"))
+FETCH_BACKOFF = float(os.getenv("FETCH_BACKOFF", "0.5"))  # čekání 0.5, 1, 2 s... mezi pokusy
+FETCH_MAX_BACKOFF = float(os.getenv("FETCH_MAX_BACKOFF", "30"))  # strop čekání včetně Retry-After
+CONNECT_TIMEOUT = float(os.getenv("CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("READ_TIMEOUT", "10"))
+BREAKER_THRESHOLD = int(os.getenv("BREAKER_THRESHOLD", "5"))  # selhání v řadě, po kterých se host odpojí (0 = vypnuto)
+BREAKER_COOLDOWN = float(os.getenv("BREAKER_COOLDOWN", "30"))
+RUN_TIME_BUDGET = float(os.getenv("RUN_TIME_BUDGET", "0"))  # sekundy na celý běh, 0 = bez omezení
+
+RAW_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "raw_data")
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "cs-CZ,cs;q=0.9,en-US;q=0.8,en;q=0.7",
+    # Jen kódování, která urllib3 opravdu umí rozbalit – br se nabízí jen s nainstalovaným brotli, zstd se zstandard
+    "Accept-Encoding": ACCEPT_ENCODING,
+    "Connection": "keep-alive"
+}
+
+""" Konfigurace scrapování z proměnných prostředí (společná pro všechny zdroje) """
+def load_config() -> dict:
+    min_price = os.getenv("MIN_PRICE")
+    max_price = os.getenv("MAX_PRICE")
+    return {
+        "brand": os.getenv("BRAND"),  # Například "skoda", "audi", "bmw" atd.
+        "num_listings": int(os.getenv("NUM_LISTINGS", "50")),
+        "max_pages": int(os.getenv("MAX_PAGES", "5")),
+        "min_price": int(min_price) if min_price is not None else None,
+        "max_price": int(max_price) if max_price is not None else None,
+        "incremental_mode": os.getenv("INCREMENTAL_MODE", "conditional"),  # conditional / skip / off
+        "known_streak_limit": int(os.getenv("KNOWN_STREAK_LIMIT", "40")),
+        # Zkratky podle karet ve výpisu (záznam z úplné karty, duplicitní a nezměněné karty bez detailu) –
+        # vypnuto, dokud card_fields neověří uložená skutečná stránka výpisu
+        "card_fast_path": os.getenv("CARD_FAST_PATH", "0") == "1",
+        "snapshot_mode": SNAPSHOT_MODE
+    }
+
+""" Funkce pro validaci konfiguračních hodnot """
+def validate_config(config: dict) -> None:
+    errors = []
+    if config["min_price"] is not None and config["min_price"] < 0:
+        errors.append("MIN_PRICE nesmí být záporná.")
+    if config["num_listings"] <= 0:
+        errors.append("NUM_LISTINGS musí být kladné číslo.")
+    if config["max_pages"] <= 0:
+        errors.append("MAX_PAGES musí být kladné číslo.")
+    if config["min_price"] is not None and config["max_price"] is not None and config["min_price"] >= config["max_price"]:
+        errors.append("MIN_PRICE musí být menší než MAX_PRICE.")
+    if config["known_streak_limit"] < 0:
+        errors.append("KNOWN_STREAK_LIMIT nesmí být záporný.")
+    if config["incremental_mode"] not in INCREMENTAL_MODES:
+        errors.append(f"INCREMENTAL_MODE musí být jedna z hodnot {', '.join(INCREMENTAL_MODES)}.")
+    if config["snapshot_mode"] not in SNAPSHOT_MODES:
+        errors.append(f"SNAPSHOT_MODE musí být jedna z hodnot {', '.join(SNAPSHOT_MODES)}.")
+    if errors:
+        raise ValueError(" ".join(errors))
+
+""" Společná síťová vrstva – jedna session s poolem keep-alive spojení, opakováním, jističem a limitem rychlosti """
+class ScrapeRuntime:
+    def __init__(self, concurrency: int = CONCURRENCY, per_host: int = PER_HOST_LIMIT,
+                 requests_per_second: float = REQUESTS_PER_SECOND, retries: int = FETCH_RETRIES,
+                 backoff: float = FETCH_BACKOFF, time_budget: float = RUN_TIME_BUDGET):
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        # Výpadky spojení, timeouty a odpovědi 429/5xx se opakují s rostoucím čekáním, Retry-After se respektuje
+        self.engine = FetchEngine(
+            self.session,
+            max_workers=concurrency,
+            per_host=per_host,
+            requests_per_second=requests_per_second,
+            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+            retry=RetryPolicy(retries=retries, backoff=backoff, max_backoff=FETCH_MAX_BACKOFF),
+            breaker_threshold=BREAKER_THRESHOLD,
+            breaker_cooldown=BREAKER_COOLDOWN,
+            time_budget=time_budget
+        )
+
+    """ Fetcher pro jeden zdroj – sdílený pool, vlastní metriky """
+    def fetcher(self, metrics: ScrapeMetrics) -> SourceFetcher:
+        return SourceFetcher(self.engine, metrics)
+
+    def close(self) -> None:
+        self.engine.close()
+        self.session.close()
+
+""" Běh jednoho zdroje – stránkování, deduplikace, průběžný zápis CSV, index a archiv odpovědí """
+class SourceRun:
+    def __init__(self, adapter_cls, runtime: ScrapeRuntime | None, config: dict):
+        self.config = config
+        self.name = adapter_cls.name
+        os.makedirs(RAW_DATA_DIR, exist_ok=True)
+        self.metrics = ScrapeMetrics(self.name, output_dir=RAW_DATA_DIR)
+        self.adapter = adapter_cls(self.metrics)
+        self.fetcher = runtime.fetcher(self.metrics) if runtime is not None else None
+        # Pole z karet ve výpisu (URL → pole) a klíče úplných karet, které už v tomto běhu prošly
+        self.cards = {}
+        self.card_keys = set()
+        # Perzistentní index inzerátů pro inkrementální scrapování
+        self.index = ListingIndex(os.path.join(RAW_DATA_DIR, f"index_{self.name}.sqlite"))
+        # Archiv surových odpovědí (SNAPSHOT_MODE=record ukládá, replay parsuje offline)
+        self.snapshots = None
+        if config["snapshot_mode"] != "off":
+            self.snapshots = SnapshotStore(os.path.join(RAW_DATA_DIR, f"snapshots_{self.name}"))
+        # Archiv potřebuje HTML detailů, při SNAPSHOT_MODE=record se proto detaily stahují vždy.
+        # Bez zapnutého CARD_FAST_PATH karta o přeskočení detailu nerozhoduje vůbec
+        self.card_fast_path = config["card_fast_path"] and self.snapshots is None
+
+    """ Odkazy ze stránky výpisu s výpisem jejich počtu – s CARD_FAST_PATH se duplicitní karty vyřadí před stažením detailu """
+    def discover(self, page_url: str) -> list[str]:
+        try:
+            resp = self.fetcher.get(page_url)
+        except Exception as e:
+            print(f"[{self.name}] Chyba při načítání listingu {page_url}: {e}")
+            return []
+        with self.metrics.timer("listing"):
+            cards = dict(self.adapter.listing_cards(resp.text))
+        links = []
+        for url, card in cards.items():
+            # Karta se všemi sloupci sama odpoví, zda jde o duplicitu – detail pak není potřeba
+            key = self.adapter.card_key(card) if self.card_fast_path else None
+            if key is not None:
+                if key in self.card_keys:
+                    self.metrics.incr("card_duplicates")
+                    continue
+                self.card_keys.add(key)
+            self.cards[url] = card
+            links.append(url)
+        print(f"[{self.name}] Na stránce '{page_url}' nalezeno {len(cards)} inzerátů.")
+        return links
+
+    """ Záznam inzerátu – z úplné karty rovnou, jinak z detailu doplněného o pole z karty; běží ve vláknech FetchEngine """
+    def fetch_detail(self, url: str):
+        card = self.cards.pop(url, {})
+        previous = None
+        # Při SNAPSHOT_MODE=record (a bez CARD_FAST_PATH) se detail stahuje vždy
+        if card and self.card_fast_path and self.config["incremental_mode"] != "off":
+            previous = self.index.get(url)
+            if previous and self.adapter.card_matches(card, previous["record"]):
+                # Karta ve výpisu se shoduje s uloženým záznamem – detail se vůbec nestahuje
+                self.index.touch(url)
+                self.metrics.incr("card_unchanged")
+                return Unchanged(previous["record"])
+        data = self.adapter.card_record(card, url) if self.card_fast_path else None
+        if data is not None:
+            # Karta nese všechny sloupce – detail by nepřinesl nic nového
+            self.metrics.incr("card_records")
+            with self.metrics.timer("index"):
+                return self.index.store(url, None, data, previous)
+        mode = self.config["incremental_mode"]
+        # Detail, který archiv ještě nemá, se při SNAPSHOT_MODE=record stáhne celý – 304 ani přeskočení by ho
+        # do archivu nedostaly; nezměněný inzerát se pak pozná podle shody záznamu s indexem
+        full_fetch = self.snapshots is not None and mode != "off" and url not in self.snapshots
+        try:
+            r, previous = fetch_changed(self.fetcher, self.index, url, "off" if full_fetch else mode)
+            if full_fetch:
+                previous = self.index.get(url)
+        except Exception as e:
+            self.metrics.incr("errors")
+            print(f"[{self.name}] Chyba při načítání detailu {url}: {e}")
+            return None
+        if r is None:
+            return Unchanged(previous["record"])
+        if self.snapshots is not None:
+            with self.metrics.timer("snapshot"):
+                self.snapshots.put(url, r.content, r.encoding or r.apparent_encoding, r.status_code)
+        with self.metrics.timer("parse"):
+            data = self.adapter.parse_detail(r.text, url)
+        if data is None:
+            self.metrics.incr("incomplete")
+        else:
+            # Karta doplní jen to, co detail nenese – hodnoty z detailu mají přednost před odhadem z karty
+            data = card | data
+        with self.metrics.timer("index"):
+            return self.index.store(url, r, data, previous)
+
+    """ Zpracování jednoho detailu v pořadí odkazů – vrací (nový záznam nebo None, počet známých inzerátů v řadě) """
+    def process(self, link: str, data, error, seen_set: set, known_streak: int, sink: CsvSink):
+        if error is not None:
+            self.metrics.incr("errors")
+            print(f"[{self.name}] Chyba při zpracování detailu {link}: {error}")
+            return None, known_streak
+        if isinstance(data, Unchanged):
+            self.metrics.incr("unchanged")
+            # Záznam z indexu se nabídne i zápisu – po přerušeném běhu tak do CSV doplní, co chybí
+            if data.record:
+                with self.metrics.timer("write"):
+                    sink.add(data.record)
+            return None, known_streak + 1
+        if not data:
+            return None, 0
+        with self.metrics.timer("dedup"):
+            dedup_key = self.adapter.dedup_key(data)
+            duplicate = dedup_key in seen_set
+            if not duplicate:
+                seen_set.add(dedup_key)
+        if duplicate:
+            self.metrics.incr("duplicates")
+            return None, 0
+        self.metrics.incr("records")
+        with self.metrics.timer("write"):
+            sink.add(data)
+        if not QUIET:
+            self.adapter.print_record(data)
+        return data, 0
+
+    """ Scrapování minimálního počtu inzerátů ze zadaného počtu stránek """
+    def scrape(self) -> pd.DataFrame:
+        min_inzeraty = self.config["num_listings"]
+        base_url = self.adapter.listing_url(self.fetcher, self.config)
+        all_data = []
+        # Záznamy se zapisují průběžně po každém inzerátu, ne až na konci běhu
+        sink = CsvSink(os.path.join(RAW_DATA_DIR, f"auta_{self.name}.csv"), self.adapter.raw_columns)
+        seen_set = set()
+        known_streak = 0
+        page_records = {}
+        # Inkrementální běh končí podle řady známých inzerátů (KNOWN_STREAK_LIMIT, 0 = bez limitu),
+        # pravidlo "stránka bez nových záznamů" platí jen bez tohoto limitu
+        streak_limit = self.config["known_streak_limit"] if self.config["incremental_mode"] != "off" else 0
+        # Stránky výpisu se procházejí napřed, detaily se stahují souběžně a zpracovávají v pořadí odkazů
+        crawler = Crawler(self.fetcher, self.discover, self.fetch_detail)
+        crawl = crawler.run(self.adapter.page_urls(base_url, self.config["max_pages"]))
+        try:
+            for page, link, data, error in crawl:
+                if self.fetcher.out_of_budget():
+                    print(f"[{self.name}] Vyčerpán časový rozpočet běhu => končím.")
+                    break
+                if link is None:
+                    # Všechny detaily stránky jsou zpracované
+                    with self.metrics.timer("write"):
+                        sink.flush()
+                    self.metrics.emit("page")
+                    if not streak_limit and not page_records.get(page):
+                        print(f"[{self.name}] Žádné nové inzeráty => končím.")
+                        break
+                    print(f"[{self.name}] Aktuálně nasbíráno {len(all_data)} záznamů (po deduplikaci).\n")
+                    continue
+                record, known_streak = self.process(link, data, error, seen_set, known_streak, sink)
+                if record is not None:
+                    all_data.append(record)
+                    page_records[page] = page_records.get(page, 0) + 1
+                    if len(all_data) >= min_inzeraty:
+                        print(f"[{self.name}] Dosaženo {min_inzeraty} záznamů => končím.")
+                        break
+                if streak_limit and known_streak >= streak_limit:
+                    print(f"[{self.name}] Posledních {known_streak} inzerátů už je v indexu beze změny => končím.")
+                    break
+        finally:
+            # Rozpracované detaily se zruší, i při přerušení (Ctrl+C, výjimka) se zbytek bufferu zapíše na disk
+            crawl.close()
+            sink.close()
+            self.metrics.emit("summary")
+        print(
+            f"[{self.name}] Hotovo! Přidáno {sink.added} nových záznamů. "
+            f"Celkem {len(sink)} záznamů uložených do {sink.path}."
+        )
+        print(f"[{self.name}] {self.metrics.summary()}")
+
+        df = pd.DataFrame(all_data)
+        if "URL" in df.columns:
+            df.drop(columns=["URL"], inplace=True)
+        return df
+
+    """ Offline replay archivu – přeparsuje všechny uložené detaily paralelně a bez síťového přístupu """
+    def replay_snapshots(self) -> pd.DataFrame:
+        print(f"[{self.name}] Replay archivu {self.snapshots.root} ({len(self.snapshots)} stránek)...")
+        with self.metrics.timer("replay"):
+            records = replay(self.snapshots, type(self.adapter), metrics=self.metrics)
+        df = pd.DataFrame(records)
+        path = os.path.join(RAW_DATA_DIR, f"auta_{self.name}_replay.csv")
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+        self.metrics.incr("records", len(records))
+        self.metrics.emit("replay")
+        print(f"[{self.name}] Hotovo! {len(records)} záznamů z archivu uloženo do {path}.")
+        print(f"[{self.name}] {self.metrics.summary()}")
+        df.drop(columns=["URL"], inplace=True, errors="ignore")
+        return df
+
+    def close(self) -> None:
+        self.index.close()
+        if self.snapshots is not None:
+            self.snapshots.close()
+
+""" Spuštění zdrojů – každý ve vlastním vlákně nad společnou síťovou vrstvou, vrací název → DataFrame """
+def run_sources(adapter_classes: list, config: dict) -> dict:
+    replay_mode = config["snapshot_mode"] == "replay"
+    # Replay archivu pracuje bez sítě, síťová vrstva se vůbec nevytváří
+    runtime = ScrapeRuntime() if not replay_mode else None
+    results = {}
+
+    def run(adapter_cls):
+        source = SourceRun(adapter_cls, runtime, config)
+        try:
+            results[adapter_cls.name] = source.replay_snapshots() if replay_mode else source.scrape()
+        except Exception as e:
+            # Chyba jednoho zdroje neukončí ostatní
+            print(f"[{adapter_cls.name}] Scrapování selhalo: {e}")
+        finally:
+            source.close()
+
+    try:
+        if len(adapter_classes) == 1:
+            run(adapter_classes[0])
+        else:
+            threads = [threading.Thread(target=run, args=(cls,), name=f"source-{cls.name}") for cls in adapter_classes]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+    finally:
+        if runtime is not None:
+            runtime.close()
+    return results
+
+""" Vstupní bod scraperů – ověří konfiguraci, spustí zdroje a vypíše náhled výsledků """
+def main(adapter_classes: list) -> dict:
+    config = load_config()
+    try:
+        validate_config(config)
+    except ValueError as ve:
+        print(f"Konfigurační chyba: {ve}")
+        exit(1)
+    results = run_sources(adapter_classes, config)
+    for name, df in results.items():
+        print(f"\n[{name}] Náhled do CSV (prvních 5 řádků):")
+        print(df.head())
+    return results
@@ -0,0 +1,151 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from listing_index import content_hash
+
+""" Archiv surových odpovědí: off (nic), record (ukládá stažené detaily), replay (parsuje archiv bez sítě) """
+SNAPSHOT_MODES = ("off", "record", "replay")
+SNAPSHOT_MODE = os.getenv("SNAPSHOT_MODE", "off")
+""" Komprese objektů – zlib (vestavěná) nebo zstd (vyžaduje pip install zstandard) """
+SNAPSHOT_CODEC = os.getenv("SNAPSHOT_CODEC", "zlib")
+REPLAY_WORKERS = int(os.getenv("REPLAY_WORKERS", str(os.cpu_count() or 1)))
+REPLAY_CHUNK = int(os.getenv("REPLAY_CHUNK", "64"))
+
+CODECS = {"zlib": ".zz", "zstd": ".zst"}
+
+def compress(body: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor(level=10).compress(body)
+    return zlib.compress(body, 6)
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+""" Cesta objektu podle hashe obsahu – objects/ab/abcdef….zz """
+def object_path(root: str, digest: str, codec: str) -> str:
+    return os.path.join(root, "objects", digest[:2], digest + CODECS[codec])
+
+""" Načtení HTML z archivu – text se dekóduje stejně jako Response.text """
+def read_text(root: str, digest: str, codec: str, encoding: str | None) -> str:
+    with open(object_path(root, digest, codec), "rb") as f:
+        body = decompress(f.read(), codec)
+    return str(body, encoding or "utf-8", errors="replace")
+
+""" Archiv odpovědí adresovaný obsahem – stejné tělo se uloží jen jednou, manifest (SQLite) drží URL → hash """
+class SnapshotStore:
+    def __init__(self, root: str, codec: str = SNAPSHOT_CODEC):
+        if codec not in CODECS:
+            raise ValueError(f"SNAPSHOT_CODEC musí být jedna z hodnot {', '.join(CODECS)}.")
+        self.root = root
+        self.codec = codec
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        self._lock = threading.Lock()
+        # Archiv plní všechna vlákna FetchEngine, přístup k manifestu hlídá zámek
+        self._conn = sqlite3.connect(os.path.join(root, "manifest.sqlite"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT,
+                codec TEXT,
+                encoding TEXT,
+                status INTEGER,
+                fetched_at REAL
+            )
+        """)
+        self._conn.commit()
+
+    """ Uložení těla odpovědi – objekt se zapisuje atomicky a jen pokud ještě neexistuje """
+    def put(self, url: str, body: bytes, encoding: str | None, status: int = 200) -> str:
+        digest = content_hash(body)
+        path = object_path(self.root, digest, self.codec)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(compress(body, self.codec))
+            os.replace(tmp_path, path)
+        with self._lock:
+            self._conn.execute("""
+                INSERT INTO snapshots (url, content_hash, codec, encoding, status, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    codec = excluded.codec,
+                    encoding = excluded.encoding,
+                    status = excluded.status,
+                    fetched_at = excluded.fetched_at
+            """, (url, digest, self.codec, encoding, status, time.time()))
+            self._conn.commit()
+        return digest
+
+    """ Všechny archivované stránky jako (url, hash, kodek, kódování) seřazené podle URL """
+    def entries(self) -> list[tuple]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT url, content_hash, codec, encoding FROM snapshots ORDER BY url"
+            ).fetchall()
+
+    def get_text(self, url: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash, codec, encoding FROM snapshots WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return read_text(self.root, *row)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM snapshots WHERE url = ?", (url,)).fetchone() is not None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+""" Parsování jednoho bloku archivu v pracovním procesu – vrací záznamy a počty chybějících polí """
+def replay_chunk(root: str, adapter_cls, items: list[tuple]) -> tuple[list, dict]:
+    # Adaptér se v procesu vytvoří znovu (bez sítě), chybějící pole si počítá do vlastních metrik
+    adapter = adapter_cls()
+    records = []
+    for url, digest, codec, encoding in items:
+        records.append(adapter.parse_detail(read_text(root, digest, codec, encoding), url))
+    return records, dict(adapter.metrics.parse_failures)
+
+""" Offline replay – přeparsuje celý archiv paralelně v procesech (parsování je vázané na CPU) """
+def replay(store: SnapshotStore, adapter_cls, workers: int = REPLAY_WORKERS, chunk_size: int = REPLAY_CHUNK,
+           metrics=None) -> list[dict]:
+    items = store.entries()
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    if workers <= 1:
+        return collect((replay_chunk(store.root, adapter_cls, chunk) for chunk in chunks), metrics)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        outputs = pool.map(replay_chunk, [store.root] * len(chunks), [adapter_cls] * len(chunks), chunks)
+        return collect(outputs, metrics)
+
+""" Sloučení výsledků bloků v původním pořadí – prázdné záznamy a chybějící pole jdou do metrik """
+def collect(outputs, metrics=None) -> list[dict]:
+    results = []
+    for records, failures in outputs:
+        for record in records:
+            if record:
+                results.append(record)
+            elif metrics is not None:
+                metrics.incr("incomplete")
+        if metrics is not None:
+            for field, n in failures.items():
+                metrics.parse_failure(field, n)
+    return results
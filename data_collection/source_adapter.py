@@ -0,0 +1,115 @@
+import os
+
+from scrape_metrics import QUIET, ScrapeMetrics
+
+""" Parser HTML sdílený všemi zdroji – např. "lxml" pro rychlejší parsování """
+HTML_PARSER = os.getenv("HTML_PARSER", "html.parser")
+
+""" Registr zdrojů – název zdroje → třída adaptéru (plní dekorátor register_source) """
+SOURCES = {}
+
+def register_source(cls):
+    SOURCES[cls.name] = cls
+    return cls
+
+""" Adaptér inzertního webu – dodává URL výpisu, odkazy ze stránky výpisu a parsování detailu, zbytek řeší scrape_runtime """
+class SourceAdapter:
+    name = ""
+    site_url = ""
+    # Sloupce CSV ve výstupu (bez URL) – podle nich se záznamy i deduplikují
+    raw_columns = []
+    # Parametr čísla stránky ve výpisu
+    page_param = "page"
+    # Sloupce, které musí karta ve výpisu nést, aby podle ní šlo poznat nezměněný inzerát bez stažení detailu
+    card_change_columns = ["Cena"]
+
+    # Konstruktor nesmí sahat na síť – adaptér se vytváří i v procesech offline replay
+    def __init__(self, metrics: ScrapeMetrics | None = None, html_parser: str = HTML_PARSER):
+        self.metrics = metrics if metrics is not None else ScrapeMetrics(self.name, fmt="off")
+        self.html_parser = html_parser
+
+    """ URL první stránky výpisu podle konfigurace – smí ověřit značku přes fetcher """
+    def listing_url(self, fetcher, config: dict) -> str:
+        raise NotImplementedError
+
+    """ Odkazy na detaily z HTML stránky výpisu """
+    def listing_links(self, html: str) -> list[str]:
+        raise NotImplementedError
+
+    """ Karty ze stránky výpisu – (URL detailu, pole známá už z karty); výchozí karta žádná pole nenese """
+    def listing_cards(self, html: str) -> list[tuple[str, dict]]:
+        return [(link, {}) for link in self.listing_links(html)]
+
+    """ Záznam z HTML detailu, nebo None, pokud chybí povinné pole """
+    def parse_detail(self, html: str, url: str) -> dict | None:
+        raise NotImplementedError
+
+    """ Adresy stránek výpisu – první stránka je samotné URL, další přidávají parametr stránky """
+    def page_urls(self, base_url: str, max_pages: int):
+        for page in range(1, max_pages + 1):
+            if page == 1:
+                page_url = base_url
+            else:
+                sep = "&" if "?" in base_url else "?"
+                page_url = f"{base_url}{sep}{self.page_param}={page}"
+            print(f"\n[{self.name}] SCRAPUJI STRÁNKU č.{page}: {page_url}")
+            yield page_url
+
+    """ Absolutní URL odkazu z výpisu """
+    def absolute_url(self, href: str) -> str:
+        return href if href.startswith("http") else self.site_url + href
+
+    """ Ověření URL se značkou – při chybě nebo neočekávaném obsahu se použije záložní URL """
+    def validated_url(self, fetcher, url: str, fallback: str, brand: str, expected_text: str | None = None) -> str:
+        try:
+            text = fetcher.get(url).text
+        except Exception as e:
+            print(f"Chyba při ověřování URL pro značku '{brand}': {e}")
+            return fallback
+        if expected_text and expected_text not in text.lower():
+            print(f"Zadaná značka '{brand}' nevrací očekávaný obsah, používá se fallback URL bez značky.")
+            return fallback
+        return url
+
+    """ Započtení chybějícího pole do metrik, výpis důvodu jen mimo tichý režim """
+    def parse_failure(self, field: str, message: str | None = None) -> None:
+        self.metrics.parse_failure(field)
+        if message and not QUIET:
+            print(message)
+
+    """ Kontrola povinných polí – chybějící ("Nezjištěno") se započtou do metrik, vrací True, pokud je vše """
+    def check_mandatory(self, fields: dict, url: str) -> bool:
+        missing = [field for field, value in fields.items() if value == "Nezjištěno"]
+        for field in missing:
+            self.metrics.parse_failure(field)
+        if missing and not QUIET:
+            print(f"Nezjištěno {', '.join(missing)} na {url}")
+        return not missing
+
+    """ Klíč pro deduplikaci záznamu """
+    def dedup_key(self, record: dict) -> tuple:
+        return tuple(record[column] for column in self.raw_columns)
+
+    """ Klíč pro deduplikaci z karty – None, pokud karta nenese všechny sloupce """
+    def card_key(self, card: dict) -> tuple | None:
+        if not all(column in card for column in self.raw_columns):
+            return None
+        return self.dedup_key(card)
+
+    """ Záznam přímo z karty – jen pokud karta nese všechny sloupce, jinak None (je potřeba detail) """
+    def card_record(self, card: dict, url: str) -> dict | None:
+        if self.card_key(card) is None:
+            return None
+        return {"URL": url, **{column: card[column] for column in self.raw_columns}}
+
+    """ Odpovídá karta naposledy uloženému záznamu? Rozhoduje jen karta s cenou (card_change_columns) """
+    def card_matches(self, card: dict, record: dict | None) -> bool:
+        if not record or not all(column in card for column in self.card_change_columns):
+            return False
+        return all(str(record.get(column)) == str(value) for column, value in card.items())
+
+    """ Výpis jednoho nového záznamu (v tichém režimu se vynechává) """
+    def print_record(self, record: dict) -> None:
+        print("-" * 60)
+        for column in ["URL"] + self.raw_columns:
+            print(f"{column + ':':<14}{record[column]}")
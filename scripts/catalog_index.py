@@ -0,0 +1,70 @@
+import json
+import os
+import sys
+
+# Předpočítaný katalog pro rozbalovací seznamy aplikace: značka → model → seřazené objemy,
+# plus možnosti paliva a převodovky. Aplikace načítá jen tento malý JSON, ne celý dataset.
+# Modul na úrovni importu nepotřebuje pandas – load_catalog tak nezdržuje start aplikace.
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+catalog_path = os.path.join(base_dir, "datasets", "catalog.json")
+
+""" Sběr katalogu z jednoho nebo více bloků vyčištěného datasetu """
+class CatalogBuilder:
+    def __init__(self):
+        self.volumes = {}
+        self.fuels = set()
+        self.transmissions = set()
+        self.rows = 0
+
+    def add(self, df) -> None:
+        import pandas as pd
+
+        self.rows += len(df)
+        triples = df[["Značka", "Model", "Objem (l)"]].dropna(subset=["Značka"]).drop_duplicates()
+        for brand, model, volume in triples.itertuples(index=False):
+            models = self.volumes.setdefault(brand, {})
+            if pd.isna(model):
+                continue
+            volumes = models.setdefault(model, set())
+            if pd.notna(volume):
+                volumes.add(volume)
+        self.fuels.update(df["Palivo"].dropna().unique().tolist())
+        self.transmissions.update(df["Převodovka"].dropna().unique().tolist())
+
+    def to_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "brands": {
+                brand: {model: sorted(volumes) for model, volumes in sorted(models.items())}
+                for brand, models in sorted(self.volumes.items())
+            },
+            "fuels": sorted(self.fuels),
+            "transmissions": sorted(self.transmissions),
+        }
+
+def build_catalog(df) -> dict:
+    builder = CatalogBuilder()
+    builder.add(df)
+    return builder.to_dict()
+
+def write_catalog(catalog: dict, path: str = catalog_path) -> None:
+    # Zápis přes dočasný soubor – aplikace nikdy nenačte rozepsaný katalog
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(catalog, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+def load_catalog(path: str = catalog_path) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+# Samostatné spuštění vytvoří katalog z existujícího final_dataset
+if __name__ == "__main__":
+    from dataset_io import read_dataset, resolve_input
+
+    source = sys.argv[1] if len(sys.argv) > 1 else resolve_input(os.path.join(base_dir, "datasets"), "final_dataset")
+    catalog = build_catalog(read_dataset(source))
+    write_catalog(catalog)
+    print(f"Katalog uložen do {catalog_path}: {len(catalog['brands'])} značek, "
+          f"{sum(len(m) for m in catalog['brands'].values())} modelů.")
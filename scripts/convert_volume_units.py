@@ -1,31 +1,39 @@
 import pandas as pd
 import os
 
+from dataset_io import dataset_path, read_dataset, resolve_input, write_dataset
+
 base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 # Nastavení cest k souborům pomocí relativních cest
-input_csv = os.path.join(base_dir, "raw_data", "auta_sauto.csv")
-output_csv = os.path.join(base_dir, "raw_data", "auta_sauto_cleaned.csv")
-
-# Načtení CSV souboru
-df = pd.read_csv(input_csv, encoding='utf-8-sig')
-print("Dataset načten, počet záznamů:", len(df))
-
-# Zkontrolujeme, zda existuje sloupec "Objem (cm³)"
-if 'Objem (cm³)' in df.columns:
-    # Vytvoříme nový sloupec "Objem (l)" převodem z cm³ na litry a zaokrouhlením na 1 desetinné místo
-    df['Objem (l)'] = (df['Objem (cm³)'].astype(float) / 1000).round(1)
-    # Odstraníme původní sloupec "Objem (cm³)"
-    df.drop(columns=['Objem (cm³)'], inplace=True)
-    print("Převod byl úspěšný. Ukázka nového sloupce:")
-    print(df[['Značka', 'Model', 'Objem (l)']].head())
-else:
-    print("Sloupec 'Objem (cm³)' nebyl nalezen. Zkontroluj název sloupce.")
+# (formát výstupu řídí DATASET_FORMAT, vstupem je CSV ze scraperu nebo jeho kolonová kopie)
+raw_dir = os.path.join(base_dir, "raw_data")
+input_csv = resolve_input(raw_dir, "auta_sauto")
+output_csv = dataset_path(raw_dir, "auta_sauto_cleaned")
 
-# Přeuspořádáme sloupce tak, aby "Objem (l)" byl hned za "Model"
+# Přeuspořádání sloupců tak, aby "Objem (l)" byl hned za "Model"
 new_order = ["Značka", "Model", "Objem (l)", "Rok", "Najeté km", "Cena", "Palivo", "Převodovka", "Výkon (kW)"]
-df = df[new_order]
 
-# Uložíme aktualizovaný dataset do nového CSV souboru
-df.to_csv(output_csv, index=False, encoding='utf-8-sig')
-print(f"Aktualizovaný CSV soubor byl uložen jako: {output_csv}")
+def convert_volumes(df: pd.DataFrame) -> pd.DataFrame:
+    # Zkontrolujeme, zda existuje sloupec "Objem (cm³)"
+    if 'Objem (cm³)' in df.columns:
+        # Vytvoříme nový sloupec "Objem (l)" převodem z cm³ na litry a zaokrouhlením na 1 desetinné místo
+        df = df.assign(**{'Objem (l)': (df['Objem (cm³)'].astype(float) / 1000).round(1)})
+        # Odstraníme původní sloupec "Objem (cm³)"
+        df = df.drop(columns=['Objem (cm³)'])
+    else:
+        print("Sloupec 'Objem (cm³)' nebyl nalezen. Zkontroluj název sloupce.")
+    return df[new_order]
+
+if __name__ == "__main__":
+    # Načtení datasetu
+    df = read_dataset(input_csv)
+    print("Dataset načten, počet záznamů:", len(df))
+
+    df = convert_volumes(df)
+    print("Ukázka sloupce Objem (l):")
+    print(df[['Značka', 'Model', 'Objem (l)']].head())
+
+    # Uložíme aktualizovaný dataset do nového souboru
+    write_dataset(df, output_csv)
+    print(f"Aktualizovaný dataset byl uložen jako: {output_csv}")
@@ -1,9 +1,13 @@
 from datetime import datetime
 import os
+import numpy as np
 import pandas as pd
 import unicodedata
 import re
 
+from catalog_index import CatalogBuilder, build_catalog, catalog_path, write_catalog
+from dataset_io import DatasetWriter, dataset_path, iter_dataset_chunks, read_dataset, resolve_input, write_dataset
+
 def remove_diacritics(s: str) -> str:
     nfkd_form = unicodedata.normalize('NFKD', s)
     return ''.join(c for c in nfkd_form if not unicodedata.combining(c))
@@ -18,18 +22,19 @@ def unify_text(s: str) -> str:
     s_clean = remove_hyphens_spaces(s_clean)
     return s_clean.title()  # sjednocené finálně na např. "Troc", "Cmax", "Xtrail"
 
+BRAND_PREFIXES = {
+    "aud": "Audi", "bmw": "BMW", "cit": "Citroën", "dod": "Dodge",
+    "for": "Ford", "hyu": "Hyundai", "jee": "Jeep", "kia": "Kia",
+    "maz": "Mazda", "mer": "MercedesBenz", "nis": "Nissan", "ope": "Opel",
+    "peu": "Peugeot", "por": "Porsche", "ren": "Renault", "sko": "Skoda",
+    "toy": "Toyota", "volk": "Volkswagen", "volv": "Volvo"
+}
+
 def unify_brand(brand: str) -> str:
     if pd.isna(brand):
         return None
     b = remove_hyphens_spaces(remove_diacritics(str(brand).strip().lower()))
-    prefixes = {
-        "aud": "Audi", "bmw": "BMW", "cit": "Citroën", "dod": "Dodge",
-        "for": "Ford", "hyu": "Hyundai", "jee": "Jeep", "kia": "Kia",
-        "maz": "Mazda", "mer": "MercedesBenz", "nis": "Nissan", "ope": "Opel",
-        "peu": "Peugeot", "por": "Porsche", "ren": "Renault", "sko": "Skoda",
-        "toy": "Toyota", "volk": "Volkswagen", "volv": "Volvo"
-    }
-    for prefix, standard in prefixes.items():
+    for prefix, standard in BRAND_PREFIXES.items():
         if b.startswith(prefix):
             return standard
     return str(brand).strip().title()
@@ -58,57 +63,120 @@ def check_palivo(p: str) -> str or None:
         return "Elektro"
     return None
 
-def clean_dataset(file_path: str, output_path: str) -> pd.DataFrame:
-    df = pd.read_csv(file_path, encoding="utf-8")
-
-    df.drop_duplicates(inplace=True)
-    df.dropna(how="all", inplace=True)
-
-    numeric_cols = ["Rok", "Najeté km", "Cena", "Výkon (kW)", "Objem (l)"]
-    for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-
-    # Filtrování extrémních hodnot
-    df = df[df["Cena"].between(30000, 2500000)]
-    df = df[df["Rok"].between(1970, 2025)]
-    df = df[df["Najeté km"] <= 600000]
-    df = df[df["Objem (l)"].between(0.5, 8.0)]
-    df = df[df["Výkon (kW)"].between(20, 800)]
-
-    df["Značka"] = df["Značka"].apply(unify_brand)
-    df["Model"] = df["Model"].apply(unify_text)
-    df["Převodovka"] = df["Převodovka"].apply(unify_transmission)
-    df["Palivo"] = df["Palivo"].apply(check_palivo)
-
-    mandatory = ["Značka", "Model", "Rok", "Cena", "Palivo", "Převodovka", "Výkon (kW)", "Objem (l)"]
-    df.dropna(subset=mandatory, inplace=True)
+# Normalizační funkce se volají jen jednou pro každou unikátní hodnotu, výsledek se rozmapuje na všechny řádky
+def map_unique(series: pd.Series, func) -> pd.Series:
+    codes, uniques = pd.factorize(series)
+    # Poslední prvek tabulky (None) patří chybějícím hodnotám s kódem -1
+    lookup = np.array([func(value) for value in uniques] + [None], dtype=object)
+    return pd.Series(lookup[codes], index=series.index)
+
+def unify_text_if_str(x):
+    return unify_text(x) if isinstance(x, str) else x
+
+NUMERIC_COLUMNS = ["Rok", "Najeté km", "Cena", "Výkon (kW)", "Objem (l)"]
+INTEGER_COLUMNS = ["Najeté km", "Cena", "Výkon (kW)", "Stari"]
+MANDATORY_COLUMNS = ["Značka", "Model", "Rok", "Cena", "Palivo", "Převodovka", "Výkon (kW)", "Objem (l)"]
+TEXT_COLUMNS = ["Značka", "Model", "Palivo", "Převodovka"]
+INVALID_VALUES = {"ostatni", "nezjisteno"}
+
+def clean_dataset(file_path: str, output_path: str, catalog_output: str | None = None) -> pd.DataFrame:
+    df = clean_frame(read_dataset(file_path))
+    write_dataset(df, output_path)
+    if catalog_output:
+        write_catalog(build_catalog(df), catalog_output)
+    return df
 
-    df = df[~((df["Značka"] == "BMW") & (df["Model"].str.lower() == "rada"))]
+def clean_frame(df: pd.DataFrame) -> pd.DataFrame:
+    return clean_chunk(df.drop_duplicates())
+
+# Čištění bez deduplikace – stejné pro celý dataset i pro jeden blok
+def clean_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.dropna(how="all")
+
+    numeric = {col: pd.to_numeric(df[col], errors="coerce") for col in NUMERIC_COLUMNS}
+
+    # Filtrování extrémních hodnot – všechny podmínky v jedné masce, rámec se kopíruje jen jednou
+    in_range = (
+        numeric["Cena"].between(30000, 2500000)
+        & numeric["Rok"].between(1970, 2025)
+        & (numeric["Najeté km"] <= 600000)
+        & numeric["Objem (l)"].between(0.5, 8.0)
+        & numeric["Výkon (kW)"].between(20, 800)
+    )
+    df = df.loc[in_range].assign(**{col: values.loc[in_range] for col, values in numeric.items()})
+
+    # Značka a model se sjednocují ve dvou krocích: filtr BMW "Rada" pracuje s mezivýsledkem
+    brand_unified = map_unique(df["Značka"], unify_brand)
+    model_unified = map_unique(df["Model"], unify_text)
+    df["Značka"] = map_unique(brand_unified, unify_text_if_str)
+    df["Model"] = map_unique(model_unified, unify_text_if_str)
+    # U převodovky a paliva je druhé sjednocení textu složené přímo do vyhledávací tabulky
+    df["Převodovka"] = map_unique(df["Převodovka"], lambda x: unify_text_if_str(unify_transmission(x)))
+    df["Palivo"] = map_unique(df["Palivo"], lambda x: unify_text_if_str(check_palivo(x)))
+
+    # Povinné hodnoty, BMW "Rada" a neplatné texty opět jednou společnou maskou
+    keep = df[MANDATORY_COLUMNS].notna().all(axis=1)
+    keep &= ~((brand_unified == "BMW") & (map_unique(model_unified, str.lower) == "rada"))
+    for col in TEXT_COLUMNS:
+        keep &= ~df[col].str.lower().isin(INVALID_VALUES)
+    df = df.loc[keep]
 
     if "Zdroj" in df.columns:
-        df.drop(columns=["Zdroj"], inplace=True)
+        df = df.drop(columns=["Zdroj"])
 
     current_year = datetime.now().year
     df["Stari"] = current_year - df["Rok"]
-    df.drop(columns=["Rok"], inplace=True)
-
-    text_columns = ["Značka", "Model", "Palivo", "Převodovka"]
-    for col in text_columns:
-        df[col] = df[col].apply(lambda x: unify_text(x) if isinstance(x, str) else x)
+    df = df.drop(columns=["Rok"])
 
-    invalid_values = {"ostatni", "nezjisteno"}
-    for col in text_columns:
-        df = df[~df[col].str.lower().isin(invalid_values)]
-
-    df.to_csv(output_path, index=False, encoding="utf-8-sig")
     return df
 
+# Vyřazení řádků, které už se objevily v dřívějších blocích – pamatuje si jen 64bitové hashe řádků.
+# Číselné sloupce se hashují jako float64, aby hash nezávisel na typu odvozeném v jednotlivém bloku
+# (nečíselné hodnoty se mění na NaN – takové řádky stejně vyřadí filtry rozsahů).
+def drop_seen_rows(chunk: pd.DataFrame, seen_hashes: set) -> pd.DataFrame:
+    normalized = chunk.assign(**{
+        col: pd.to_numeric(chunk[col], errors="coerce").astype("float64") for col in NUMERIC_COLUMNS
+    })
+    keep = np.ones(len(chunk), dtype=bool)
+    for i, row_hash in enumerate(pd.util.hash_pandas_object(normalized, index=False).tolist()):
+        if row_hash in seen_hashes:
+            keep[i] = False
+        else:
+            seen_hashes.add(row_hash)
+    return chunk[keep]
+
+# Čištění po blocích s omezenou špičkou paměti – výsledek se průběžně zapisuje do výstupu
+def clean_dataset_chunked(file_path: str, output_path: str, chunk_size: int = 100000,
+                          catalog_output: str | None = None) -> int:
+    seen_hashes = set()
+    catalog = CatalogBuilder()
+    writer = DatasetWriter(output_path)
+    # Textové sloupce se čtou vždy jako text (model "500" nesmí být v jednom bloku číslo)
+    text_dtypes = {col: str for col in TEXT_COLUMNS}
+    try:
+        for chunk in iter_dataset_chunks(file_path, chunk_size, dtype=text_dtypes):
+            cleaned = clean_chunk(drop_seen_rows(chunk, seen_hashes))
+            # Po filtrech nejsou v celočíselných sloupcích chybějící hodnoty, typ tak nezávisí na bloku
+            writer.write(cleaned.astype({col: "int64" for col in INTEGER_COLUMNS}))
+            catalog.add(cleaned)
+    finally:
+        writer.close()
+    if catalog_output:
+        write_catalog(catalog.to_dict(), catalog_output)
+    return writer.rows
+
 base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-input_path = os.path.join(base_dir, "datasets", "merged_dataset.csv")
-output_path = os.path.join(base_dir, "datasets", "final_dataset.csv")
+input_path = resolve_input(os.path.join(base_dir, "datasets"), "merged_dataset")
+output_path = dataset_path(os.path.join(base_dir, "datasets"), "final_dataset")
+# Velikost bloku pro čištění po částech (0 = celý dataset najednou)
+CHUNK_SIZE = int(os.getenv("CLEANING_CHUNK_SIZE", "0"))
 
 # Použití funkce pro vyčištění datasetu
-cleaned_df = clean_dataset(input_path, output_path)
-print("Čištění dokončeno.")
-print(cleaned_df.head())
-print(cleaned_df["Model"].value_counts().head(20))
+if __name__ == "__main__" and CHUNK_SIZE > 0:
+    rows = clean_dataset_chunked(input_path, output_path, CHUNK_SIZE, catalog_path)
+    print(f"Čištění po blocích ({CHUNK_SIZE} řádků) dokončeno, uloženo {rows} záznamů do {output_path}.")
+elif __name__ == "__main__":
+    cleaned_df = clean_dataset(input_path, output_path, catalog_path)
+    print("Čištění dokončeno.")
+    print(cleaned_df.head())
+    print(cleaned_df["Model"].value_counts().head(20))
@@ -0,0 +1,142 @@
+import os
+import sys
+
+import pandas as pd
+
+# Formát ukládání datasetů – "csv" (výchozí), "parquet" nebo "feather" (vyžadují pyarrow)
+DATASET_FORMAT = os.getenv("DATASET_FORMAT", "csv").lower()
+EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+
+# Textové sloupce s malým počtem hodnot se ukládají jako kategorie
+CATEGORY_COLUMNS = ["Značka", "Model", "Palivo", "Převodovka"]
+# Číselné sloupce, které se v kolonovém formátu zmenší na nejmenší celočíselný typ
+INTEGER_COLUMNS = ["Rok", "Stari", "Najeté km", "Cena", "Výkon (kW)", "Objem (cm³)"]
+
+def dataset_path(directory: str, stem: str, fmt: str = DATASET_FORMAT) -> str:
+    if fmt not in EXTENSIONS:
+        raise ValueError(f"Neznámý formát datasetu '{fmt}', povolené: {', '.join(EXTENSIONS)}.")
+    return os.path.join(directory, stem + EXTENSIONS[fmt])
+
+# Vstup stage – nastavený formát, pokud existuje a není starší než CSV (např. po novém scrapování)
+def resolve_input(directory: str, stem: str) -> str:
+    csv_path = dataset_path(directory, stem, "csv")
+    preferred = dataset_path(directory, stem)
+    if preferred != csv_path and os.path.exists(preferred):
+        if not os.path.exists(csv_path) or os.path.getmtime(preferred) >= os.path.getmtime(csv_path):
+            return preferred
+    return csv_path
+
+# Kategorie pro textové sloupce a nejmenší celočíselné typy pro čísla (jen pokud převod nic neztratí)
+def optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    for col in INTEGER_COLUMNS:
+        if col not in df.columns:
+            continue
+        numeric = pd.to_numeric(df[col], errors="coerce")
+        if numeric.notna().sum() != df[col].notna().sum() or (numeric.dropna() % 1 != 0).any():
+            continue
+        if numeric.isna().any():
+            df[col] = numeric.astype("Int32")
+        else:
+            df[col] = pd.to_numeric(numeric.astype("int64"), downcast="integer")
+    return df
+
+def read_dataset(path: str) -> pd.DataFrame:
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".parquet":
+        return pd.read_parquet(path)
+    if ext == ".feather":
+        return pd.read_feather(path)
+    return pd.read_csv(path, encoding="utf-8-sig")
+
+def write_dataset(df: pd.DataFrame, path: str) -> None:
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".parquet":
+        optimize_dtypes(df).to_parquet(path, index=False)
+    elif ext == ".feather":
+        optimize_dtypes(df).reset_index(drop=True).to_feather(path)
+    else:
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+
+# Čtení datasetu po blocích omezené velikosti – dtype u CSV fixuje typy sloupců, které se mezi bloky nesmí lišit
+def iter_dataset_chunks(path: str, chunk_size: int, dtype: dict | None = None):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    elif ext == ".feather":
+        import pyarrow as pa
+        # Soubor se mapuje do paměti, převádí se vždy jen aktuální výřez
+        reader = pa.ipc.open_file(pa.memory_map(path))
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            for offset in range(0, batch.num_rows, chunk_size):
+                yield batch.slice(offset, chunk_size).to_pandas()
+    else:
+        yield from pd.read_csv(path, encoding="utf-8-sig", chunksize=chunk_size, dtype=dtype)
+
+""" Průběžný zápis datasetu po blocích (CSV, Parquet nebo Feather) """
+class DatasetWriter:
+    def __init__(self, path: str):
+        self.path = path
+        self.ext = os.path.splitext(path)[1].lower()
+        self.rows = 0
+        self._writer = None
+        self._schema = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.ext in (".parquet", ".feather"):
+            self._write_columnar(df)
+        else:
+            first = self.rows == 0
+            df.to_csv(self.path, mode="w" if first else "a", header=first, index=False,
+                      encoding="utf-8-sig" if first else "utf-8")
+        self.rows += len(df)
+
+    def _write_columnar(self, df: pd.DataFrame) -> None:
+        import pyarrow as pa
+        table = pa.Table.from_pandas(optimize_dtypes(df), preserve_index=False)
+        if self._writer is None:
+            self._schema = stream_schema(table.schema, keep_dictionaries=self.ext == ".parquet")
+            if self.ext == ".parquet":
+                import pyarrow.parquet as pq
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            else:
+                self._writer = pa.ipc.new_file(self.path, self._schema)
+        self._writer.write_table(table.cast(self._schema))
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+# Schéma pro zápis po blocích – typy se rozšíří, aby se do nich vešly hodnoty ze všech bloků.
+# Feather (Arrow IPC soubor) neumí mezi bloky měnit slovník, kategorie se proto ukládají jako text.
+def stream_schema(schema, keep_dictionaries: bool):
+    import pyarrow as pa
+    fields = []
+    for field in schema:
+        if pa.types.is_dictionary(field.type):
+            field_type = pa.dictionary(pa.int32(), field.type.value_type) if keep_dictionaries else field.type.value_type
+            field = field.with_type(field_type)
+        elif pa.types.is_integer(field.type) and field.type.bit_width < 32:
+            field = field.with_type(pa.int32())
+        fields.append(field)
+    return pa.schema(fields)
+
+# Jednorázový převod existujících CSV v raw_data/ a datasets/ do zvoleného formátu
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else DATASET_FORMAT
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for folder in ["raw_data", "datasets"]:
+        directory = os.path.join(base_dir, folder)
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(".csv"):
+                continue
+            stem = name[:-4]
+            out_path = dataset_path(directory, stem, target)
+            write_dataset(read_dataset(os.path.join(directory, name)), out_path)
+            print("Převedeno:", os.path.join(folder, name), "->", os.path.basename(out_path))
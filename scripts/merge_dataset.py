@@ -1,40 +1,46 @@
 import pandas as pd
 import os
 
+from dataset_io import dataset_path, read_dataset, resolve_input, write_dataset
+
 # Základní adresář – cesta tam, kde se tento skript nachází
 base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-# Cesty ke vstupním CSV souborům (v adresáři raw_data)
-input_csv1 = os.path.join(base_dir, "raw_data", "auta_autoesa.csv")
-input_csv2 = os.path.join(base_dir, "raw_data", "auta_sauto_cleaned.csv")
+# Cesty ke vstupním souborům (v adresáři raw_data, CSV nebo kolonový formát podle DATASET_FORMAT)
+input_csv1 = resolve_input(os.path.join(base_dir, "raw_data"), "auta_autoesa")
+input_csv2 = resolve_input(os.path.join(base_dir, "raw_data"), "auta_sauto_cleaned")
+
+# Cesta k výstupnímu souboru (v adresáři datasets)
+output_csv = dataset_path(os.path.join(base_dir, "datasets"), "merged_dataset")
 
-# Cesta k výstupnímu CSV souboru (v adresáři datasets)
-output_csv = os.path.join(base_dir, "datasets", "merged_dataset.csv")
+def merge_frames(df1: pd.DataFrame, df2: pd.DataFrame) -> pd.DataFrame:
+    # Přidání sloupce "Zdroj" pro identifikaci původu dat
+    df1 = df1.assign(Zdroj="Autoesa")
+    df2 = df2.assign(Zdroj="Sauto")
 
-# Ověření existence vstupních souborů
-if not os.path.exists(input_csv1):
-    print("Soubor nebyl nalezen:", input_csv1)
-    exit()
-if not os.path.exists(input_csv2):
-    print("Soubor nebyl nalezen:", input_csv2)
-    exit()
+    # Sloučení obou DataFrame
+    merged_df = pd.concat([df1, df2], ignore_index=True)
 
-# Načtení CSV souborů
-df1 = pd.read_csv(input_csv1, encoding="utf-8-sig")
-df2 = pd.read_csv(input_csv2, encoding="utf-8-sig")
-print("Počet záznamů v prvním souboru:", len(df1))
-print("Počet záznamů v druhém souboru:", len(df2))
+    # Seřazení výsledného DataFrame podle sloupce "Cena"
+    return merged_df.sort_values(by="Cena")
 
-# Přidání sloupce "Zdroj" pro identifikaci původu dat
-df1["Zdroj"] = "Autoesa"
-df2["Zdroj"] = "Sauto"
+if __name__ == "__main__":
+    # Ověření existence vstupních souborů
+    if not os.path.exists(input_csv1):
+        print("Soubor nebyl nalezen:", input_csv1)
+        exit()
+    if not os.path.exists(input_csv2):
+        print("Soubor nebyl nalezen:", input_csv2)
+        exit()
 
-# Sloučení obou DataFrame
-merged_df = pd.concat([df1, df2], ignore_index=True)
+    # Načtení vstupních souborů
+    df1 = read_dataset(input_csv1)
+    df2 = read_dataset(input_csv2)
+    print("Počet záznamů v prvním souboru:", len(df1))
+    print("Počet záznamů v druhém souboru:", len(df2))
 
-# Seřazení výsledného DataFrame podle sloupce "Cena"
-merged_df = merged_df.sort_values(by="Cena")
+    merged_df = merge_frames(df1, df2)
 
-# Uložení sloučeného datasetu do výstupního CSV souboru
-merged_df.to_csv(output_csv, index=False, encoding="utf-8-sig")
-print("Sloučený dataset byl uložen do:", os.path.abspath(output_csv))
+    # Uložení sloučeného datasetu do výstupního souboru
+    write_dataset(merged_df, output_csv)
+    print("Sloučený dataset byl uložen do:", os.path.abspath(output_csv))
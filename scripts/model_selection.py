@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.model_selection import KFold, ParameterGrid
+from sklearn.preprocessing import StandardScaler
+
+from dataset_io import read_dataset, resolve_input
+from train_model import (CATEGORICAL_COLUMNS, NUMERIC_COLUMNS, TARGET_COLUMN, dataset_fingerprint, feature_matrix,
+                         fit_encoders, make_model)
+
+# Porovnání rodin modelů (rozhodovací strom, náhodný les, gradient boosting) křížovou validací.
+# Konfigurace × foldy běží v poolu procesů. Rozdělení na foldy a předzpracované matice se ukládají
+# do cache (datasets/.model_selection/<klíč>/) a workery je čtou přes memory-map.
+# Výsledek: MAE/MAPE vedle času tréninku a latence predikce (jeden řádek, dávka).
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+cache_root = os.path.join(base_dir, "datasets", ".model_selection")
+
+CV_FOLDS = int(os.getenv("CV_FOLDS", "3"))
+RANDOM_STATE = int(os.getenv("RANDOM_STATE", "42"))
+SELECTION_WORKERS = int(os.getenv("SELECTION_WORKERS", "0")) or os.cpu_count()
+SELECTION_FAMILIES = os.getenv("SELECTION_FAMILIES", "dt,rf,gb,hist").split(",")
+# Kompromis přesnost/latence: nejrychlejší model, jehož MAPE je nejvýše o tolik % horší než nejlepší
+TRADEOFF_TOLERANCE = float(os.getenv("TRADEOFF_TOLERANCE", "5"))
+BATCH_ROWS = 10000
+
+SEARCH_GRIDS = {
+    "dt": {"max_depth": [8, 12, 16, None], "min_samples_leaf": [1, 3, 10]},
+    "rf": {"n_estimators": [100, 200], "min_samples_leaf": [1, 3]},
+    "gb": {"n_estimators": [200, 400], "max_depth": [3, 5]},
+    "hist": {"max_iter": [200, 400], "max_leaf_nodes": [15, 31, 63]},
+}
+
+""" Foldy a matice pro každý fold (číselné sloupce škálované scalerem naučeným jen na trénovací části) """
+def prepare_cache(input_path: str, folds: int = CV_FOLDS) -> str:
+    key = hashlib.sha256(f"{dataset_fingerprint(input_path)}|{folds}|{RANDOM_STATE}".encode("ascii")).hexdigest()[:16]
+    cache_dir = os.path.join(cache_root, key)
+    if os.path.exists(os.path.join(cache_dir, "X_folds.npy")):
+        return cache_dir
+
+    df = read_dataset(input_path).dropna(subset=CATEGORICAL_COLUMNS + NUMERIC_COLUMNS + [TARGET_COLUMN])
+    X = feature_matrix(df, fit_encoders(df))
+    y = df[TARGET_COLUMN].to_numpy(dtype=float)
+    fold_of_row = np.empty(len(y), dtype=np.int8)
+    X_folds = np.empty((folds,) + X.shape)
+    numeric = slice(len(CATEGORICAL_COLUMNS), None)
+    for fold, (train_idx, test_idx) in enumerate(KFold(folds, shuffle=True, random_state=RANDOM_STATE).split(X)):
+        fold_of_row[test_idx] = fold
+        scaler = StandardScaler().fit(X[train_idx, numeric])
+        X_folds[fold] = X
+        X_folds[fold][:, numeric] = scaler.transform(X[:, numeric])
+
+    os.makedirs(cache_dir, exist_ok=True)
+    np.save(os.path.join(cache_dir, "y.npy"), y)
+    np.save(os.path.join(cache_dir, "fold_of_row.npy"), fold_of_row)
+    # X_folds se ukládá poslední – jeho existence znamená kompletní cache
+    np.save(os.path.join(cache_dir, "X_folds.npy"), X_folds)
+    return cache_dir
+
+_cache = {}
+
+def load_cache(cache_dir: str) -> None:
+    _cache["X_folds"] = np.load(os.path.join(cache_dir, "X_folds.npy"), mmap_mode="r")
+    _cache["y"] = np.load(os.path.join(cache_dir, "y.npy"))
+    _cache["fold_of_row"] = np.load(os.path.join(cache_dir, "fold_of_row.npy"))
+
+def fold_data(fold: int) -> tuple:
+    X, y, fold_of_row = _cache["X_folds"][fold], _cache["y"], _cache["fold_of_row"]
+    train, test = fold_of_row != fold, fold_of_row == fold
+    return X[train], y[train], X[test], y[test]
+
+""" Jedna úloha poolu: natrénuje konfiguraci na jednom foldu – vrací absolutní a relativní chyby a čas """
+def evaluate(family: str, params: dict, fold: int) -> tuple:
+    X_train, y_train, X_test, y_test = fold_data(fold)
+    model = make_model(family, 1, **params)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    errors = np.abs(y_test - model.predict(X_test))
+    return family, params, errors.sum(), (errors / y_test).sum(), len(y_test), fit_seconds
+
+""" Latence natrénovaného modelu: medián jednoho řádku (ms) a dávka BATCH_ROWS řádků (µs na řádek) """
+def measure_latency(model, X: np.ndarray, repeats: int = 200) -> tuple[float, float]:
+    single = []
+    for i in range(repeats):
+        row = X[i % len(X):i % len(X) + 1]
+        start = time.perf_counter()
+        model.predict(row)
+        single.append(time.perf_counter() - start)
+    batch = np.resize(X, (BATCH_ROWS, X.shape[1]))
+    start = time.perf_counter()
+    model.predict(batch)
+    return float(np.median(single) * 1000), (time.perf_counter() - start) / BATCH_ROWS * 1e6
+
+def run_selection(input_path: str, families: list[str] = SELECTION_FAMILIES) -> list[dict]:
+    cache_dir = prepare_cache(input_path)
+    tasks = [(family, params, fold) for family in families for params in ParameterGrid(SEARCH_GRIDS[family])
+             for fold in range(CV_FOLDS)]
+
+    scores = {}
+    with ProcessPoolExecutor(SELECTION_WORKERS, initializer=load_cache, initargs=(cache_dir,)) as pool:
+        futures = [pool.submit(evaluate, *task) for task in tasks]
+        for future in futures:
+            family, params, abs_sum, rel_sum, rows, fit_seconds = future.result()
+            score = scores.setdefault((family, json.dumps(params, sort_keys=True)), [0.0, 0.0, 0, 0.0])
+            score[0] += abs_sum
+            score[1] += rel_sum
+            score[2] += rows
+            score[3] += fit_seconds / CV_FOLDS
+
+    # Nejlepší konfigurace každé rodiny (podle MAPE) se znovu natrénuje na foldu 0 kvůli měření latence
+    load_cache(cache_dir)
+    X_train, y_train, X_test, _ = fold_data(0)
+    report = []
+    for family in families:
+        (_, params_key), (abs_sum, rel_sum, rows, fit_seconds) = min(
+            ((key, score) for key, score in scores.items() if key[0] == family), key=lambda item: item[1][1] / item[1][2])
+        params = json.loads(params_key)
+        model = make_model(family, 1, **params).fit(X_train, y_train)
+        single_ms, batch_us = measure_latency(model, np.ascontiguousarray(X_test))
+        report.append({
+            "family": family, "params": params,
+            "mae": abs_sum / rows, "mape": rel_sum / rows * 100, "fit_seconds": fit_seconds,
+            "single_ms": single_ms, "batch_us_per_row": batch_us,
+        })
+    return report
+
+if __name__ == "__main__":
+    input_path = sys.argv[1] if len(sys.argv) > 1 else resolve_input(os.path.join(base_dir, "datasets"), "final_dataset")
+    start = time.perf_counter()
+    report = sorted(run_selection(input_path), key=lambda r: r["mape"])
+    print(f"Křížová validace ({CV_FOLDS} foldy, {SELECTION_WORKERS} procesů) za {time.perf_counter() - start:.1f} s\n")
+    print(f"{'rodina':<6} {'MAE Kč':>10} {'MAPE %':>7} {'fit s':>7} {'1 řádek ms':>11} {'dávka µs/ř':>11}  parametry")
+    for r in report:
+        print(f"{r['family']:<6} {r['mae']:>10,.0f} {r['mape']:>7.2f} {r['fit_seconds']:>7.2f} "
+              f"{r['single_ms']:>11.3f} {r['batch_us_per_row']:>11.2f}  {json.dumps(r['params'])}")
+
+    best = report[0]
+    candidates = [r for r in report if r["mape"] <= best["mape"] * (1 + TRADEOFF_TOLERANCE / 100)]
+    tradeoff = min(candidates, key=lambda r: r["single_ms"])
+    print(f"\nNejpřesnější: {best['family']}. Kompromis (MAPE do +{TRADEOFF_TOLERANCE:g} %, nejnižší latence): {tradeoff['family']}")
+    print(f"Nasazení: MODEL_TYPE={tradeoff['family']} MODEL_PARAMS='{json.dumps(tradeoff['params'])}' "
+          f"python scripts/train_model.py")
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+from catalog_index import build_catalog, catalog_path, write_catalog
+from convert_volume_units import convert_volumes
+from dataset_cleaning import clean_frame
+from dataset_io import DATASET_FORMAT, dataset_path, read_dataset, resolve_input, write_dataset
+from merge_dataset import merge_frames
+
+# Jednotný běh převodu objemu, sloučení a čištění v jednom procesu.
+# Výstup každého kroku se předává dál v paměti a zároveň ukládá na disk jako cache.
+# Krok, jehož otisk (kód, nastavení a otisky vstupů) se nezměnil, se přeskočí.
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+scripts_dir = os.path.join(base_dir, "scripts")
+raw_dir = os.path.join(base_dir, "raw_data")
+datasets_dir = os.path.join(base_dir, "datasets")
+cache_path = os.path.join(datasets_dir, ".pipeline_cache.json")
+
+def emit_catalog(df, path: str) -> None:
+    write_catalog(build_catalog(df), path)
+
+# Vstup kroku je buď soubor ("file", adresář, název) nebo výstup dřívějšího kroku ("stage", název)
+STAGES = [
+    {
+        "name": "convert",
+        "inputs": [("file", raw_dir, "auta_sauto")],
+        "func": convert_volumes,
+        "output": dataset_path(raw_dir, "auta_sauto_cleaned"),
+        "code": ["convert_volume_units.py", "dataset_io.py"],
+        "params": {"format": DATASET_FORMAT},
+    },
+    {
+        "name": "merge",
+        "inputs": [("file", raw_dir, "auta_autoesa"), ("stage", "convert")],
+        "func": merge_frames,
+        "output": dataset_path(datasets_dir, "merged_dataset"),
+        "code": ["merge_dataset.py", "dataset_io.py"],
+        "params": {"format": DATASET_FORMAT},
+    },
+    {
+        "name": "clean",
+        "inputs": [("stage", "merge")],
+        "func": clean_frame,
+        "output": dataset_path(datasets_dir, "final_dataset"),
+        # Vedlejší výstupy (cesta, funkce) se odvozují z výstupu kroku – katalog pro aplikaci
+        "side_outputs": [(catalog_path, emit_catalog)],
+        "code": ["dataset_cleaning.py", "dataset_io.py", "catalog_index.py"],
+        # Stáří vozu se počítá z aktuálního roku, s novým rokem se proto výstup musí přepočítat
+        "params": {"format": DATASET_FORMAT, "year": datetime.now().year},
+    },
+]
+
+def file_fingerprint(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def stage_fingerprint(stage: dict, input_fingerprints: list[str]) -> str:
+    h = hashlib.sha256(stage["name"].encode("utf-8"))
+    for name in stage["code"]:
+        h.update(file_fingerprint(os.path.join(scripts_dir, name)).encode("ascii"))
+    h.update(json.dumps(stage["params"], sort_keys=True).encode("utf-8"))
+    for fingerprint in input_fingerprints:
+        h.update(fingerprint.encode("ascii"))
+    return h.hexdigest()
+
+def load_cache() -> dict:
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache: dict) -> None:
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2, ensure_ascii=False)
+
+def run_pipeline(force: bool = False) -> list[tuple]:
+    cache = load_cache()
+    outputs = {stage["name"]: stage["output"] for stage in STAGES}
+    fingerprints = {}
+    frames = {}
+    report = []
+    for stage in STAGES:
+        name = stage["name"]
+        # Otisky souborových vstupů se počítají z obsahu, vstupy z kroků přebírají otisk daného kroku
+        input_paths = []
+        input_fingerprints = []
+        for source in stage["inputs"]:
+            if source[0] == "file":
+                path = resolve_input(source[1], source[2])
+                input_paths.append(path)
+                input_fingerprints.append(file_fingerprint(path))
+            else:
+                input_paths.append(source[1])
+                input_fingerprints.append(fingerprints[source[1]])
+        fingerprint = stage_fingerprint(stage, input_fingerprints)
+        fingerprints[name] = fingerprint
+
+        cached = cache.get(name)
+        side_outputs = stage.get("side_outputs", [])
+        outputs_exist = all(os.path.exists(path) for path in [stage["output"]] + [p for p, _ in side_outputs])
+        if not force and cached and cached["fingerprint"] == fingerprint and outputs_exist:
+            report.append((name, "cache", 0.0, cached["rows_in"], cached["rows_out"]))
+            continue
+
+        start = time.perf_counter()
+        args = []
+        for source, path in zip(stage["inputs"], input_paths):
+            if source[0] == "file":
+                args.append(read_dataset(path))
+            elif path in frames:
+                args.append(frames[path])
+            else:
+                # Předchozí krok byl přeskočen – jeho výstup se načte z cache na disku
+                args.append(read_dataset(outputs[path]))
+        rows_in = sum(len(df) for df in args)
+        df = stage["func"](*args)
+        write_dataset(df, stage["output"])
+        for path, emit in side_outputs:
+            emit(df, path)
+        elapsed = time.perf_counter() - start
+
+        frames[name] = df
+        cache[name] = {"fingerprint": fingerprint, "rows_in": rows_in, "rows_out": len(df),
+                       "output": os.path.relpath(stage["output"], base_dir)}
+        save_cache(cache)
+        report.append((name, "spuštěn", elapsed, rows_in, len(df)))
+    return report
+
+if __name__ == "__main__":
+    total_start = time.perf_counter()
+    report = run_pipeline(force="--force" in sys.argv)
+    print(f"{'krok':<10} {'stav':<9} {'čas s':>8} {'řádků vstup':>12} {'řádků výstup':>13}")
+    for name, status, elapsed, rows_in, rows_out in report:
+        print(f"{name:<10} {status:<9} {elapsed:>8.2f} {rows_in:>12} {rows_out:>13}")
+    print(f"Celkem {time.perf_counter() - total_start:.2f} s")
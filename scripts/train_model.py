@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import sys
+import time
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import GradientBoostingRegressor, HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+from sklearn.tree import DecisionTreeRegressor
+from threadpoolctl import threadpool_limits
+
+from dataset_io import read_dataset, resolve_input
+
+# Trénink modelu pro aplikaci – ze final_dataset vytvoří encoders.pkl, scaler.pkl a gb_model.pkl
+# ve stejném pořadí příznaků, jaké používá predikce (4 kategorie, pak 4 škálovaná čísla).
+# Každý běh se uloží do models/versions/<verze>/ s metadata.json a pak se zveřejní do models/.
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+models_dir = os.getenv("MODEL_DIR", os.path.join(base_dir, "models"))
+
+CATEGORICAL_COLUMNS = ["Značka", "Model", "Palivo", "Převodovka"]
+NUMERIC_COLUMNS = ["Objem (l)", "Najeté km", "Výkon (kW)", "Stari"]
+TARGET_COLUMN = "Cena"
+
+# gb = GradientBoostingRegressor (jedno vlákno), hist = HistGradientBoostingRegressor (více vláken přes OpenMP),
+# rf = RandomForestRegressor (n_jobs), dt = DecisionTreeRegressor. Výběr rodiny: scripts/model_selection.py
+MODEL_TYPE = os.getenv("MODEL_TYPE", "gb")
+TRAIN_THREADS = int(os.getenv("TRAIN_THREADS", "0")) or os.cpu_count()
+TEST_SIZE = float(os.getenv("TEST_SIZE", "0.2"))
+RANDOM_STATE = int(os.getenv("RANDOM_STATE", "42"))
+# Kvantily pro interval ceny (dolní, medián, horní) – samostatné modely s kvantilovou ztrátou, "" = bez intervalu.
+# Podporují je jen rodiny gb a hist, ostatní se trénují bez intervalu.
+QUANTILES = [float(q) for q in os.getenv("QUANTILES", "0.1,0.5,0.9").split(",") if q.strip()]
+QUANTILE_FAMILIES = ("gb", "hist")
+# Přepsání výchozích parametrů jako JSON, např. MODEL_PARAMS='{"max_depth": 5}' (vypisuje model_selection.py)
+PARAM_OVERRIDES = json.loads(os.getenv("MODEL_PARAMS", "{}"))
+
+MODEL_CLASSES = {
+    "dt": DecisionTreeRegressor,
+    "rf": RandomForestRegressor,
+    "gb": GradientBoostingRegressor,
+    "hist": HistGradientBoostingRegressor,
+}
+MODEL_PARAMS = {
+    "dt": {"max_depth": 12, "min_samples_leaf": 3, "random_state": RANDOM_STATE},
+    "rf": {"n_estimators": 200, "min_samples_leaf": 1, "random_state": RANDOM_STATE},
+    "gb": {"n_estimators": 300, "learning_rate": 0.1, "max_depth": 4, "random_state": RANDOM_STATE},
+    "hist": {"max_iter": 300, "learning_rate": 0.1, "max_leaf_nodes": 31, "random_state": RANDOM_STATE},
+}
+
+def make_model(model_type: str = MODEL_TYPE, threads: int = 1, **params):
+    if model_type not in MODEL_CLASSES:
+        raise ValueError(f"Neznámý MODEL_TYPE: {model_type} (povoleno: {', '.join(MODEL_CLASSES)})")
+    model = MODEL_CLASSES[model_type](**{**MODEL_PARAMS[model_type], **params})
+    # Náhodný les paralelizuje přes joblib (n_jobs), ostatní rodiny přes OpenMP (threadpool_limits)
+    if "n_jobs" in model.get_params():
+        model.set_params(n_jobs=threads)
+    return model
+
+def make_quantile_model(model_type: str, quantile: float, threads: int = 1, **params):
+    if model_type == "gb":
+        return make_model("gb", threads, **{**params, "loss": "quantile", "alpha": quantile})
+    if model_type == "hist":
+        return make_model("hist", threads, **{**params, "loss": "quantile", "quantile": quantile})
+    raise ValueError(f"Rodina {model_type} nepodporuje kvantilové modely (povoleno: gb, hist)")
+
+""" Encodery se učí na celém datasetu – aplikace nabízí všechny značky a modely z katalogu """
+def fit_encoders(df: pd.DataFrame) -> dict:
+    return {col: LabelEncoder().fit(df[col].astype(str)) for col in CATEGORICAL_COLUMNS}
+
+""" Matice příznaků v pořadí predikce – kódy kategorií a (zatím neškálovaná) čísla """
+def feature_matrix(df: pd.DataFrame, encoders: dict) -> np.ndarray:
+    features = np.empty((len(df), len(CATEGORICAL_COLUMNS) + len(NUMERIC_COLUMNS)), dtype=float)
+    for i, col in enumerate(CATEGORICAL_COLUMNS):
+        features[:, i] = encoders[col].transform(df[col].astype(str))
+    features[:, len(CATEGORICAL_COLUMNS):] = df[NUMERIC_COLUMNS].to_numpy(dtype=float)
+    return features
+
+def dataset_fingerprint(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+""" Jedinečná verze modelu – čas s mikrosekundami a krátký hash natrénovaných modelů (dva běhy v téže sekundě se liší) """
+def model_version(model, quantile_models: list, now: datetime) -> str:
+    digest = hashlib.sha256(pickle.dumps((model, quantile_models), protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()[:8]
+    return f"{now:%Y%m%d-%H%M%S-%f}-{digest}"
+
+def regression_metrics(y_true: np.ndarray, y_pred: np.ndarray) -> dict:
+    errors = np.abs(y_true - y_pred)
+    return {"mae": round(float(errors.mean()), 2), "mape": round(float((errors / y_true).mean() * 100), 3)}
+
+def train(df: pd.DataFrame, model_type: str = MODEL_TYPE, threads: int = TRAIN_THREADS,
+          params: dict = PARAM_OVERRIDES, quantiles: list[float] = QUANTILES) -> tuple:
+    if quantiles and (len(quantiles) != 3 or sorted(quantiles) != quantiles or not 0 < quantiles[0] < quantiles[2] < 1):
+        raise ValueError(f"QUANTILES musí být tři rostoucí hodnoty mezi 0 a 1, zadáno: {quantiles}")
+    df = df.dropna(subset=CATEGORICAL_COLUMNS + NUMERIC_COLUMNS + [TARGET_COLUMN])
+    encoders = fit_encoders(df)
+    features = feature_matrix(df, encoders)
+    target = df[TARGET_COLUMN].to_numpy(dtype=float)
+    X_train, X_test, y_train, y_test = train_test_split(features, target, test_size=TEST_SIZE,
+                                                        random_state=RANDOM_STATE)
+
+    # Škálují se jen číselné sloupce, stejně jako v predikci (scaler.transform na sloupcích 4–7)
+    scaler = StandardScaler().fit(X_train[:, len(CATEGORICAL_COLUMNS):])
+    for X in (X_train, X_test):
+        X[:, len(CATEGORICAL_COLUMNS):] = scaler.transform(X[:, len(CATEGORICAL_COLUMNS):])
+
+    model = make_model(model_type, threads, **params)
+    with threadpool_limits(limits=threads):
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - start
+
+    stats = {
+        "rows": len(df),
+        "train_rows": len(X_train),
+        "fit_seconds": round(fit_seconds, 3),
+        "test": regression_metrics(y_test, model.predict(X_test)),
+    }
+
+    if model_type not in QUANTILE_FAMILIES:
+        quantiles = []
+    quantile_models = [make_quantile_model(model_type, q, threads, **params) for q in quantiles]
+    if quantile_models:
+        with threadpool_limits(limits=threads):
+            start = time.perf_counter()
+            for quantile_model in quantile_models:
+                quantile_model.fit(X_train, y_train)
+            stats["quantile_fit_seconds"] = round(time.perf_counter() - start, 3)
+        low, _, high = np.sort(np.column_stack([m.predict(X_test) for m in quantile_models]), axis=1).T
+        stats["interval"] = {
+            "quantiles": quantiles,
+            # Podíl testovacích cen uvnitř intervalu – u kvantilů 0.1/0.9 by měl být kolem 80 %
+            "coverage": round(float(((y_test >= low) & (y_test <= high)).mean()), 4),
+            "mean_width": round(float((high - low).mean()), 2),
+        }
+    return encoders, scaler, model, quantile_models, stats
+
+""" Uložení verze (formáty podle predictor.ARTIFACT_FORMATS) a její zveřejnění do models/ """
+def save_version(encoders: dict, scaler, model, quantile_models: list, metadata: dict, folder: str = models_dir) -> str:
+    version_dir = os.path.join(folder, "versions", metadata["version"])
+    os.makedirs(version_dir, exist_ok=True)
+    with open(os.path.join(version_dir, "encoders.pkl"), "wb") as f:
+        pickle.dump(encoders, f)
+    with open(os.path.join(version_dir, "scaler.pkl"), "wb") as f:
+        pickle.dump(scaler, f)
+    joblib.dump(model, os.path.join(version_dir, "gb_model.pkl"))
+    artifacts = ["encoders.pkl", "scaler.pkl", "gb_model.pkl"]
+    if quantile_models:
+        joblib.dump(quantile_models, os.path.join(version_dir, "quantile_models.pkl"))
+        artifacts.append("quantile_models.pkl")
+    with open(os.path.join(version_dir, "metadata.json"), "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2, ensure_ascii=False)
+
+    # Zveřejnění přes dočasné kopie a os.replace – aplikace nikdy nenačte napůl přepsané soubory.
+    # metadata.json se přepisuje poslední, jeho verze tak odpovídá zveřejněným artefaktům.
+    # Verze bez kvantilů nesmí ponechat kvantilové modely z předchozí verze.
+    if not quantile_models and os.path.exists(os.path.join(folder, "quantile_models.pkl")):
+        os.remove(os.path.join(folder, "quantile_models.pkl"))
+    for name in artifacts + ["metadata.json"]:
+        tmp_path = os.path.join(folder, name + ".tmp")
+        shutil.copyfile(os.path.join(version_dir, name), tmp_path)
+        os.replace(tmp_path, os.path.join(folder, name))
+    return version_dir
+
+if __name__ == "__main__":
+    input_path = sys.argv[1] if len(sys.argv) > 1 else resolve_input(os.path.join(base_dir, "datasets"), "final_dataset")
+    df = read_dataset(input_path)
+    encoders, scaler, model, quantile_models, stats = train(df)
+
+    now = datetime.now()
+    metadata = {
+        "version": model_version(model, quantile_models, now),
+        "created": now.isoformat(timespec="seconds"),
+        "dataset": os.path.relpath(input_path, base_dir),
+        "dataset_sha256": dataset_fingerprint(input_path),
+        "model_type": MODEL_TYPE,
+        "params": {**MODEL_PARAMS[MODEL_TYPE], **PARAM_OVERRIDES},
+        "threads": TRAIN_THREADS,
+        "features": CATEGORICAL_COLUMNS + NUMERIC_COLUMNS,
+        "sklearn": sklearn.__version__,
+        **stats,
+    }
+    version_dir = save_version(encoders, scaler, model, quantile_models, metadata)
+    print(f"Model {MODEL_TYPE} natrénován na {stats['train_rows']} z {stats['rows']} řádků za {stats['fit_seconds']:.2f} s "
+          f"({stats['train_rows'] / stats['fit_seconds']:,.0f} řádků/s, vláken {TRAIN_THREADS})")
+    print(f"Test: MAE {stats['test']['mae']:,.0f} Kč, MAPE {stats['test']['mape']:.1f} %")
+    if quantile_models:
+        interval = stats["interval"]
+        print(f"Interval {interval['quantiles'][0]:g}–{interval['quantiles'][2]:g}: pokrytí {interval['coverage']:.1%}, "
+              f"průměrná šířka {interval['mean_width']:,.0f} Kč (kvantilové modely za {stats['quantile_fit_seconds']:.2f} s)")
+    print(f"Verze {metadata['version']} uložena do {version_dir} a zveřejněna do {models_dir}")
@@ -1,13 +1,13 @@
 import tkinter as tk
 from tkinter import ttk
-import pickle
-import numpy as np
 import os
-import pandas as pd
 import unicodedata
 from datetime import datetime
 import logging
-import joblib
+import queue
+import sys
+import threading
+import time
 
 # 1) Nastavení logování
 base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -28,49 +28,63 @@ def remove_diacritics(s: str) -> str:
 def remove_hyphens(s: str) -> str:
     return s.replace("-", "")
 
-# 3) Načtení datasetu
-dataset_path = os.path.join(base_dir, "datasets", "final_dataset.csv")
-model_folder = os.path.join(base_dir, "models")
-
-try:
-    df = pd.read_csv(dataset_path, encoding="utf-8-sig")
-except Exception as e:
-    logging.error(f"Chyba při načítání datasetu: {e}")
-    df = pd.DataFrame()
-
-if df.empty or "Značka" not in df.columns:
-    logging.error("Dataset je prázdný nebo neobsahuje očekávané sloupce.")
-    brands = []
-    brand_models = {}
-    fuel_options = []
-    trans_options = []
-else:
-    brands = sorted(df["Značka"].dropna().unique().tolist())
-    brand_models = {brand: sorted(df[df["Značka"] == brand]["Model"].dropna().unique().tolist()) for brand in brands}
-    fuel_options = sorted(df["Palivo"].dropna().unique().tolist())
-    trans_options = sorted(df["Převodovka"].dropna().unique().tolist())
-
-# 4) Načtení modelu, scaleru a encoderů
-def load_pickle_or_joblib(path):
+# 3) Načítání katalogu a modelu na pozadí – okno se zobrazí hned, těžké knihovny (pandas, sklearn)
+#    se importují až ve vlákně. Tk není thread-safe, výsledky si proto hlavní vlákno vyzvedává z fronty.
+sys.path.insert(0, os.path.join(base_dir, "scripts"))
+from catalog_index import catalog_path, load_catalog
+
+model_folder = os.getenv("MODEL_DIR", os.path.join(base_dir, "models"))
+brand_models = {}
+predictor = None
+load_queue = queue.Queue()
+
+def load_resources():
+    start = time.perf_counter()
+    try:
+        load_queue.put(("catalog", load_catalog(catalog_path)))
+    except Exception as e:
+        logging.error(f"Chyba při načítání katalogu (spusťte čištění datasetu): {e}")
+        load_queue.put(("catalog", {"brands": {}, "fuels": [], "transmissions": []}))
+
+    # Predikce – přímo přes Predictor, nebo přes běžící službu (PREDICTION_SERVICE_URL)
     try:
-        with open(path, "rb") as f:
-            return pickle.load(f)
-    except Exception:
-        try:
-            return joblib.load(path)
-        except Exception as e:
-            logging.error(f"Chyba při načítání souboru {path}: {e}")
-            return None
-
-encoders = load_pickle_or_joblib(os.path.join(model_folder, "encoders.pkl"))
-scaler = load_pickle_or_joblib(os.path.join(model_folder, "scaler.pkl"))
-gb_model = load_pickle_or_joblib(os.path.join(model_folder, "gb_model.pkl"))
-
-# 5) GUI callbacky
+        service_url = os.getenv("PREDICTION_SERVICE_URL")
+        if service_url:
+            from prediction_service import ServiceClient
+            load_queue.put(("predictor", ServiceClient(service_url)))
+        else:
+            from prediction_cache import with_cache
+            from predictor import Predictor
+            load_queue.put(("predictor", with_cache(Predictor(model_folder))))
+        logging.info(f"Katalog a model načteny za {time.perf_counter() - start:.2f} s.")
+    except Exception as e:
+        logging.error(f"Chyba při načítání modelu: {e}")
+        load_queue.put(("error", str(e)))
+
+def poll_loading():
+    global brand_models, predictor
+    while not load_queue.empty():
+        kind, value = load_queue.get_nowait()
+        if kind == "catalog":
+            brand_models = value["brands"]
+            brand_combo['values'] = list(brand_models)
+            fuel_combo['values'] = value["fuels"]
+            trans_combo['values'] = value["transmissions"]
+        elif kind == "predictor":
+            predictor = value
+            predict_button.config(state="normal")
+            status_label.config(text="Model připraven.")
+            return
+        else:
+            status_label.config(text=f"Chyba při načítání modelu: {value}")
+            return
+    root.after(50, poll_loading)
+
+# 4) GUI callbacky
 def update_car_models(event):
     selected_brand = brand_var.get()
-    models = brand_models.get(selected_brand, [])
-    car_model_combo['values'] = models
+    models = brand_models.get(selected_brand, {})
+    car_model_combo['values'] = list(models)
     car_model_var.set("")
     volume_combo['values'] = []
     volume_var.set("")
@@ -78,12 +92,11 @@ def update_car_models(event):
 def update_volumes(event):
     selected_brand = brand_var.get()
     selected_model = car_model_var.get()
-    subset = df[(df["Značka"] == selected_brand) & (df["Model"] == selected_model)]
-    volumes = sorted(subset["Objem (l)"].dropna().unique().tolist())
+    volumes = brand_models.get(selected_brand, {}).get(selected_model, [])
     volume_combo['values'] = [str(v) for v in volumes]
     volume_var.set("")
 
-# 6) Funkce pro predikci
+# 5) Funkce pro predikci
 def predict():
     selected_brand = brand_var.get()
     selected_model = car_model_var.get()
@@ -95,49 +108,35 @@ def predict():
         result_label.config(text="Chyba: Vyplňte prosím všechna pole.")
         return
 
-    try:
-        brand_encoded = encoders["Značka"].transform([selected_brand])[0]
-        model_encoded = encoders["Model"].transform([selected_model])[0]
-        fuel_encoded = encoders["Palivo"].transform([selected_fuel])[0]
-        trans_encoded = encoders["Převodovka"].transform([selected_trans])[0]
-
-        volume_val = float(selected_volume_str)
-        mileage_val = float(mileage_entry.get())
-        power_val = float(power_entry.get())
-        age_val = float(age_entry.get())
-
-        if any(x < 0 for x in [volume_val, mileage_val, power_val, age_val]):
-            result_label.config(text="Chyba: Zadejte pouze nezáporné hodnoty.")
-            return
-        if mileage_val > 600000 or not (0.5 <= volume_val <= 8.0) or not (20 <= power_val <= 800) or age_val > 50:
-            result_label.config(text="Chyba: Zkontrolujte rozsah hodnot.")
-            return
-    except ValueError:
-        result_label.config(text="Chyba: Zadejte platné číselné hodnoty.")
-        return
-
-    input_features = np.array([[brand_encoded, model_encoded, fuel_encoded, trans_encoded,
-                                volume_val, mileage_val, power_val, age_val]], dtype=float)
-
-    logging.info(f"Vstup před škálováním: {input_features.tolist()}")
-
-    if scaler:
-        input_features[:, [4, 5, 6, 7]] = scaler.transform(input_features[:, [4, 5, 6, 7]])
-
-    logging.info(f"Vstup po škálování: {input_features.tolist()}")
+    record = {
+        "Značka": selected_brand,
+        "Model": selected_model,
+        "Palivo": selected_fuel,
+        "Převodovka": selected_trans,
+        "Objem (l)": selected_volume_str,
+        "Najeté km": mileage_entry.get(),
+        "Výkon (kW)": power_entry.get(),
+        "Stari": age_entry.get(),
+    }
+    logging.info(f"Vstup: {record}")
 
     try:
-        prediction = gb_model.predict(input_features)
-        pred_price = float(prediction.flatten()[0])
-        if pred_price < 0:
-            result_label.config(text="Chyba: Výstupní cena je záporná.")
-        else:
-            result_label.config(text=f"Predikovaná cena: {pred_price:,.2f} Kč")
-            logging.info(f"Výstup: {pred_price:.2f} Kč")
+        pred_price, error, interval = predictor.predict_one(record)
     except Exception as e:
         result_label.config(text=f"Chyba při predikci: {e}")
+        return
 
-# 7) GUI aplikace
+    if error:
+        result_label.config(text=f"Chyba: {error}")
+    else:
+        text = f"Predikovaná cena: {pred_price:,.2f} Kč"
+        if interval:
+            low, median, high = interval
+            text += f"\nRozmezí: {low:,.0f} – {high:,.0f} Kč (medián {median:,.0f} Kč)"
+        result_label.config(text=text)
+        logging.info(f"Výstup: {pred_price:.2f} Kč, interval: {interval}")
+
+# 6) GUI aplikace
 root = tk.Tk()
 root.title("Předpověď ceny auta (Gradient Boosting)")
 root.state("zoomed")
@@ -163,7 +162,6 @@ def add_row(label_text, variable, widget, row):
 
 add_row("Značka:", brand_var := tk.StringVar(),
         brand_combo := ttk.Combobox(frame, textvariable=brand_var, state="readonly", width=24), 1)
-brand_combo['values'] = brands
 brand_combo.bind("<<ComboboxSelected>>", update_car_models)
 
 add_row("Model:", car_model_var := tk.StringVar(),
@@ -178,11 +176,9 @@ add_row("Najeté km:", tk.StringVar(),
 
 add_row("Palivo:", fuel_var := tk.StringVar(),
         fuel_combo := ttk.Combobox(frame, textvariable=fuel_var, state="readonly", width=24), 5)
-fuel_combo['values'] = fuel_options
 
 add_row("Převodovka:", trans_var := tk.StringVar(),
         trans_combo := ttk.Combobox(frame, textvariable=trans_var, state="readonly", width=24), 6)
-trans_combo['values'] = trans_options
 
 add_row("Výkon (kW):", tk.StringVar(),
         power_entry := ttk.Entry(frame, width=26), 7)
@@ -190,7 +186,8 @@ add_row("Výkon (kW):", tk.StringVar(),
 add_row("Stáří (roky):", tk.StringVar(),
         age_entry := ttk.Entry(frame, width=26), 8)
 
-ttk.Button(frame, text="🔍 Predikovat cenu", command=predict).grid(row=9, column=0, columnspan=2, pady=(25, 15))
+predict_button = ttk.Button(frame, text="🔍 Predikovat cenu", command=predict, state="disabled")
+predict_button.grid(row=9, column=0, columnspan=2, pady=(25, 15))
 
 result_label = ttk.Label(frame, text="Výsledek predikce se zobrazí zde.", font=("Helvetica", 16, "italic"), foreground="#111111")
 result_label.grid(row=10, column=0, columnspan=2, pady=(5, 25))
@@ -198,4 +195,9 @@ result_label.grid(row=10, column=0, columnspan=2, pady=(5, 25))
 exit_button = ttk.Button(frame, text="❌ Ukončit", command=root.destroy)
 exit_button.grid(row=11, column=0, columnspan=2, pady=(0, 15))
 
+status_label = ttk.Label(frame, text="Načítám katalog a model…", font=("Helvetica", 11), foreground="#555555")
+status_label.grid(row=12, column=0, columnspan=2)
+
+threading.Thread(target=load_resources, name="loader", daemon=True).start()
+root.after(50, poll_loading)
 root.mainloop()
@@ -0,0 +1,41 @@
+import os
+import sys
+import time
+
+# Dávková predikce cen bez GUI – stejné kódování, škálování a validační rozsahy jako v aplikaci.
+# Použití: python src/batch_predict.py vstup.csv|.parquet vystup.csv|.parquet
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(base_dir, "scripts"))
+from dataset_io import DatasetWriter, iter_dataset_chunks
+from predictor import CATEGORICAL_COLUMNS, ERROR_COLUMN, Predictor
+
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "100000"))
+# Sloupce intervalu ceny – kvantilové modely zhruba čtyřnásobí čas predikce, proto jen na vyžádání
+BATCH_INTERVALS = os.getenv("BATCH_INTERVALS", "0") == "1"
+
+""" Predikce celého souboru po dávkách – paměť je omezená velikostí dávky, ne velikostí vstupu """
+def predict_file(input_path: str, output_path: str, batch_size: int = BATCH_SIZE,
+                 intervals: bool = BATCH_INTERVALS) -> tuple[int, int, float]:
+    predictor = Predictor(intervals=intervals)
+    start = time.perf_counter()
+    writer = DatasetWriter(output_path)
+    rows = failed = 0
+    try:
+        for chunk in iter_dataset_chunks(input_path, batch_size, dtype={col: str for col in CATEGORICAL_COLUMNS}):
+            result = predictor.predict_frame(chunk)
+            writer.write(result)
+            rows += len(result)
+            failed += int((result[ERROR_COLUMN] != "").sum())
+    finally:
+        writer.close()
+    return rows, failed, time.perf_counter() - start
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Použití: python src/batch_predict.py vstup.csv vystup.csv")
+        sys.exit(1)
+    rows, failed, elapsed = predict_file(sys.argv[1], sys.argv[2])
+    # Čas nezahrnuje import knihoven a načtení modelu
+    print(f"Hotovo: {rows} řádků ({failed} s chybou) za {elapsed:.2f} s => {rows / elapsed:,.0f} řádků/s")
+    print(f"Výsledek uložen do {sys.argv[2]}")
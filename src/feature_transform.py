@@ -0,0 +1,96 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+# Sloučené předzpracování vstupu pro model – náhrada čtyř LabelEncoderů a scaleru na výřezu sloupců.
+# Kategorie se kódují přes slovníky (kategorie → kód), čísla se škálují předpočítaným posunem a měřítkem.
+# Matice příznaků se alokuje jednou a validace i škálování probíhají v ní na místě.
+
+# Pořadí příznaků, na kterém byl model natrénován
+CATEGORICAL_COLUMNS = ["Značka", "Model", "Palivo", "Převodovka"]
+NUMERIC_COLUMNS = ["Objem (l)", "Najeté km", "Výkon (kW)", "Stari"]
+
+# Chyby se během výpočtu drží jako malá čísla (0 = v pořádku), na text se převedou až ve výstupu
+ERROR_MESSAGES = np.array([
+    "",
+    "Neznámá hodnota ve sloupci Značka.",
+    "Neznámá hodnota ve sloupci Model.",
+    "Neznámá hodnota ve sloupci Palivo.",
+    "Neznámá hodnota ve sloupci Převodovka.",
+    "Zadejte platné číselné hodnoty.",
+    "Zadejte pouze nezáporné hodnoty.",
+    "Zkontrolujte rozsah hodnot.",
+    "Výstupní cena je záporná.",
+], dtype=object)
+ERR_NAN, ERR_NEGATIVE, ERR_RANGE, ERR_NEGATIVE_PRICE = 5, 6, 7, 8
+# Kód neznámé kategorie v matici příznaků – řádek dostane chybu a do modelu se nepošle
+UNKNOWN_CODE = -1
+
+# Kód chyby se k řádku zapíše jen tehdy, pokud už nemá jiný (první chyba vyhrává)
+def mark_errors(errors: np.ndarray, mask: np.ndarray, code: int) -> None:
+    errors[mask & (errors == 0)] = code
+
+def to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError, OverflowError):
+        # OverflowError: příliš velké celé číslo z JSON se do float nevejde
+        return math.nan
+
+class FeatureTransform:
+    def __init__(self, code_maps: list[dict], offset: np.ndarray, scale: np.ndarray):
+        self.code_maps = code_maps
+        self.offset = offset
+        self.scale = scale
+        self.n_categorical = len(code_maps)
+        self.n_features = self.n_categorical + len(offset)
+
+    """ Sestavení z uložených artefaktů – kód kategorie je její pozice v classes_ (stejně jako LabelEncoder) """
+    @classmethod
+    def from_artifacts(cls, encoders: dict, scaler) -> "FeatureTransform":
+        code_maps = [{value: code for code, value in enumerate(encoders[col].classes_.tolist())}
+                     for col in CATEGORICAL_COLUMNS]
+        n = len(NUMERIC_COLUMNS)
+        # StandardScaler počítá (x - mean_) / scale_; stejný tvar výpočtu drží výsledek shodný na bit
+        offset = scaler.mean_ if scaler is not None and scaler.mean_ is not None else np.zeros(n)
+        scale = scaler.scale_ if scaler is not None and scaler.scale_ is not None else np.ones(n)
+        return cls(code_maps, np.asarray(offset, dtype=float).copy(), np.asarray(scale, dtype=float).copy())
+
+    """ Seznam slovníků se sloupci datasetu → (matice příznaků, kódy chyb); bez pandas, vhodné pro jednotlivé požadavky """
+    def transform_records(self, records: list[dict]) -> tuple[np.ndarray, np.ndarray]:
+        features = np.empty((len(records), self.n_features))
+        for i, record in enumerate(records):
+            row = features[i]
+            for j, (col, code_map) in enumerate(zip(CATEGORICAL_COLUMNS, self.code_maps)):
+                row[j] = code_map.get(record.get(col), UNKNOWN_CODE)
+            for j, col in enumerate(NUMERIC_COLUMNS, start=self.n_categorical):
+                row[j] = to_float(record.get(col))
+        return features, self.validate_and_scale(features)
+
+    """ DataFrame → (matice příznaků, kódy chyb); kategorie se mapují přes slovník po sloupcích """
+    def transform_frame(self, df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        features = np.empty((len(df), self.n_features))
+        for j, (col, code_map) in enumerate(zip(CATEGORICAL_COLUMNS, self.code_maps)):
+            features[:, j] = df[col].map(code_map).to_numpy(dtype=float, na_value=UNKNOWN_CODE)
+        for j, col in enumerate(NUMERIC_COLUMNS, start=self.n_categorical):
+            features[:, j] = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        return features, self.validate_and_scale(features)
+
+    """ Validace neškálovaných hodnot a škálování číselné části matice na místě """
+    def validate_and_scale(self, features: np.ndarray) -> np.ndarray:
+        errors = np.zeros(len(features), dtype=np.int8)
+        for j in range(self.n_categorical):
+            mark_errors(errors, features[:, j] == UNKNOWN_CODE, 1 + j)
+
+        numeric = features[:, self.n_categorical:]
+        volume, mileage, power, age = numeric.T
+        mark_errors(errors, np.isnan(numeric).any(axis=1), ERR_NAN)
+        mark_errors(errors, (numeric < 0).any(axis=1), ERR_NEGATIVE)
+        out_of_range = (mileage > 600000) | ~((volume >= 0.5) & (volume <= 8.0)) | ~((power >= 20) & (power <= 800)) | (age > 50)
+        mark_errors(errors, out_of_range, ERR_RANGE)
+
+        numeric[errors != 0] = 0.0
+        numeric -= self.offset
+        numeric /= self.scale
+        return errors
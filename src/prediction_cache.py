@@ -0,0 +1,134 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from feature_transform import CATEGORICAL_COLUMNS, ERROR_MESSAGES, NUMERIC_COLUMNS, to_float
+from predictor import Predictor, artifact_version
+
+# Paměť výsledků predikce s vyřazováním nejdéle nepoužitých položek (LRU).
+# Klíčem je kanonický vstup (kategorie jako text, čísla jako float), volitelně se zaokrouhlenými
+# najetými km a stářím do košů. Při změně verze artefaktů se model znovu načte a paměť vyprázdní.
+
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+# Velikost koše pro najeté km a stáří (0 = bez zaokrouhlení); predikce se pak počítá pro střed koše
+CACHE_MILEAGE_BUCKET = float(os.getenv("CACHE_MILEAGE_BUCKET", "0"))
+CACHE_AGE_BUCKET = float(os.getenv("CACHE_AGE_BUCKET", "0"))
+MODEL_CHECK_INTERVAL = float(os.getenv("MODEL_CHECK_INTERVAL", "5"))
+
+def bucket(value: float, size: float) -> float:
+    return round(value / size) * size if size else value
+
+""" Predictor s LRU pamětí – stejné rozhraní predict_records/predict_one """
+class CachedPredictor:
+    def __init__(self, predictor: Predictor, maxsize: int = PREDICTION_CACHE_SIZE,
+                 mileage_bucket: float = CACHE_MILEAGE_BUCKET, age_bucket: float = CACHE_AGE_BUCKET,
+                 check_interval: float = MODEL_CHECK_INTERVAL):
+        self.predictor = predictor
+        self.maxsize = maxsize
+        self.mileage_bucket = mileage_bucket
+        self.age_bucket = age_bucket
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._next_check = time.monotonic() + check_interval
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    @property
+    def version(self) -> str:
+        return self.predictor.version
+
+    def canonical(self, record: dict) -> tuple:
+        volume, mileage, power, age = (to_float(record.get(col)) for col in NUMERIC_COLUMNS)
+        return (*(record.get(col) for col in CATEGORICAL_COLUMNS),
+                volume, bucket(mileage, self.mileage_bucket), power, bucket(age, self.age_bucket))
+
+    """ Při změně verze artefaktů na disku se model načte znovu a paměť se vyprázdní (kontrola nejvýše jednou za interval) """
+    def check_version(self) -> None:
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.check_interval
+        try:
+            current = artifact_version(self.predictor.folder)
+        except OSError:
+            return
+        if current != self.predictor.version:
+            predictor = Predictor(self.predictor.folder, self.predictor.backend)
+            with self._lock:
+                self.predictor = predictor
+                self._entries.clear()
+                self.invalidations += 1
+
+    def predict_records(self, records: list[dict]) -> list[tuple]:
+        self.check_version()
+        # Model se čte jednou – predikce i zápis do paměti patří ke stejné verzi, i když mezitím proběhne reload
+        with self._lock:
+            predictor = self.predictor
+        # S koši se nejdřív validuje původní vstup stejnými pravidly jako v Predictoru – koš by neplatnou hodnotu
+        # posunul do platného rozsahu. Přesný klíč neplatného vstupu v paměti být nemůže (chyby se neukládají)
+        bucketed = bool(self.mileage_bucket or self.age_bucket)
+        if bucketed:
+            errors = predictor.transform.transform_records(records)[1]
+        else:
+            errors = [0] * len(records)
+        results = [(None, ERROR_MESSAGES[code], None) if code else None for code in errors]
+        keys = {i: self.canonical(record) for i, record in enumerate(records) if not errors[i]}
+        missing = {}
+        with self._lock:
+            for i, key in keys.items():
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    results[i] = self._entries[key]
+                    self.hits += 1
+                else:
+                    missing.setdefault(key, []).append(i)
+                    self.misses += 1
+        if not missing:
+            return results
+
+        # Chybějící klíče se predikují jednou dávkou; model dostane kanonický (zaokrouhlený) vstup
+        columns = CATEGORICAL_COLUMNS + NUMERIC_COLUMNS
+        computed = predictor.predict_records([dict(zip(columns, key)) for key in missing])
+        uncached = []
+        with self._lock:
+            # Po reloadu modelu by se výsledky staré verze dostaly do paměti nové verze – pak se jen vrátí
+            current = self.predictor is predictor
+            for (key, positions), result in zip(missing.items(), computed):
+                if result[1] and bucketed:
+                    # Střed koše vypadl z platného rozsahu (např. 599 000 km s košem 7 000 → 602 000 km) – počítá se z původního vstupu
+                    uncached.extend(positions)
+                    continue
+                for i in positions:
+                    results[i] = result
+                # Chybové výsledky se neukládají
+                if not current or result[1]:
+                    continue
+                self._entries[key] = result
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        if uncached:
+            for i, result in zip(uncached, predictor.predict_records([records[i] for i in uncached])):
+                results[i] = result
+        return results
+
+    def predict_one(self, record: dict) -> tuple:
+        return self.predict_records([record])[0]
+
+    def cache_stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "cache_size": len(self._entries),
+                "cache_hits": self.hits,
+                "cache_misses": self.misses,
+                "cache_hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "cache_evictions": self.evictions,
+                "cache_invalidations": self.invalidations,
+                "model_version": self.predictor.version,
+            }
+
+""" Obalí predictor pamětí výsledků, pokud není vypnutá (PREDICTION_CACHE_SIZE=0) """
+def with_cache(predictor: Predictor):
+    return CachedPredictor(predictor) if PREDICTION_CACHE_SIZE > 0 else predictor
@@ -0,0 +1,217 @@
+import json
+import os
+import queue
+import threading
+import time
+import urllib.request
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from prediction_cache import with_cache
+from predictor import Predictor
+
+# Lokální HTTP/JSON služba pro predikci ceny – model se načte jednou při startu,
+# souběžné požadavky se slučují do malých dávek (jedno volání gb_model.predict na dávku).
+# Použití: python src/prediction_service.py
+#   POST /predict  – JSON objekt (jedno auto) nebo seznam objektů se sloupci datasetu;
+#                    odpověď {"price", "error", "interval": {"low", "median", "high"} | null}
+#   GET  /metrics  – počet požadavků, p50/p99 latence, průměrná velikost dávky, zásahy paměti výsledků
+
+SERVICE_HOST = os.getenv("PREDICTION_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.getenv("PREDICTION_PORT", "8765"))
+MAX_BATCH = int(os.getenv("PREDICTION_MAX_BATCH", "256"))
+MAX_WAIT_MS = float(os.getenv("PREDICTION_MAX_WAIT_MS", "2"))
+
+""" Klouzavé okno naměřených latencí pro výpočet percentilů """
+class LatencyStats:
+    def __init__(self, window: int = 10000):
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=window)
+        self.requests = 0
+        self.batches = 0
+        self.batched_rows = 0
+
+    def record_request(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self.requests += 1
+
+    def record_batch(self, rows: int) -> None:
+        with self._lock:
+            self.batches += 1
+            self.batched_rows += rows
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            samples = np.array(self._samples) * 1000
+            p50, p99 = np.percentile(samples, [50, 99]) if len(samples) else (0.0, 0.0)
+            return {
+                "requests": self.requests,
+                "p50_ms": round(float(p50), 3),
+                "p99_ms": round(float(p99), 3),
+                "batches": self.batches,
+                "avg_batch_size": round(self.batched_rows / self.batches, 2) if self.batches else 0.0,
+            }
+
+""" Povolené hodnoty polí v požadavku – seznamy a objekty by model nedokázal zpracovat """
+SCALAR_TYPES = (str, int, float, bool, type(None))
+
+""" Slučování souběžných požadavků – vlákno čeká na první záznam a pak max. MAX_WAIT_MS na další """
+class MicroBatcher:
+    def __init__(self, predictor: Predictor, stats: LatencyStats, max_batch: int = MAX_BATCH,
+                 max_wait_ms: float = MAX_WAIT_MS):
+        self.predictor = predictor
+        self.stats = stats
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, records: list[dict]) -> Future:
+        future = Future()
+        self._queue.put((records, future))
+        return future
+
+    def _collect(self) -> list:
+        pending = [self._queue.get()]
+        rows = len(pending[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while rows < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            pending.append(item)
+            rows += len(item[0])
+        return pending
+
+    def _run(self) -> None:
+        while True:
+            pending = self._collect()
+            records = [record for batch, _ in pending for record in batch]
+            try:
+                results = self.predictor.predict_records(records)
+            except Exception:
+                # Jeden chybný požadavek nesmí shodit ostatní v dávce – každý se zkusí zvlášť
+                for batch, future in pending:
+                    try:
+                        future.set_result(self.predictor.predict_records(batch))
+                    except Exception as e:
+                        future.set_exception(e)
+                continue
+            self.stats.record_batch(len(records))
+            offset = 0
+            for batch, future in pending:
+                future.set_result(results[offset:offset + len(batch)])
+                offset += len(batch)
+
+def make_handler(batcher: MicroBatcher, stats: LatencyStats):
+    class PredictionHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, payload) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/metrics":
+                cache_stats = getattr(batcher.predictor, "cache_stats", dict)
+                self._send_json(200, {**stats.snapshot(), **cache_stats()})
+            elif self.path == "/health":
+                self._send_json(200, {"status": "ok"})
+            else:
+                self._send_json(404, {"error": "Neznámá cesta."})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._send_json(404, {"error": "Neznámá cesta."})
+                return
+            start = time.perf_counter()
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            except ValueError:
+                self._send_json(400, {"error": "Neplatný JSON."})
+                return
+            single = isinstance(payload, dict)
+            records = [payload] if single else payload
+            if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+                self._send_json(400, {"error": "Očekáván objekt nebo seznam objektů."})
+                return
+            if not all(isinstance(value, SCALAR_TYPES) for record in records for value in record.values()):
+                self._send_json(400, {"error": "Hodnoty polí musí být text, číslo nebo null."})
+                return
+
+            try:
+                results = batcher.submit(records).result() if records else []
+            except Exception as e:
+                self._send_json(500, {"error": f"Chyba při predikci: {e}"})
+                return
+            response = [
+                {"price": price, "error": error,
+                 "interval": dict(zip(("low", "median", "high"), interval)) if interval else None}
+                for price, error, interval in results
+            ]
+            self._send_json(200, response[0] if single else response)
+            stats.record_request(time.perf_counter() - start)
+
+        def log_message(self, format, *args):
+            pass
+
+    return PredictionHandler
+
+class PredictionServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Výchozí fronta spojení (5) nestačí pro desítky souběžných klientů
+    request_queue_size = 128
+
+def create_server(predictor: Predictor, host: str = SERVICE_HOST, port: int = SERVICE_PORT) -> ThreadingHTTPServer:
+    stats = LatencyStats()
+    batcher = MicroBatcher(predictor, stats)
+    server = PredictionServer((host, port), make_handler(batcher, stats))
+    server.stats = stats
+    return server
+
+""" Klient služby se stejným rozhraním jako Predictor – GUI mezi nimi přepíná přes PREDICTION_SERVICE_URL """
+class ServiceClient:
+    def __init__(self, url: str, timeout: float = 5):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def predict_records(self, records: list[dict]) -> list[tuple]:
+        request = urllib.request.Request(
+            f"{self.url}/predict", data=json.dumps(records, ensure_ascii=False).encode("utf-8"),
+            headers={"Content-Type": "application/json"}, method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as resp:
+            return [
+                (item["price"], item["error"],
+                 (item["interval"]["low"], item["interval"]["median"], item["interval"]["high"]) if item.get("interval") else None)
+                for item in json.load(resp)
+            ]
+
+    def predict_one(self, record: dict) -> tuple:
+        return self.predict_records([record])[0]
+
+    def metrics(self) -> dict:
+        with urllib.request.urlopen(f"{self.url}/metrics", timeout=self.timeout) as resp:
+            return json.load(resp)
+
+if __name__ == "__main__":
+    server = create_server(with_cache(Predictor()))
+    print(f"Služba predikce běží na http://{SERVICE_HOST}:{SERVICE_PORT} (Ctrl+C pro ukončení)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Metriky: {server.stats.snapshot()}")
@@ -0,0 +1,125 @@
+import json
+import os
+import pickle
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from feature_transform import (CATEGORICAL_COLUMNS, ERR_NEGATIVE_PRICE, ERROR_MESSAGES, NUMERIC_COLUMNS,
+                               FeatureTransform, mark_errors)
+from tree_inference import FlatEnsemble
+
+# Predikce ceny bez GUI – načtení modelu, kódování příznaků, validace a volání modelu.
+# Používá ji aplikace, dávková predikce i HTTP služba.
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+model_folder = os.getenv("MODEL_DIR", os.path.join(base_dir, "models"))
+# sklearn = gb_model.predict, flat = zploštělé stromy v NumPy (tree_inference.py, stejný výsledek v rámci
+# zaokrouhlení), auto = flat pro dávky do FLAT_MAX_BATCH řádků, větší dávky zvládá rychleji sklearn.
+# Výchozí auto: jeden řádek s intervalem je jeden plochý průchod, sklearn by volal každý model zvlášť
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "auto")
+FLAT_MAX_BATCH = int(os.getenv("FLAT_MAX_BATCH", "64"))
+
+PREDICTION_COLUMN = "Predikovaná cena"
+ERROR_COLUMN = "Chyba"
+# Interval ceny z kvantilových modelů (quantile_models.pkl) – sloupce se přidají jen pokud modely existují
+INTERVAL_COLUMNS = ["Cena dolní odhad", "Cena medián", "Cena horní odhad"]
+
+# Každý artefakt má jediný známý formát – žádné zkoušení pickle a pak joblib
+ARTIFACT_FORMATS = {"encoders.pkl": "pickle", "scaler.pkl": "pickle", "gb_model.pkl": "joblib",
+                    "quantile_models.pkl": "joblib"}
+
+def load_artifact(folder: str, name: str):
+    path = os.path.join(folder, name)
+    if ARTIFACT_FORMATS[name] == "joblib":
+        return joblib.load(path)
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+""" Verze zveřejněných artefaktů – z metadata.json (train_model.py), u starších artefaktů podle času změny modelu """
+def artifact_version(folder: str) -> str:
+    try:
+        with open(os.path.join(folder, "metadata.json"), encoding="utf-8") as f:
+            return json.load(f)["version"]
+    except (OSError, ValueError, KeyError):
+        return f"mtime-{os.stat(os.path.join(folder, 'gb_model.pkl')).st_mtime_ns}"
+
+class Predictor:
+    def __init__(self, folder: str = model_folder, backend: str = INFERENCE_BACKEND, intervals: bool = True):
+        self.folder = folder
+        self.encoders = load_artifact(folder, "encoders.pkl")
+        self.scaler = load_artifact(folder, "scaler.pkl")
+        self.gb_model = load_artifact(folder, "gb_model.pkl")
+        # Kvantilové modely (dolní, medián, horní) jsou volitelné – starší artefakty je nemají,
+        # intervals=False je nenačte vůbec (velké dávky přes sklearn by počítaly čtyři modely místo jednoho)
+        has_quantiles = intervals and os.path.exists(os.path.join(folder, "quantile_models.pkl"))
+        self.quantile_models = load_artifact(folder, "quantile_models.pkl") if has_quantiles else []
+        self.transform = FeatureTransform.from_artifacts(self.encoders, self.scaler)
+        if backend not in ("sklearn", "flat", "auto"):
+            raise ValueError(f"Neznámý INFERENCE_BACKEND: {backend} (povoleno: sklearn, flat, auto)")
+        self.backend = backend
+        # Bodový model i kvantily se ve flat režimu spojí do jednoho souboru stromů – jeden průchod vstupem
+        self.flat_model = None
+        if backend != "sklearn":
+            self.flat_model = FlatEnsemble.combine([FlatEnsemble.from_sklearn(m)
+                                                    for m in [self.gb_model] + self.quantile_models])
+        # metadata.json zapisuje scripts/train_model.py – u starších artefaktů chybí
+        metadata_path = os.path.join(folder, "metadata.json")
+        if os.path.exists(metadata_path):
+            with open(metadata_path, encoding="utf-8") as f:
+                self.metadata = json.load(f)
+        else:
+            self.metadata = {}
+        self.version = self.metadata.get("version") or artifact_version(folder)
+
+    """ Zakódování a validace dávky – vrací matici příznaků a kód chyby pro každý řádek (0 = v pořádku) """
+    def encode(self, df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        return self.transform.transform_frame(df)
+
+    @property
+    def has_interval(self) -> bool:
+        return bool(self.quantile_models)
+
+    """ Výstupy všech modelů jako matice (řádky, 1 + počet kvantilů) – sloupec 0 je bodový odhad """
+    def model_predict(self, features: np.ndarray) -> np.ndarray:
+        if self.backend == "flat" or (self.backend == "auto" and len(features) <= FLAT_MAX_BATCH):
+            return self.flat_model.predict(features).reshape(len(features), -1)
+        return np.column_stack([m.predict(features) for m in [self.gb_model] + self.quantile_models])
+
+    """ Predikce z matice příznaků – vrací ceny (NaN u chybných řádků), kódy chyb a interval
+        (řádky × [dolní, medián, horní], seřazený, aby se kvantily nekřížily; None bez kvantilových modelů) """
+    def predict_features(self, features: np.ndarray, errors: np.ndarray) -> tuple:
+        outputs = np.full((len(features), 1 + len(self.quantile_models)), np.nan)
+        valid = errors == 0
+        if valid.any():
+            outputs[valid] = self.model_predict(features[valid])
+        prices = outputs[:, 0]
+        mark_errors(errors, prices < 0, ERR_NEGATIVE_PRICE)
+        outputs[errors != 0] = np.nan
+        interval = np.sort(outputs[:, 1:], axis=1) if self.has_interval else None
+        return prices, errors, interval
+
+    def predict_arrays(self, df: pd.DataFrame) -> tuple:
+        return self.predict_features(*self.encode(df))
+
+    def predict_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        prices, errors, interval = self.predict_arrays(df)
+        columns = {PREDICTION_COLUMN: prices.round(2)}
+        if interval is not None:
+            columns.update({col: interval[:, i].round(2) for i, col in enumerate(INTERVAL_COLUMNS)})
+        columns[ERROR_COLUMN] = ERROR_MESSAGES[errors]
+        return df.assign(**columns)
+
+    """ Predikce seznamu vozů (slovníky se sloupci datasetu) – vrací [(cena | None, chyba, interval | None), ...],
+        interval je (dolní, medián, horní) """
+    def predict_records(self, records: list[dict]) -> list[tuple]:
+        prices, errors, interval = self.predict_features(*self.transform.transform_records(records))
+        return [
+            (None, ERROR_MESSAGES[code], None) if code else
+            (float(prices[i]), "", tuple(interval[i].tolist()) if interval is not None else None)
+            for i, code in enumerate(errors)
+        ]
+
+    def predict_one(self, record: dict) -> tuple:
+        return self.predict_records([record])[0]
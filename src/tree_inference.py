@@ -0,0 +1,135 @@
+import numpy as np
+
+# Zploštělá inference stromových modelů – všechny stromy souboru se převedou do plochých polí
+# (feature, threshold, left, right, value) a vyhodnocují se najednou po úrovních NumPy operacemi.
+# Odpadá validace vstupu a volání Pythonu pro každý strom, což u jednoho řádku dominuje latenci sklearn.
+# Podporované modely: GradientBoostingRegressor, HistGradientBoostingRegressor, RandomForestRegressor,
+# DecisionTreeRegressor. Vstup nesmí obsahovat chybějící hodnoty (Predictor je odfiltruje validací).
+
+# Horní mez počtu prvků (řádky × stromy) v jednom kroku – drží paměť pro velké dávky omezenou
+MAX_CELLS = 1 << 20
+
+""" Plochý soubor stromů: predikce = baseline + scale * součet hodnot listů.
+    Může nést více modelů najednou (např. bodový odhad a kvantily) – stromy všech výstupů se vyhodnotí
+    v jednom průchodu a součty se dělí podle output_starts (index prvního stromu každého výstupu). """
+class FlatEnsemble:
+    def __init__(self, feature, threshold, left, right, value, roots, depth, baselines, scales, output_starts,
+                 float32_inputs):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        # Potomci prokládaně [pravý, levý] – další uzel je jedno čtení children[2 * uzel + jde_vlevo]
+        self.children = np.column_stack([right, left]).ravel()
+        self.value = value
+        self.roots = roots
+        self.depth = depth
+        self.baselines = baselines
+        self.scales = scales
+        self.output_starts = output_starts
+        # Stromy sklearn porovnávají vstup převedený na float32, histogramový boosting float64
+        self.float32_inputs = float32_inputs
+
+    @property
+    def n_outputs(self) -> int:
+        return len(self.output_starts)
+
+    @classmethod
+    def from_trees(cls, trees: list[tuple], baseline: float, scale: float, float32_inputs: bool) -> "FlatEnsemble":
+        feature, threshold, left, right, value, roots = [], [], [], [], [], []
+        offset = depth = 0
+        for tree_feature, tree_threshold, tree_left, tree_right, tree_value, is_leaf, tree_depth in trees:
+            n = len(tree_feature)
+            ids = np.arange(offset, offset + n)
+            # Listy ukazují samy na sebe s prahem +inf – další kroky vyhodnocení je nechají na místě
+            feature.append(np.where(is_leaf, 0, tree_feature))
+            threshold.append(np.where(is_leaf, np.inf, tree_threshold))
+            left.append(np.where(is_leaf, ids, tree_left + offset))
+            right.append(np.where(is_leaf, ids, tree_right + offset))
+            value.append(np.where(is_leaf, tree_value, 0.0))
+            roots.append(offset)
+            offset += n
+            depth = max(depth, tree_depth)
+        return cls(
+            np.concatenate(feature).astype(np.intp), np.concatenate(threshold).astype(np.float64),
+            np.concatenate(left).astype(np.intp), np.concatenate(right).astype(np.intp),
+            np.concatenate(value).astype(np.float64), np.array(roots, dtype=np.intp),
+            depth, np.array([baseline], dtype=float), np.array([scale], dtype=float),
+            np.array([0], dtype=np.intp), float32_inputs,
+        )
+
+    """ Spojení několika souborů do jednoho vícevýstupového – všechny musí číst vstup ve stejné přesnosti """
+    @classmethod
+    def combine(cls, ensembles: list["FlatEnsemble"]) -> "FlatEnsemble":
+        if len({e.float32_inputs for e in ensembles}) != 1:
+            raise ValueError("Spojované modely musí mít stejnou přesnost vstupu (float32 vs. float64)")
+        node_offsets = np.cumsum([0] + [len(e.feature) for e in ensembles[:-1]])
+        tree_offsets = np.cumsum([0] + [len(e.roots) for e in ensembles[:-1]])
+        return cls(
+            np.concatenate([e.feature for e in ensembles]),
+            np.concatenate([e.threshold for e in ensembles]),
+            np.concatenate([e.left + off for e, off in zip(ensembles, node_offsets)]),
+            np.concatenate([e.right + off for e, off in zip(ensembles, node_offsets)]),
+            np.concatenate([e.value for e in ensembles]),
+            np.concatenate([e.roots + off for e, off in zip(ensembles, node_offsets)]),
+            max(e.depth for e in ensembles),
+            np.concatenate([e.baselines for e in ensembles]),
+            np.concatenate([e.scales for e in ensembles]),
+            np.concatenate([e.output_starts + off for e, off in zip(ensembles, tree_offsets)]),
+            ensembles[0].float32_inputs,
+        )
+
+    @classmethod
+    def from_sklearn(cls, model) -> "FlatEnsemble":
+        name = type(model).__name__
+        if name == "GradientBoostingRegressor":
+            if model.init_ == "zero":
+                baseline = 0.0
+            elif type(model.init_).__name__ == "DummyRegressor":
+                baseline = float(np.ravel(model.init_.constant_)[0])
+            else:
+                raise NotImplementedError(f"Nepodporovaný init model: {model.init_!r}")
+            trees = [sklearn_tree(est.tree_) for est in model.estimators_[:, 0]]
+            return cls.from_trees(trees, baseline, model.learning_rate, float32_inputs=True)
+        if name == "RandomForestRegressor":
+            trees = [sklearn_tree(est.tree_) for est in model.estimators_]
+            return cls.from_trees(trees, 0.0, 1.0 / len(trees), float32_inputs=True)
+        if name == "DecisionTreeRegressor":
+            return cls.from_trees([sklearn_tree(model.tree_)], 0.0, 1.0, float32_inputs=True)
+        if name == "HistGradientBoostingRegressor":
+            trees = [hist_tree(predictors[0].nodes) for predictors in model._predictors]
+            return cls.from_trees(trees, float(np.ravel(model._baseline_prediction)[0]), 1.0, float32_inputs=False)
+        raise NotImplementedError(f"Nepodporovaný model: {name}")
+
+    """ Predikce – tvar (n,) pro jeden výstup, (n, počet výstupů) pro spojené modely """
+    def predict(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32 if self.float32_inputs else np.float64)
+        out = np.empty((len(X), self.n_outputs))
+        step = max(1, MAX_CELLS // len(self.roots))
+        for start in range(0, len(X), step):
+            out[start:start + step] = self._predict_block(X[start:start + step])
+        return out[:, 0] if self.n_outputs == 1 else out
+
+    def _predict_block(self, X: np.ndarray) -> np.ndarray:
+        flat_X = np.ascontiguousarray(X).ravel()
+        row_offsets = (np.arange(len(X)) * X.shape[1])[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        for _ in range(self.depth):
+            go_left = flat_X[row_offsets + self.feature[nodes]] <= self.threshold[nodes]
+            nodes = self.children[2 * nodes + go_left]
+        leaf_values = self.value[nodes]
+        bounds = np.append(self.output_starts, len(self.roots))
+        sums = np.column_stack([leaf_values[:, start:end].sum(axis=1) for start, end in zip(bounds[:-1], bounds[1:])])
+        return self.baselines + self.scales * sums
+
+def sklearn_tree(tree) -> tuple:
+    is_leaf = tree.children_left == -1
+    return (tree.feature, tree.threshold, tree.children_left, tree.children_right,
+            tree.value[:, 0, 0], is_leaf, tree.max_depth)
+
+def hist_tree(nodes) -> tuple:
+    if nodes["is_categorical"].any():
+        raise NotImplementedError("Kategoriální větvení histogramového boostingu není podporováno")
+    is_leaf = nodes["is_leaf"].astype(bool)
+    return (nodes["feature_idx"], nodes["num_threshold"], nodes["left"].astype(np.intp),
+            nodes["right"].astype(np.intp), nodes["value"], is_leaf, int(nodes["depth"].max()))